@@ -0,0 +1,91 @@
+# coding: utf-8
+import json
+import os
+import shutil
+import tempfile
+from core.main.appsession import AppSession
+from core.modules.cfginfo import ConfigurationInformation
+from tools.stub import StubBackend, StubSettings, StubAdapter
+
+
+class BenchmarkEnvironment(object):
+    """
+    Temporary local storage with configuration file and input JSON files, and application sessions connected
+    to in-process stub backend, so that benchmarks do not depend on network and CML-Bench server
+    """
+
+    BACKEND_ADDRESS = "http://stub.local"
+    STYPE_ID = 1
+
+    # configuration keys, which may be overridden by benchmarks
+    DEFAULT_CONFIG = {"Request rate": 1000000,
+                      "Request burst": 1000000,
+                      "Metadata cache": "off"}
+
+    def __init__(self, settings=None, **config):
+        """
+        :param settings: StubSettings of backend; optional; by default backend has no latency, faults and login
+        :param config: configuration keys, e.g. `{"Fan-out workers": 16}`
+        """
+        self.__directory = tempfile.mkdtemp(prefix="sinara-benchmark-")
+        self.__backend = StubBackend(settings or StubSettings(login=False, waiting_time=0, solving_time=0))
+        self.__backend.add_stype(BenchmarkEnvironment.STYPE_ID)
+        self.__config = dict(BenchmarkEnvironment.DEFAULT_CONFIG)
+        self.__config.update(config)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def directory(self):
+        return self.__directory
+
+    @property
+    def backend(self):
+        return self.__backend
+
+    def write_json(self, data, name="input.json"):
+        """
+        :return: path to written file
+        """
+        path = os.path.join(self.__directory, name)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        return path
+
+    def write_file(self, name, size):
+        """
+        Creates file of given size in local storage, e.g. submodel
+        :return: path to written file
+        """
+        path = os.path.join(self.__directory, name)
+        with open(path, "wb") as file:
+            file.write(os.urandom(size))
+        return path
+
+    def create_app_session(self, json_file, **kwargs):
+        """
+        :param json_file: path to input JSON file
+        :param kwargs: keyword arguments of AppSession
+        :return: AppSession object, requests of which are handled by stub backend
+        """
+        config_path = os.path.join(self.__directory, "config.cfg")
+        lines = [f"Backend address: {BenchmarkEnvironment.BACKEND_ADDRESS}",
+                 f"Local storage: {self.__directory}",
+                 f"Server storage: {BenchmarkEnvironment.STYPE_ID}"]
+        lines += [f"{key}: {value}" for key, value in self.__config.items()]
+        with open(config_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+        app_session = AppSession(root=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 cfg=ConfigurationInformation(config_path),
+                                 json=json_file,
+                                 **kwargs)
+        app_session.session.mount(BenchmarkEnvironment.BACKEND_ADDRESS, StubAdapter(self.__backend))
+        return app_session
+
+    def close(self):
+        shutil.rmtree(self.__directory, ignore_errors=True)
@@ -0,0 +1,155 @@
+# coding: utf-8
+import contextlib
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from ui.console import terminal
+
+
+class BenchmarkResult(object):
+    """
+    Result of benchmark: speed in operations per second and memory allocated per operation
+    """
+    def __init__(self, name, ops_per_sec, allocated, peak):
+        """
+        :param name: name of benchmark
+        :param ops_per_sec: number of operations per second (best of rounds)
+        :param allocated: number of memory blocks allocated per operation and not freed until its end
+        :param peak: peak of traced memory per operation in bytes
+        """
+        self.name = name
+        self.ops_per_sec = ops_per_sec
+        self.allocated = allocated
+        self.peak = peak
+
+    def to_dict(self):
+        return {"ops_per_sec": self.ops_per_sec,
+                "allocated": self.allocated,
+                "peak": self.peak}
+
+
+@contextlib.contextmanager
+def silent_output():
+    """
+    Redirects standard output (terminal messages) to null device, messages are still formatted and written
+    """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        try:
+            yield
+        finally:
+            terminal.flush()
+
+
+def measure(name, run, operations=1, setup=None, rounds=5, min_time=0.2):
+    """
+    Measures speed and memory allocations of function
+    :param name: name of benchmark
+    :param run: callable, taking result of setup (or nothing, if setup is not defined); one call performs
+                `operations` operations
+    :param operations: number of operations performed by one call, e.g. number of parsed items
+    :param setup: callable preparing state for every call of `run`; optional; its time is not measured
+    :param rounds: number of rounds; best round is reported
+    :param min_time: minimal time of round in seconds; rounds with setup always call `run` once
+    :return: BenchmarkResult object
+    """
+    if setup is None:
+        # warming up; functions with setup are warmed up by their first round
+        run()
+
+    best = None
+    for _ in range(rounds):
+        elapsed, calls = 0.0, 0
+        while True:
+            state = setup() if setup is not None else None
+            gc.collect()
+            start = time.perf_counter()
+            if setup is None:
+                run()
+            else:
+                run(state)
+            elapsed += time.perf_counter() - start
+            calls += 1
+            if setup is not None or elapsed >= min_time:
+                break
+        per_call = elapsed / calls
+        best = per_call if best is None else min(best, per_call)
+
+    state = setup() if setup is not None else None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        if setup is None:
+            run()
+        else:
+            run(state)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    allocated = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+
+    return BenchmarkResult(name,
+                           ops_per_sec=operations / best if best > 0 else float("inf"),
+                           allocated=allocated / operations,
+                           peak=(peak - base) / operations)
+
+
+def load_baselines(path):
+    """
+    :return: dictionary {benchmark name: dictionary of result}, empty if file does not exist
+    """
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_baselines(path, results):
+    baselines = load_baselines(path)
+    baselines.update({result.name: result.to_dict() for result in results})
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(baselines, file, indent=4, sort_keys=True)
+
+
+def compare(results, baselines, tolerance):
+    """
+    :param results: list of BenchmarkResult objects
+    :param baselines: dictionary of stored results
+    :param tolerance: allowed relative regression, e.g. 0.25
+    :return: list of regression descriptions
+    """
+    regressions = []
+    for result in results:
+        baseline = baselines.get(result.name)
+        if baseline is None:
+            continue
+        if result.ops_per_sec < baseline["ops_per_sec"] * (1 - tolerance):
+            regressions.append("{}: {:.0f} ops/sec, baseline {:.0f} ops/sec".format(
+                result.name, result.ops_per_sec, baseline["ops_per_sec"]))
+        # a few blocks per operation are noise of interpreter caches
+        if result.allocated > baseline["allocated"] * (1 + tolerance) + 1:
+            regressions.append("{}: {:.1f} blocks/op, baseline {:.1f} blocks/op".format(
+                result.name, result.allocated, baseline["allocated"]))
+    return regressions
+
+
+def report(results, baselines, header=True, stream=sys.stdout):
+    """
+    Prints table of results compared with baselines
+    """
+    if header:
+        stream.write("{:<44}{:>16}{:>10}{:>14}{:>14}\n".format("Benchmark", "ops/sec", "change",
+                                                                "blocks/op", "peak B/op"))
+    for result in results:
+        baseline = baselines.get(result.name)
+        change = ""
+        if baseline is not None and baseline["ops_per_sec"]:
+            change = "{:+.1%}".format(result.ops_per_sec / baseline["ops_per_sec"] - 1)
+        stream.write("{:<44}{:>16,.0f}{:>10}{:>14.1f}{:>14,.0f}\n".format(
+            result.name, result.ops_per_sec, change, result.allocated, result.peak))
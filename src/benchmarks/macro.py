@@ -0,0 +1,291 @@
+# coding: utf-8
+import argparse
+import os
+import sys
+import time
+from benchmarks.environment import BenchmarkEnvironment
+from benchmarks.harness import silent_output
+from core.modules.pipeline import BootstrapPipeline
+from core.modules.workflow import WorkFlow
+from core.network.timeout import Timeout
+from tools.stub import StubSettings
+
+
+# walk interval of workflow and lifecycle of stub tasks are shortened, so that scenarios take seconds
+WALK_INTERVAL = 0.05
+WAITING_TIME = 0.05
+SOLVING_TIME = 0.1
+RESULT_SIZE = 64 * 1024
+SUBMODEL_SIZE = 16 * 1024
+SUBMODELS = 4  # vertices share submodels from the pool of files, so that uploads are deduplicated
+LOADCASE_ID = 500000
+SIMULATION_ID = 600000
+
+# budgets of scenarios: maximal number of HTTP requests per vertex and maximal makespan in seconds
+SCENARIOS = {"chain": {"size": 20, "requests": 33, "makespan": 10.0},
+             "fanout": {"size": 50, "requests": 26, "makespan": 5.0},
+             "diamond": {"size": 30, "requests": 28, "makespan": 5.0},
+             "shared": {"size": 30, "requests": 25, "makespan": 4.0},
+             "targets": {"size": 50, "requests": 4.5, "makespan": 2.0}}
+
+
+def scenario_data(shape, size):
+    """
+    :param shape: "chain" - every vertex is linked to previous one;
+                  "fanout" - all vertices are linked to the first one;
+                  "diamond" - the first vertex is linked to all middle vertices, the last one is linked to all of them;
+                  "shared" - vertices are not linked and have the same base simulation;
+                  "targets" - vertices of input file of type Update targets, two targets per vertex
+    :param size: number of vertices
+    :return: input JSON data
+    """
+    vertices = []
+    for number in range(1, size + 1):
+        base = 0 if shape == "shared" else number
+        vertex = {"vertex_id": number,
+                  "loadcase_id": LOADCASE_ID + base,
+                  "base_simulation_id": SIMULATION_ID + base}
+        if shape == "targets":
+            vertex["targets"] = [{"name": name,
+                                  "value": 3000000.0 + number,
+                                  "condition": 1,
+                                  "dimension": "km",
+                                  "tolerance": None,
+                                  "description": ""} for name in ("L1", "L1iso")]
+            vertices.append(vertex)
+            continue
+
+        if shape == "chain":
+            parents = [number - 1] if number > 1 else []
+        elif shape in ("fanout", "diamond"):
+            parents = [1] if 1 < number < size or (shape == "fanout" and number == size > 1) else []
+            if shape == "diamond" and number == size > 2:
+                parents = list(range(2, size))
+        else:
+            parents = []
+        vertex.update({"curr_task_status": "New",
+                       "solver": None,
+                       "storyboard": None,
+                       "submodels": [f"submodel_{number % SUBMODELS}.csv"],
+                       "results": [f"Solution_{number}.xlsx"],
+                       "parents": parents})
+        vertices.append(vertex)
+    behaviour = "Update targets" if shape == "targets" else "Solve"
+    return {"Root": {"Behaviour": behaviour, "LCs": vertices}}
+
+
+class ScenarioResult(object):
+    """
+    Measures of one scenario run through AppSession and WorkFlow
+    """
+    def __init__(self, name, size, statistics, tasks, makespan, real, cpu, waiting, sleeping, success):
+        """
+        :param name: name of scenario
+        :param size: number of vertices
+        :param statistics: dictionary {endpoint: statistics} of stub backend
+        :param tasks: list of tasks of stub backend
+        :param makespan: time of the whole run by clock of application in seconds
+        :param real: wall-clock time of the whole run in seconds, differs from makespan for virtual clock
+        :param cpu: processor time of all threads in seconds
+        :param waiting: time spent by main loop of workflow waiting for the next walk in seconds
+        :param sleeping: time spent by client in pauses (rate limiting, backoff of retries) in seconds
+        :param success: True if run was completed without exceptions
+        """
+        self.name = name
+        self.size = size
+        self.statistics = statistics
+        self.tasks = tasks
+        self.makespan = makespan
+        self.real = real
+        self.cpu = cpu
+        self.waiting = waiting
+        self.sleeping = sleeping
+        self.success = success
+
+    @property
+    def requests(self):
+        return sum(item["requests"] for item in self.statistics.values())
+
+    @property
+    def errors(self):
+        return sum(item["errors"] for item in self.statistics.values())
+
+    @property
+    def sent(self):
+        return sum(item["sent"] for item in self.statistics.values())
+
+    @property
+    def received(self):
+        return sum(item["received"] for item in self.statistics.values())
+
+    @property
+    def requests_per_vertex(self):
+        return self.requests / self.size
+
+
+class _Stopwatch(object):
+    """
+    Replaces method of class with wrapper summing time of its calls by clock of application,
+    original method is restored on exit
+    """
+    def __init__(self, owner, name):
+        self.__owner = owner
+        self.__name = name
+        self.__original = vars(owner)[name]
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        function = getattr(self.__owner, self.__name)
+
+        def timed(*args, **kwargs):
+            start = Timeout.now()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.elapsed += Timeout.now() - start
+
+        is_static = isinstance(self.__original, staticmethod)
+        setattr(self.__owner, self.__name, staticmethod(timed) if is_static else timed)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        setattr(self.__owner, self.__name, self.__original)
+
+
+def run_scenario(name, size=None, latency=0.0, settings=None, walk_interval=WALK_INTERVAL, clock=None):
+    """
+    Runs input file of scenario through AppSession and WorkFlow against in-process stub backend
+    :param name: name of scenario, key of SCENARIOS
+    :param size: number of vertices; optional; default size of scenario is used
+    :param latency: simulated latency of backend responses in seconds
+    :param settings: StubSettings of backend; optional; by default tasks are solved in fractions of second
+    :param walk_interval: interval of polling vertices in progress by workflow in seconds
+    :param clock: clock of application during run, e.g. VirtualClock object; optional
+    :return: ScenarioResult object
+    """
+    size = size or SCENARIOS[name]["size"]
+    data = scenario_data(name, size)
+    if settings is None:
+        settings = StubSettings(latency=latency, waiting_time=WAITING_TIME, solving_time=SOLVING_TIME,
+                                result_size=RESULT_SIZE, seed=0)
+    with BenchmarkEnvironment(settings) as environment:
+        backend = environment.backend
+        # result files of vertices are distinct, as they are downloaded into the same local storage
+        simulations = {}
+        for vertex in data["Root"]["LCs"]:
+            key = vertex["loadcase_id"], vertex["base_simulation_id"]
+            simulations.setdefault(key, []).extend(vertex.get("results", []))
+        for (loadcase_id, simulation_id), files in simulations.items():
+            backend.add_loadcase(loadcase_id)
+            backend.add_simulation(loadcase_id, simulation_id, results=files or None)
+        for number in range(SUBMODELS):
+            environment.write_file(f"submodel_{number}.csv", SUBMODEL_SIZE)
+        credentials = os.path.join(environment.directory, "credentials")
+        with open(credentials, "w", encoding="utf-8") as file:
+            file.write("username: benchmark\npassword: benchmark\n")
+        json_file = environment.write_json(data)
+        results = os.path.join(environment.directory, "results")
+
+        previous_interval = WorkFlow.WALK_INTERVAL
+        WorkFlow.WALK_INTERVAL = walk_interval
+        previous_clock = Timeout.set_clock(clock) if clock is not None else None
+        success = True
+        try:
+            with silent_output(), _Stopwatch(BootstrapPipeline, "collect") as waiting, \
+                    _Stopwatch(Timeout, "pause") as sleeping:
+                app_session = environment.create_app_session(json_file, credentials=credentials, res=results)
+                backend.reset_statistics()
+                start, real_start, cpu_start = Timeout.now(), time.perf_counter(), time.process_time()
+                try:
+                    app_session.execute()
+                except Exception as e:
+                    success = False
+                    print(f"{name}: {e}", file=sys.stderr)
+                makespan = Timeout.now() - start
+                real, cpu = time.perf_counter() - real_start, time.process_time() - cpu_start
+            tasks = backend.tasks
+        finally:
+            WorkFlow.WALK_INTERVAL = previous_interval
+            if previous_clock is not None:
+                Timeout.set_clock(previous_clock)
+
+        return ScenarioResult(name, size, backend.statistics, tasks, makespan, real, cpu, waiting.elapsed,
+                              sleeping.elapsed, success)
+
+
+def check_budget(result, budget):
+    """
+    :param result: ScenarioResult object
+    :param budget: dictionary with keys `requests` (per vertex) and `makespan`
+    :return: list of exceeded budgets descriptions
+    """
+    exceeded = []
+    if not result.success:
+        exceeded.append(f"{result.name}: run failed")
+    if result.errors:
+        exceeded.append(f"{result.name}: {result.errors} responses with errors")
+    if result.requests_per_vertex > budget["requests"]:
+        exceeded.append("{}: {:.1f} requests per vertex, budget {}".format(
+            result.name, result.requests_per_vertex, budget["requests"]))
+    if result.makespan > budget["makespan"]:
+        exceeded.append("{}: makespan {:.2f} sec, budget {:.2f} sec".format(
+            result.name, result.makespan, budget["makespan"]))
+    return exceeded
+
+
+def report(result, budget, stream=sys.stdout):
+    """
+    Prints requests per endpoint and summary of scenario
+    """
+    stream.write("\n{} ({} vertices)\n".format(result.name, result.size))
+    stream.write("  {:<52}{:>10}{:>8}{:>14}{:>14}\n".format("Endpoint", "requests", "errors", "sent B", "received B"))
+    for endpoint, item in sorted(result.statistics.items(), key=lambda pair: -pair[1]["requests"]):
+        stream.write("  {:<52}{:>10}{:>8}{:>14,}{:>14,}\n".format(endpoint, item["requests"], item["errors"],
+                                                                  item["sent"], item["received"]))
+    stream.write("  {:<52}{:>10}{:>8}{:>14,}{:>14,}\n".format("Total", result.requests, result.errors,
+                                                              result.sent, result.received))
+    stream.write("  Requests per vertex: {:.1f} (budget {})\n".format(result.requests_per_vertex, budget["requests"]))
+    stream.write("  Makespan: {:.2f} sec (budget {:.2f} sec), working: {:.2f} sec, waiting for walk: {:.2f} sec, "
+                 "client pauses: {:.2f} sec, CPU: {:.2f} sec\n".format(result.makespan, budget["makespan"],
+                                                                      result.makespan - result.waiting,
+                                                                      result.waiting, result.sleeping, result.cpu))
+
+# ------------------------------------------------------ Runner ------------------------------------------------------ #
+
+
+def get_arguments():
+    arg_parser = argparse.ArgumentParser(prog="python -m benchmarks.macro",
+                                         description="End-to-end benchmarks of workflow with request budgets")
+
+    arg_parser.add_argument("-k", action="store",
+                            help="Comma separated scenarios: {} | Optional".format(", ".join(SCENARIOS)))
+    arg_parser.add_argument("--size", action="store", type=int,
+                            help="Number of vertices of every scenario, budgets are not checked | Optional")
+    arg_parser.add_argument("--latency", action="store", type=float, default=0.0,
+                            help="Simulated latency of backend responses in seconds | Optional")
+
+    return arg_parser.parse_args()
+
+
+def main():
+    arguments = get_arguments()
+    scenarios = [name.strip() for name in arguments.k.split(",")] if arguments.k else list(SCENARIOS)
+
+    exceeded = []
+    for name in scenarios:
+        result = run_scenario(name, arguments.size, arguments.latency)
+        budget = SCENARIOS[name]
+        report(result, budget)
+        # budgets are calibrated for default sizes and no latency
+        if arguments.size is None and not arguments.latency:
+            exceeded += check_budget(result, budget)
+        elif not result.success:
+            exceeded.append(f"{name}: run failed")
+
+    for description in exceeded:
+        print(f"BUDGET EXCEEDED {description}")
+    return 1 if exceeded else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+# coding: utf-8
+import argparse
+import json
+import os
+import sys
+from benchmarks.environment import BenchmarkEnvironment
+from benchmarks.harness import measure, silent_output, load_baselines, save_baselines, compare, report
+from core.dao.local_data_manager import JSONDataManager
+from core.modules.pipeline import BootstrapPipeline
+from core.modules.workflow import Graph, WorkFlow
+from core.network.handler import Handler
+from core.network.response import BufferedResponse
+from core.utils.decorators import method_info
+from ui.console import terminal
+
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+TOLERANCE = 0.25  # allowed relative regression
+
+LIST_SIZE = 10000
+GRAPH_SIZES = (10000, 100000)
+JSON_SIZE = 10000
+CHAIN_SIZES = (100, 1000)
+CALLS = 1000
+
+
+def solve_data(size, shape="chain", **properties):
+    """
+    :param size: number of vertices
+    :param shape: "chain" - every vertex is linked to previous one, "flat" - vertices are not linked
+    :param properties: properties of every vertex, e.g. `curr_task_status`
+    :return: input JSON data of type Solve
+    """
+    vertices = []
+    for number in range(1, size + 1):
+        vertex = {"vertex_id": number,
+                  "loadcase_id": None,
+                  "base_simulation_id": 1000 + number,
+                  "curr_task_status": "New",
+                  "solver": None,
+                  "storyboard": None,
+                  "submodels": [f"submodel_{number}.csv"],
+                  "results": [],
+                  "parents": [number - 1] if shape == "chain" and number > 1 else []}
+        vertex.update(properties)
+        vertices.append(vertex)
+    return {"Root": {"Behaviour": "Solve", "LCs": vertices}}
+
+# ------------------------------------------------ Handler benchmarks ------------------------------------------------ #
+
+
+def handler_benchmarks(environment):
+    handler = Handler(None)
+    payloads = {
+        "simulation_values": ("handle_response_to_simulation_values_request",
+                              [{"id": number,
+                                "name": f"Value {number}",
+                                "description": "",
+                                "simulationId": 1,
+                                "type": "value",
+                                "overview": {"content": f"{number}.5 mm"}} for number in range(LIST_SIZE)]),
+        "stype_submodels": ("handle_response_to_stype_submodels_requests",
+                            [{"id": number,
+                              "name": f"submodel_{number}.csv",
+                              "sha256": "{:064x}".format(number)} for number in range(LIST_SIZE)]),
+        "loadcase_simulations": ("handle_response_to_loadcase_simulations_request",
+                                 [{"id": number, "name": f"Simulation {number}"} for number in range(LIST_SIZE)]),
+        "simulation_files": ("handle_response_to_simulation_files_request",
+                             [{"id": number, "name": f"file_{number}.xlsx"} for number in range(LIST_SIZE)]),
+    }
+    for name, (method_name, content) in payloads.items():
+        body = json.dumps({"content": content, "totalPages": 1, "last": True}).encode("utf-8")
+        method = getattr(handler, method_name)
+
+        # every call decodes body again, as it is done for every new response
+        def run(method=method, body=body):
+            method(BufferedResponse(200, {}, body))
+
+        yield measure(f"handler.{name}[{LIST_SIZE}]", run, operations=LIST_SIZE)
+
+# ------------------------------------------------- Graph benchmarks ------------------------------------------------- #
+
+
+def graph_benchmarks(environment):
+    for size in GRAPH_SIZES:
+        data = list(solve_data(size)["Root"]["LCs"])
+        json_file = environment.write_json(solve_data(1))
+
+        # every round uses new application session, so that entities are not registered yet
+        def setup_add_vertex():
+            return Graph(environment.create_app_session(json_file))
+
+        def run_add_vertex(graph, data=data):
+            for item in data:
+                graph.add_vertex(item)
+
+        with silent_output():
+            yield measure(f"graph.add_vertex[{size}]", run_add_vertex, operations=size,
+                          setup=setup_add_vertex, rounds=3)
+
+            graph = setup_add_vertex()
+            run_add_vertex(graph)
+
+        def setup_build_edges(graph=graph):
+            graph.edges.clear()
+            for vertex in graph.vertices.values():
+                vertex.links.clear()
+            return graph
+
+        def run_build_edges(graph):
+            graph.build_graph_edges()
+
+        yield measure(f"graph.build_graph_edges[{size}]", run_build_edges, operations=size,
+                      setup=setup_build_edges, rounds=10)
+
+# ----------------------------------------------- Terminal benchmarks ------------------------------------------------ #
+
+
+def terminal_benchmarks(environment):
+    colored_message = vars(terminal)["__colored_message"]
+
+    def run():
+        for number in range(CALLS):
+            colored_message("info", "Vertex {} is done, released vertices: {}", number, [number + 1])
+        # messages are written by background thread, measured time includes their writing
+        terminal.flush()
+
+    with silent_output():
+        yield measure("terminal.colored_message", run, operations=CALLS)
+
+# ---------------------------------------------- Decorators benchmarks ----------------------------------------------- #
+
+
+def decorators_benchmarks(environment):
+    @method_info
+    def decorated(first, second=None):
+        return first
+
+    def run():
+        for number in range(CALLS):
+            decorated(number, second=number)
+
+    with silent_output():
+        yield measure("decorators.method_info", run, operations=CALLS)
+
+# --------------------------------------------- JSON data manager benchmarks ----------------------------------------- #
+
+
+def json_benchmarks(environment):
+    data = solve_data(JSON_SIZE)
+    json_file = environment.write_json(data, "large.json")
+    output_file = os.path.join(environment.directory, "output.json")
+    manager = JSONDataManager(json_file)
+
+    def run_load():
+        manager.get_json_data()
+
+    def run_dump():
+        JSONDataManager.dump_data(data, output_file)
+
+    with silent_output():
+        yield measure(f"json.load[{JSON_SIZE}]", run_load, operations=JSON_SIZE, rounds=3)
+        yield measure(f"json.dump[{JSON_SIZE}]", run_dump, operations=JSON_SIZE, rounds=3)
+
+# ------------------------------------------------ Workflow benchmarks ----------------------------------------------- #
+
+
+def workflow_benchmarks(environment):
+    """
+    Cost of one pass of workflow main loop: chain of vertices with finished tasks and no results to download
+    is processed, one vertex is completed per pass
+    """
+    backend = environment.backend
+    for size in CHAIN_SIZES:
+        data = solve_data(size, curr_task_status="Finished", submodels=[])
+        for vertex in data["Root"]["LCs"]:
+            simulation_id = backend.add_simulation(identifier=vertex["base_simulation_id"] + 1000000)
+            vertex["curr_simulation_id"] = simulation_id
+            vertex["curr_task_id"] = backend.add_task(simulation_id)
+        json_file = environment.write_json(data, f"chain_{size}.json")
+
+        def setup():
+            with silent_output():
+                return WorkFlow(environment.create_app_session(json_file))
+
+        # passes are counted by calls of `collect()` made by main loop once per pass
+        ticks = [0]
+        collect = BootstrapPipeline.collect
+
+        def counted_collect(self, *args, **kwargs):
+            ticks[0] += 1
+            return collect(self, *args, **kwargs)
+
+        def run(workflow):
+            with silent_output():
+                workflow._run_all_tasks()
+
+        BootstrapPipeline.collect = counted_collect
+        try:
+            run(setup())
+            passes = ticks[0]
+            yield measure(f"workflow.tick[chain {size}]", run, operations=passes, setup=setup, rounds=3)
+        finally:
+            BootstrapPipeline.collect = collect
+
+# ------------------------------------------------------ Runner ------------------------------------------------------ #
+
+
+def get_arguments():
+    arg_parser = argparse.ArgumentParser(prog="python -m benchmarks.micro",
+                                         description="Microbenchmarks of client-side hot paths")
+
+    arg_parser.add_argument("-k", action="store",
+                            help="Comma separated groups of benchmarks: {} | Optional".format(", ".join(GROUPS)))
+    arg_parser.add_argument("--save", action="store_true", help="Save results as new baselines | Optional")
+    arg_parser.add_argument("--tolerance", action="store", type=float, default=TOLERANCE,
+                            help="Allowed relative regression | Optional")
+
+    return arg_parser.parse_args()
+
+
+GROUPS = {"handler": handler_benchmarks,
+          "graph": graph_benchmarks,
+          "terminal": terminal_benchmarks,
+          "decorators": decorators_benchmarks,
+          "json": json_benchmarks,
+          "workflow": workflow_benchmarks}
+
+
+def main():
+    arguments = get_arguments()
+    baselines = load_baselines(BASELINES)
+    groups = arguments.k.split(",") if arguments.k else list(GROUPS)
+
+    results = []
+    report([], baselines)
+    with BenchmarkEnvironment() as environment:
+        for group in groups:
+            for result in GROUPS[group.strip()](environment):
+                results.append(result)
+                report([result], baselines, header=False)
+
+    if arguments.save:
+        save_baselines(BASELINES, results)
+        print(f"Baselines saved to {BASELINES}")
+        return 0
+
+    regressions = compare(results, baselines, arguments.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
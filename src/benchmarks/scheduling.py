@@ -0,0 +1,101 @@
+# coding: utf-8
+import argparse
+import sys
+from benchmarks.macro import SCENARIOS, RESULT_SIZE, run_scenario
+from core.modules.workflow import WorkFlow
+from core.network.timeout import VirtualClock
+from tools.stub import StubSettings
+
+
+# realistic lifecycle of tasks, executed in virtual time;
+# runs are deterministic for equal solving times, random ones depend on order of concurrent submissions of tasks
+WAITING_TIME = 30.0
+SOLVING_TIME = 600.0
+SOLVING_SPREAD = 0.0
+SLOTS = 32
+POLLING_ENDPOINT = "GET /rest/task/{id}"
+
+SIZES = {"chain": 20, "fanout": 64, "diamond": 64, "shared": 64}
+
+
+def run_virtual(name, size, slots=SLOTS, spread=SOLVING_SPREAD, walk_interval=None, seed=0):
+    """
+    Runs Solve scenario of macro benchmark in virtual time, so that tasks solved for hours take seconds of real time
+    :param name: name of scenario
+    :param size: number of vertices
+    :param slots: number of tasks solved by backend at the same time; 0 - no limit
+    :param spread: relative random spread of solving time
+    :param walk_interval: interval of polling vertices in progress in seconds; optional; default one of workflow
+    :param seed: seed of random solving times
+    :return: ScenarioResult object, its times are virtual
+    """
+    settings = StubSettings(login=False, waiting_time=WAITING_TIME, solving_time=SOLVING_TIME,
+                            solving_spread=spread, slots=slots, result_size=RESULT_SIZE, seed=seed)
+    return run_scenario(name, size, settings=settings, clock=VirtualClock(),
+                        walk_interval=walk_interval or WorkFlow.WALK_INTERVAL)
+
+
+def utilisation(result, slots):
+    """
+    :return: tuple of average number of solved tasks, utilisation of slots (None if their number is unlimited)
+             and average time of task in queue, in seconds
+    """
+    if not result.tasks or result.makespan <= 0:
+        return 0.0, None, 0.0
+    busy = sum(task["finished"] - task["started"] for task in result.tasks)
+    queued = sum(task["started"] - task["created"] for task in result.tasks) / len(result.tasks)
+    concurrency = busy / result.makespan
+    return concurrency, concurrency / slots if slots else None, queued
+
+
+def report(result, slots, stream=sys.stdout):
+    concurrency, usage, queued = utilisation(result, slots)
+    polls = result.statistics.get(POLLING_ENDPOINT, {}).get("requests", 0)
+    stream.write("{:<10}{:>8}{:>14.1f}{:>12}{:>10.1f}{:>10.1f}{:>10.2f}{:>10}{:>12.1f}{:>10.2f}\n".format(
+        result.name, result.size, result.makespan / 3600, polls, polls / result.size, result.requests_per_vertex,
+        concurrency, "{:.1%}".format(usage) if usage is not None else "-", queued / 60, result.real))
+
+
+def get_arguments():
+    arg_parser = argparse.ArgumentParser(prog="python -m benchmarks.scheduling",
+                                         description="Workflow scheduling in virtual time")
+
+    arg_parser.add_argument("-k", action="store",
+                            help="Comma separated scenarios: {} | Optional".format(", ".join(SIZES)))
+    arg_parser.add_argument("--size", action="store", type=int,
+                            help="Number of vertices of every scenario | Optional")
+    arg_parser.add_argument("--slots", action="store", type=int, default=SLOTS,
+                            help="Number of tasks solved by backend at the same time, 0 - no limit | Optional")
+    arg_parser.add_argument("--spread", action="store", type=float, default=SOLVING_SPREAD,
+                            help="Relative random spread of solving time, e.g. 0.5 | Optional")
+    arg_parser.add_argument("--walk-interval", action="store", type=float,
+                            help="Interval of polling vertices in progress in seconds | Optional")
+    arg_parser.add_argument("--seed", action="store", type=int, default=0,
+                            help="Seed of random solving times | Optional")
+
+    return arg_parser.parse_args()
+
+
+def main():
+    arguments = get_arguments()
+    scenarios = [name.strip() for name in arguments.k.split(",")] if arguments.k else list(SIZES)
+
+    failed = []
+    sys.stdout.write("{:<10}{:>8}{:>14}{:>12}{:>10}{:>10}{:>10}{:>10}{:>12}{:>10}\n".format(
+        "Scenario", "size", "makespan h", "polls", "polls/v", "reqs/v", "solving", "slots", "queue min", "real s"))
+    for name in scenarios:
+        if name not in SCENARIOS or name == "targets":
+            raise ValueError(f"Unknown scenario of type Solve: {name}")
+        result = run_virtual(name, arguments.size or SIZES[name], arguments.slots, arguments.spread,
+                             arguments.walk_interval, arguments.seed)
+        report(result, arguments.slots)
+        if not result.success or result.errors:
+            failed.append(name)
+
+    for name in failed:
+        print(f"FAILED {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
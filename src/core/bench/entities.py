@@ -1,7 +1,10 @@
 # coding: utf-8
+import asyncio
 import enum
-from core.network.timeout import Timeout
+import os
+import threading
 from ui.console import terminal
+from core.network.uploader import Uploader
 from core.utils.decorators import method_info
 
 # -------------------------------------------- Entity Types (Enumeration) -------------------------------------------- #
@@ -19,9 +22,15 @@ class EntityTypes(enum.Enum):
 
 class AbstractEntity(object):
     """
-    Class containing common behaviour of main CML-Bench entities, such as loadcases, simulations, tasks
+    Class containing common behaviour of main CML-Bench entities, such as loadcases, simulations, tasks.
+    Entities should be obtained with `get()`, which returns object shared by whole application session.
+    Base information of entity (name, parent ID, path in tree, tree ID) is requested on first access to it,
+    unless it is already known from list response
     """
-    def __init__(self, app_session, identifier):
+
+    ENTITY_TYPE = None
+
+    def __init__(self, app_session, identifier, **attributes):
         self._app_session = app_session
         self._identifier = identifier
         self._http_session = self._app_session.session
@@ -34,9 +43,56 @@ class AbstractEntity(object):
         self._tree_path = None
         self._tree_id = None
 
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._hydrate(attributes)
+
     def __repr__(self):
         return "Entity type: {} | Entity ID: {}".format(self.entity_type, self.identifier)
 
+    @classmethod
+    def get(cls, app_session, identifier, **attributes):
+        """
+        :param app_session: application session
+        :param identifier: entity ID
+        :param attributes: already known base information of entity, e.g. from list response;
+                           `name`, `parent_id`, `tree_path`, `tree_id`
+        :return: entity object from registry of application session
+        """
+        entity = app_session.registry.get(cls.ENTITY_TYPE, identifier,
+                                          lambda: cls(app_session, identifier, **attributes))
+        entity._hydrate(attributes)
+        return entity
+
+    def refresh(self):
+        """
+        Forgets base information of entity, it will be read again on next access: from metadata cache,
+        if it is enabled and entry has not expired, or from server
+        """
+        with self._lock:
+            self._loaded = False
+            self._name = None
+            self._parent_id = None
+            self._tree_path = None
+            self._tree_id = None
+
+    def invalidate(self):
+        """
+        Forgets base information of entity after it has been modified, also in metadata cache,
+        so that it is requested from server on next access
+        """
+        if self._app_session.cache is not None and self.entity_type:
+            self._app_session.cache.invalidate(self.entity_type.value, self.identifier)
+        self.refresh()
+
+    @property
+    def _async_sender(self):
+        return self._app_session.async_sender
+
+    @property
+    def _async_handler(self):
+        return self._app_session.async_handler
+
     @property
     def entity_type(self):
         return self._entity_type
@@ -47,18 +103,26 @@ class AbstractEntity(object):
 
     @property
     def name(self):
+        if self._name is None:
+            self._load()
         return self._name
 
     @property
     def parent_id(self):
+        if self._parent_id is None:
+            self._load()
         return self._parent_id
 
     @property
     def tree_path(self):
+        if self._tree_path is None:
+            self._load()
         return self._tree_path
 
     @property
     def tree_id(self):
+        if self._tree_id is None:
+            self._load()
         return self._tree_id
 
     @method_info
@@ -66,17 +130,79 @@ class AbstractEntity(object):
         if isinstance(entity_type, EntityTypes):
             self._entity_type = entity_type
 
+    def _paginate(self, send_method, handle_method_name, *args, **params):
+        """
+        :param send_method: list request method of Sender
+        :param handle_method_name: name of Handler method parsing list response
+        :param args: positional arguments of list request method
+        :param params: keyword arguments of Handler method
+        :return: lazy iterator over all items of list request
+        """
+        def parse(response):
+            return getattr(self._handler, handle_method_name)(response, **params)
+
+        return self._sender.paginate(send_method, parse, *args)
+
+    def _hydrate(self, attributes):
+        """
+        Fills unknown base information of entity
+        :param attributes: dictionary with keys `name`, `parent_id`, `tree_path`, `tree_id`; all keys are optional
+        """
+        with self._lock:
+            for key in ("name", "parent_id", "tree_path", "tree_id"):
+                if attributes.get(key) is not None and getattr(self, "_" + key) is None:
+                    setattr(self, "_" + key, attributes.get(key))
+
+    def _load(self):
+        """
+        Requests base information of entity, if it was not requested yet
+        """
+        with self._lock:
+            if not self._loaded:
+                self._setup_attributes()
+                self._loaded = True
+
+    async def _load_async(self):
+        """
+        Asynchronous version of `_load()`: base information is requested without blocking event loop.
+        Concurrent coroutines are not coalesced, so entity may be requested by several of them
+        """
+        if self._loaded or not self.entity_type:
+            return
+        base_info = self.__get_cached_base_info()
+        if base_info is None:
+            response = await self._async_sender.send_entity_base_info_request(self.identifier, self.entity_type.value)
+            base_info = await self._async_handler.handle_response_to_entity_base_info_request(response)
+            self.__cache_base_info(base_info)
+        with self._lock:
+            if not self._loaded:
+                self.__set_base_info(base_info)
+                self._loaded = True
+
     @method_info
     def _setup_attributes(self):
         if self.entity_type:
-            response = self._sender.send_entity_base_info_request(self.identifier, self.entity_type.value)
-            Timeout.hold_your_horses()
-            self._handler.set_response(response)
-            base_info = self._handler.handle_response_to_entity_base_info_request()
-            self._name = base_info.get("name")
-            self._parent_id = base_info.get("parent_id")
-            self._tree_path = base_info.get("tree_path")
-            self._tree_id = base_info.get("tree_id")
+            base_info = self.__get_cached_base_info()
+            if base_info is None:
+                response = self._sender.send_entity_base_info_request(self.identifier, self.entity_type.value)
+                base_info = self._handler.handle_response_to_entity_base_info_request(response)
+                self.__cache_base_info(base_info)
+            self.__set_base_info(base_info)
+
+    def __get_cached_base_info(self):
+        cache = self._app_session.cache
+        return cache.get(self.entity_type.value, self.identifier) if cache is not None else None
+
+    def __cache_base_info(self, base_info):
+        cache = self._app_session.cache
+        if cache is not None and base_info.get("name") is not None:
+            cache.put(self.entity_type.value, self.identifier, base_info)
+
+    def __set_base_info(self, base_info):
+        self._name = base_info.get("name")
+        self._parent_id = base_info.get("parent_id")
+        self._tree_path = base_info.get("tree_path")
+        self._tree_id = base_info.get("tree_id")
 
 # ------------------------------------------------- Loadcase Object -------------------------------------------------- #
 
@@ -85,10 +211,12 @@ class Loadcase(AbstractEntity):
     """
     Class for representation of the loadcase entity
     """
-    def __init__(self, app_session, identifier):
-        super().__init__(app_session, identifier)
-        self._set_entity_type(EntityTypes.LOADCASE)
-        self._setup_attributes()
+
+    ENTITY_TYPE = EntityTypes.LOADCASE
+
+    def __init__(self, app_session, identifier, **attributes):
+        super().__init__(app_session, identifier, **attributes)
+        self._set_entity_type(self.ENTITY_TYPE)
 
     @method_info
     def get_simulations(self):
@@ -97,14 +225,13 @@ class Loadcase(AbstractEntity):
                  or None, if some error occurred during reading simulations
         """
 
-        response = self._sender.send_loadcase_simulations_request(self.identifier)
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        simulation_ids_list = self._handler.handle_response_to_loadcase_simulations_request()
-        if simulation_ids_list:
-            simulations = []
-            for simulation_id in simulation_ids_list:
-                simulations.append(Simulation(self._app_session, simulation_id))
+        simulations_data = self._paginate(self._sender.send_loadcase_simulations_request,
+                                          "handle_response_to_loadcase_simulations_request",
+                                          self.identifier)
+        simulations = [Simulation.get(self._app_session, item.get("id"),
+                                      name=item.get("name"), parent_id=self.identifier)
+                       for item in simulations_data]
+        if simulations:
             return simulations
         return None
 
@@ -115,14 +242,11 @@ class Loadcase(AbstractEntity):
                  or None, if some error occurred during reading targets
         """
 
-        response = self._sender.send_loadcase_targets_request(self.identifier)
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        targets_data_list = self._handler.handle_response_to_loadcase_targets_request()
-        if targets_data_list:
-            targets = []
-            for target_data in targets_data_list:
-                targets.append(Target(target_data))
+        targets_data = self._paginate(self._sender.send_loadcase_targets_request,
+                                      "handle_response_to_loadcase_targets_request",
+                                      self.identifier)
+        targets = [Target(target_data) for target_data in targets_data]
+        if targets:
             return targets
         return None
 
@@ -179,7 +303,6 @@ class Loadcase(AbstractEntity):
                    "tolerance": tolerance,
                    "value": value}
         response = self._sender.send_add_loadcase_target_request(self.identifier, payload)
-        Timeout.hold_your_horses()
 
         # if no target with that name exists, create new
         # else, need to find ID of target by name
@@ -205,8 +328,7 @@ class Loadcase(AbstractEntity):
             return None
 
         terminal.show_info_message("Adding new target...")
-        self._handler.set_response(response)
-        target_data = self._handler.handle_response_to_add_loadcase_target_request()
+        target_data = self._handler.handle_response_to_add_loadcase_target_request(response)
 
         if target_data:
             return Target(target_data)
@@ -222,9 +344,7 @@ class Loadcase(AbstractEntity):
 
         assert isinstance(target, Target)
         response = self._sender.send_remove_loadcase_target_request(self.identifier, target.identifier)
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        target_id = self._handler.handle_response_to_remove_loadcase_target_request()
+        target_id = self._handler.handle_response_to_remove_loadcase_target_request(response)
         return target_id
 
 # ------------------------------------------------- Loadcase Target -------------------------------------------------- #
@@ -308,23 +428,43 @@ class Simulation(AbstractEntity):
     """
     Class for representation of the simulation entity
     """
-    def __init__(self, app_session, identifier):
-        super().__init__(app_session, identifier)
-        self._set_entity_type(EntityTypes.SIMULATION)
-        self._setup_attributes()
+
+    ENTITY_TYPE = EntityTypes.SIMULATION
+    DEFAULTS_TTL = 600  # time to live of default task parameters in seconds
+
+    def __init__(self, app_session, identifier, **attributes):
+        super().__init__(app_session, identifier, **attributes)
+        self._set_entity_type(self.ENTITY_TYPE)
 
     @method_info
     def set_description(self, description):
         response = self._sender.send_entity_base_info_request(self.identifier, self.entity_type.value)
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        payload = self._handler.get_full_server_base_response()
+        payload = self._handler.get_full_server_base_response(response)
         if isinstance(payload, dict) and "description" in payload.keys():
+            # decoded response may be shared with response cache, so it is copied before modification
+            payload = dict(payload)
             payload["description"] = str(description)
             response = self._sender.send_modify_simulation_request(self.identifier, payload)
-            Timeout.hold_your_horses()
-            self._handler.set_response(response)
-            result = self._handler.handle_response_to_update_simulation_request(description=description)
+            result = self._handler.handle_response_to_update_simulation_request(response, description=description)
+            self.invalidate()
+            return result
+        else:
+            terminal.show_error_message("No description found in server response")
+            return None
+
+    async def set_description_async(self, description):
+        """
+        Asynchronous version of `set_description()`
+        """
+        response = await self._async_sender.send_entity_base_info_request(self.identifier, self.entity_type.value)
+        payload = await self._async_handler.get_full_server_base_response(response)
+        if isinstance(payload, dict) and "description" in payload.keys():
+            payload = dict(payload)
+            payload["description"] = str(description)
+            response = await self._async_sender.send_modify_simulation_request(self.identifier, payload)
+            result = await self._async_handler.handle_response_to_update_simulation_request(response,
+                                                                                           description=description)
+            self.invalidate()
             return result
         else:
             terminal.show_error_message("No description found in server response")
@@ -333,9 +473,7 @@ class Simulation(AbstractEntity):
     @method_info
     def get_description(self):
         response = self._sender.send_entity_base_info_request(self.identifier, EntityTypes.SIMULATION.value)
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        result = self._handler.handle_response_to_entity_base_info_request()
+        result = self._handler.handle_response_to_entity_base_info_request(response)
         return result.get("description")
 
     @method_info
@@ -344,7 +482,7 @@ class Simulation(AbstractEntity):
         :return: parent loadcase of current simulation
         """
 
-        return Loadcase(self._app_session, self.parent_id)
+        return Loadcase.get(self._app_session, self.parent_id)
 
     @method_info
     def get_tasks(self):
@@ -353,14 +491,12 @@ class Simulation(AbstractEntity):
                  or None, if some error occurred during reading tasks
         """
 
-        response = self._sender.send_simulation_tasks_request(self.identifier)
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        simulation_tasks_list = self._handler.handle_response_to_simulation_tasks_request()
-        if simulation_tasks_list:
-            tasks = []
-            for task_id in simulation_tasks_list:
-                tasks.append(Task(self._app_session, task_id))
+        tasks_data = self._paginate(self._sender.send_simulation_tasks_request,
+                                    "handle_response_to_simulation_tasks_request",
+                                    self.identifier)
+        tasks = [Task.get(self._app_session, item.get("id"), name=item.get("name"), parent_id=self.identifier)
+                 for item in tasks_data]
+        if tasks:
             return tasks
         return None
 
@@ -372,29 +508,79 @@ class Simulation(AbstractEntity):
                  or None, if some error occurred during reading files
         """
 
-        response = self._sender.send_simulation_files_request(self.identifier)
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        simulation_files_list_of_dicts = self._handler.handle_response_to_simulation_files_request()
+        files = self.iterate_files()
+        simulation_files_list_of_dicts = list(files)
+        if files.failed and not simulation_files_list_of_dicts:
+            return None
         return simulation_files_list_of_dicts
 
     @method_info
-    def get_values(self):
+    def iterate_files(self):
         """
+        :return: lazy iterator over dictionaries like {id: fileName},
+                 where fileName is a file belongs to current simulation
+        """
+
+        return self._paginate(self._sender.send_simulation_files_request,
+                              "handle_response_to_simulation_files_request",
+                              self.identifier)
+
+    @method_info
+    def get_values(self, finished=False):
+        """
+        :param finished: True if simulation is finished, so its key results can not change anymore
+                         and are kept in metadata cache
         :return: return list of Values, or None, if some error occurred during reading
         """
 
-        response = self._sender.send_simulation_values_request(self.identifier)
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        simulation_values_data = self._handler.handle_response_to_simulation_values_request()
-        values = []
-        if simulation_values_data:
-            for item_data in simulation_values_data:
-                values.append(Value(item_data))
+        cache = self._app_session.cache if finished else None
+        simulation_values_data = cache.get("values", self.identifier) if cache is not None else None
+        if simulation_values_data is None:
+            simulation_values_data, complete = self.__request_values()
+            if cache is not None and complete:
+                cache.put("values", self.identifier, simulation_values_data)
+        values = [Value(item_data) for item_data in simulation_values_data or []]
+        if values:
             return values
         return None
 
+    def __request_values(self):
+        """
+        :return: tuple of list of dictionaries with key results data and flag,
+                 which is True if all key results were read successfully
+        """
+        items = self._paginate(self._sender.send_simulation_values_request,
+                               "handle_response_to_simulation_values_request",
+                               self.identifier)
+        simulation_values_data = list(items)
+        complete = not items.failed
+        # values of key results are requested concurrently after the whole list is read
+        responses = self._sender.fan_out(self._sender.send_simulation_value_request,
+                                         Simulation.__get_value_requests(simulation_values_data))
+        # response is released, when it is parsed, so response shared by duplicate items is parsed once
+        parsed = {}
+        for item_data in simulation_values_data:
+            key = (item_data.get("parent"), item_data.get("id"))
+            if key not in parsed and responses.get(key) is not None:
+                parsed[key] = self._handler.handle_response_to_simulation_value_request(responses.pop(key),
+                                                                                        item_data.get("name"),
+                                                                                        item_data.get("overview"))
+            if key in parsed:
+                details = parsed[key]
+                if details:
+                    item_data.update(details)
+                else:
+                    complete = False
+        return simulation_values_data, complete
+
+    @staticmethod
+    def __get_value_requests(simulation_values_data):
+        """
+        :return: list of (simulation ID, key result ID) of key results which values have to be requested
+        """
+        return [(item_data.get("parent"), item_data.get("id")) for item_data in simulation_values_data
+                if item_data.get("id") and item_data.get("type") == "value"]
+
     @method_info
     def download_files(self, *files):
         """
@@ -404,27 +590,87 @@ class Simulation(AbstractEntity):
         """
 
         list_of_downloaded_files = []
-        simulation_files = self.get_files()
-        list_of_simulation_file_ids = [item.get("id") for item in simulation_files]
-        list_of_simulation_file_names = [item.get("name") for item in simulation_files]
+
+        # read simulation files page by page until all selected files are found
+        simulation_file_ids = {}
+        for item in self.iterate_files():
+            if item.get("name") in files:
+                simulation_file_ids[item.get("name")] = item.get("id")
+                if len(simulation_file_ids) == len(set(files)):
+                    break
 
         for file in files:
             # check if fileName is in simulation files
-            if file in list_of_simulation_file_names:
-                file_id = list_of_simulation_file_ids[list_of_simulation_file_names.index(file)]
-
-                response = self._sender.send_download_file_request(self.identifier, file_id)
-                Timeout.hold_your_horses()
-                self._handler.set_response(response)
-                file_content = self._handler.handle_response_to_download_file_request()
-                if file_content and isinstance(file_content, bytes):
-                    with open(self._app_session.cfg.local_storage + "\\" + file, mode="wb") as f:
-                        f.write(file_content)
+            if file in simulation_file_ids:
+                file_id = simulation_file_ids[file]
+                path = os.path.join(self._app_session.cfg.local_storage, file)
+                if self._app_session.downloader.download(self.identifier, file_id, path) is not None:
                     list_of_downloaded_files.append(file)
             else:
                 terminal.show_warning_message("Selected file \"{}\" not in simulation files".format(file))
         return list_of_downloaded_files
 
+    async def get_files_async(self):
+        """
+        Asynchronous version of `get_files()`
+        :return: return list of dictionaries like {id: fileName},
+                 or None, if some error occurred during reading files
+        """
+
+        files = self._async_sender.paginate(self._async_sender.send_simulation_files_request,
+                                            self._async_handler.handle_response_to_simulation_files_request,
+                                            self.identifier)
+        simulation_files_list_of_dicts = [item async for item in files]
+        if files.failed and not simulation_files_list_of_dicts:
+            return None
+        return simulation_files_list_of_dicts
+
+    async def get_values_async(self):
+        """
+        Asynchronous version of `get_values()`
+        :return: return list of Values, or None, if some error occurred during reading
+        """
+
+        simulation_values_data = self._async_sender.paginate(
+            self._async_sender.send_simulation_values_request,
+            self._async_handler.handle_response_to_simulation_values_request,
+            self.identifier)
+        simulation_values_data = [item_data async for item_data in simulation_values_data]
+        responses = await self._async_sender.fan_out(self._async_sender.send_simulation_value_request,
+                                                     Simulation.__get_value_requests(simulation_values_data))
+        for item_data in simulation_values_data:
+            response = responses.get((item_data.get("parent"), item_data.get("id")))
+            if response is not None:
+                details = await self._async_handler.handle_response_to_simulation_value_request(
+                    response, item_data.get("name"), item_data.get("overview"))
+                if details:
+                    item_data.update(details)
+        values = [Value(item_data) for item_data in simulation_values_data]
+        if values:
+            return values
+        return None
+
+    async def download_files_async(self, *files):
+        """
+        Asynchronous version of `download_files()`, chosen files are downloaded concurrently
+        :param files: files to be downloaded
+        :return: return list of successfully downloaded files
+        """
+
+        simulation_files = await self.get_files_async() or []
+        simulation_file_ids = {item.get("name"): item.get("id") for item in simulation_files}
+
+        async def download(file):
+            path = os.path.join(self._app_session.cfg.local_storage, file)
+            size = await self._app_session.downloader.download_async(self.identifier, simulation_file_ids[file], path)
+            return file if size is not None else None
+
+        for file in files:
+            if file not in simulation_file_ids:
+                terminal.show_warning_message("Selected file \"{}\" not in simulation files".format(file))
+        downloaded = await asyncio.gather(*[download(file) for file in files if file in simulation_file_ids])
+        return [file for file in downloaded if file is not None]
+
     @method_info
     def clone(self):
         """
@@ -433,11 +679,25 @@ class Simulation(AbstractEntity):
         """
 
         response = self._sender.send_clone_simulation_request(self.identifier)
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        cloned_simulation_id = self._handler.handle_response_to_clone_simulation_request()
+        cloned_simulation_id = self._handler.handle_response_to_clone_simulation_request(response)
+        if cloned_simulation_id:
+            # entry of the same ID may be left in metadata cache by another backend with the same address
+            simulation = Simulation.get(self._app_session, cloned_simulation_id)
+            simulation.invalidate()
+            return simulation
+        return None
+
+    async def clone_async(self):
+        """
+        Asynchronous version of `clone()`
+        :return: return new simulation, or None, if some error occurred
+        """
+        response = await self._async_sender.send_clone_simulation_request(self.identifier)
+        cloned_simulation_id = await self._async_handler.handle_response_to_clone_simulation_request(response)
         if cloned_simulation_id:
-            return Simulation(self._app_session, cloned_simulation_id)
+            simulation = Simulation.get(self._app_session, cloned_simulation_id)
+            simulation.invalidate()
+            return simulation
         return None
 
     @method_info
@@ -447,9 +707,7 @@ class Simulation(AbstractEntity):
         :return: true if success, false otherwise
         """
         response = self._sender.send_simulation_submodels_update_request(self.identifier, [])
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        status = self._handler.handle_response_to_simulation_submodels_erase_request()
+        status = self._handler.handle_response_to_simulation_submodels_erase_request(response)
         return status
 
     @method_info
@@ -459,13 +717,11 @@ class Simulation(AbstractEntity):
         """
 
         response = self._sender.send_simulation_submodels_request(self.identifier)
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        simulation_submodels_ids = self._handler.handle_response_to_simulation_submodels_request()
-        if simulation_submodels_ids:
+        simulation_submodels_data = self._handler.handle_response_to_simulation_submodels_request(response)
+        if simulation_submodels_data:
             submodels = []
-            for submodel_id in simulation_submodels_ids:
-                submodels.append(Submodel(self._app_session, submodel_id))
+            for item in simulation_submodels_data:
+                submodels.append(Submodel.get(self._app_session, item.get("id"), name=item.get("name")))
             return submodels
         return None
 
@@ -492,16 +748,56 @@ class Simulation(AbstractEntity):
 
         # Send request to update simulation submodels (that's how it works in CML-Bench)
         response = self._sender.send_simulation_submodels_update_request(self.identifier, simulation_submodels_ids)
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        updated_simulation_submodels_ids = self._handler.handle_response_to_simulation_submodels_request()
-        if updated_simulation_submodels_ids:
+        updated_simulation_submodels_data = self._handler.handle_response_to_simulation_submodels_request(response)
+        if updated_simulation_submodels_data:
             submodels = []
-            for submodel_id in updated_simulation_submodels_ids:
-                submodels.append(Submodel(self._app_session, submodel_id))
+            for item in updated_simulation_submodels_data:
+                submodels.append(Submodel.get(self._app_session, item.get("id"), name=item.get("name")))
             return submodels
         return None
 
+    async def erase_submodels_async(self):
+        """
+        Asynchronous version of `erase_submodels()`
+        :return: true if success, false otherwise
+        """
+        response = await self._async_sender.send_simulation_submodels_update_request(self.identifier, [])
+        status = await self._async_handler.handle_response_to_simulation_submodels_erase_request(response)
+        return status
+
+    async def get_submodels_async(self):
+        """
+        Asynchronous version of `get_submodels()`
+        :return: return list of current simulation submodels, or None, if some error occurred
+        """
+        response = await self._async_sender.send_simulation_submodels_request(self.identifier)
+        simulation_submodels_data = await self._async_handler.handle_response_to_simulation_submodels_request(response)
+        if simulation_submodels_data:
+            return [Submodel.get(self._app_session, item.get("id"), name=item.get("name"))
+                    for item in simulation_submodels_data]
+        return None
+
+    async def add_submodels_async(self, *submodels):
+        """
+        Asynchronous version of `add_submodels()`
+        :param submodels: submodels to be added into current simulation
+        :return: list of ALL simulation submodels
+        """
+        assert all(isinstance(item, Submodel) for item in submodels)
+
+        simulation_submodels = await self.get_submodels_async() or []
+        simulation_submodels.extend(submodels)
+        simulation_submodels_ids = [submodel.identifier for submodel in simulation_submodels]
+
+        response = await self._async_sender.send_simulation_submodels_update_request(self.identifier,
+                                                                                     simulation_submodels_ids)
+        updated_simulation_submodels_data = await self._async_handler.handle_response_to_simulation_submodels_request(
+            response)
+        if updated_simulation_submodels_data:
+            return [Submodel.get(self._app_session, item.get("id"), name=item.get("name"))
+                    for item in updated_simulation_submodels_data]
+        return None
+
     @method_info
     def run(self, **parameters):
         """
@@ -513,6 +809,43 @@ class Simulation(AbstractEntity):
         :return: created Task or None if error occurred
         """
 
+        defaults = None if "exec" in parameters.keys() else self.__get_defaults(parameters.get("bsi"))
+        params = self.__get_task_parameters(parameters, defaults)
+        if params is None:
+            return None
+
+        # terminal.show_info_dict("Run request payload parameters:", params)
+
+        response = self._sender.send_run_request(params)
+        task_id = self._handler.handle_response_to_run_request(response)
+        if task_id:
+            return Task.get(self._app_session, task_id)
+        return None
+
+    async def run_async(self, **parameters):
+        """
+        Asynchronous version of `run()`
+        :return: created Task or None if error occurred
+        """
+        defaults = None if "exec" in parameters.keys() else await self.__get_defaults_async(parameters.get("bsi"))
+        if defaults is not None and self._name is None:
+            # name of simulation is sent with default parameters, so it is loaded without blocking event loop
+            await self._load_async()
+        params = self.__get_task_parameters(parameters, defaults)
+        if params is None:
+            return None
+        response = await self._async_sender.send_run_request(params)
+        task_id = await self._async_handler.handle_response_to_run_request(response)
+        if task_id:
+            return Task.get(self._app_session, task_id)
+        return None
+
+    def __get_task_parameters(self, parameters, defaults):
+        """
+        :param parameters: keywords of `run()`
+        :param defaults: default task parameters, used if solver or post-processor is not defined by `exec`
+        :return: payload of run request, or None, if there are no default parameters
+        """
         params = {}
         if "exec" in parameters.keys():
             executable = parameters.get("exec")
@@ -536,55 +869,41 @@ class Simulation(AbstractEntity):
                 else:
                     terminal.show_error_message("No storyboard selected. Cannot execute post-processor")
         else:
-            if "bsi" in parameters.keys():
-                base_simulation_id = parameters.get("bsi")
-                received_params = self.__get_defaults(base_simulation_id)
-            else:
-                received_params = self.__get_defaults()
-
-            if received_params is None:
+            if defaults is None:
                 terminal.show_error_message("Failed to run simulation")
                 return None
 
             # Modify `parentId` and `parentName` keys
             # __get_defaults() may return these parameters from another simulation
             # remove unnecessary parameters
-            params["objectType"] = received_params.get("objectType")
+            params["objectType"] = defaults.get("objectType")
             params["parentName"] = self.name
-            params["owner"] = received_params.get("owner")
-            params["ownerId"] = received_params.get("ownerId")
-            params["id"] = received_params.get("id")
-            params["numOfCores"] = received_params.get("numOfCores")
-            params["memory"] = received_params.get("memory")
-            params["storyboard"] = received_params.get("storyboard")
-            params["storyboardId"] = received_params.get("storyboardId")
-            params["solverName"] = received_params.get("solverName")
-            params["solverDisplayName"] = received_params.get("solverDisplayName")
-            params["clusterName"] = received_params.get("clusterName")
-            params["solverGroup"] = received_params.get("solverGroup")
-            params["type"] = received_params.get("type")
-            params["typeDisplayName"] = received_params.get("typeDisplayName")
-            params["solvingType"] = received_params.get("solvingType")
-            params["notified"] = received_params.get("notified")
-            params["startupArguments"] = received_params.get("startupArguments")
-            params["autoCreateReport"] = received_params.get("autoCreateReport")
-            params["withPostprocessing"] = received_params.get("withPostprocessing")
-            params["postprocessorName"] = received_params.get("postprocessorName")
-            params["parentType"] = received_params.get("parentType")
+            params["owner"] = defaults.get("owner")
+            params["ownerId"] = defaults.get("ownerId")
+            params["id"] = defaults.get("id")
+            params["numOfCores"] = defaults.get("numOfCores")
+            params["memory"] = defaults.get("memory")
+            params["storyboard"] = defaults.get("storyboard")
+            params["storyboardId"] = defaults.get("storyboardId")
+            params["solverName"] = defaults.get("solverName")
+            params["solverDisplayName"] = defaults.get("solverDisplayName")
+            params["clusterName"] = defaults.get("clusterName")
+            params["solverGroup"] = defaults.get("solverGroup")
+            params["type"] = defaults.get("type")
+            params["typeDisplayName"] = defaults.get("typeDisplayName")
+            params["solvingType"] = defaults.get("solvingType")
+            params["notified"] = defaults.get("notified")
+            params["startupArguments"] = defaults.get("startupArguments")
+            params["autoCreateReport"] = defaults.get("autoCreateReport")
+            params["withPostprocessing"] = defaults.get("withPostprocessing")
+            params["postprocessorName"] = defaults.get("postprocessorName")
+            params["parentType"] = defaults.get("parentType")
             params["parentId"] = self.identifier
-            params["cluster"] = received_params.get("cluster")
-            params["clusterId"] = received_params.get("clusterId")
-            params["expectedSolvingTime"] = received_params.get("expectedSolvingTime")
+            params["cluster"] = defaults.get("cluster")
+            params["clusterId"] = defaults.get("clusterId")
+            params["expectedSolvingTime"] = defaults.get("expectedSolvingTime")
 
-        # terminal.show_info_dict("Run request payload parameters:", params)
-
-        response = self._sender.send_run_request(params)
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        task_id = self._handler.handle_response_to_run_request()
-        if task_id:
-            return Task(self._app_session, task_id)
-        return None
+        return params
 
     @method_info
     def __get_defaults(self, base_simulation_id=None):
@@ -594,14 +913,42 @@ class Simulation(AbstractEntity):
         :return: dictionary containing default task running parameters such as solver, cluster, etc.
         """
 
-        if base_simulation_id:
-            response = self._sender.send_task_defaults_request(base_simulation_id)
-        else:
-            response = self._sender.send_task_defaults_request(self.identifier)
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        task_startup_defaults = self._handler.handle_response_to_task_defaults_request()
-        return task_startup_defaults
+        simulation_id = base_simulation_id or self.identifier
+
+        def request_defaults():
+            cache = self._app_session.cache
+            defaults = cache.get("task defaults", simulation_id) if cache is not None else None
+            if defaults is None:
+                response = self._sender.send_task_defaults_request(simulation_id)
+                defaults = self._handler.handle_response_to_task_defaults_request(response)
+                if cache is not None:
+                    cache.put("task defaults", simulation_id, defaults)
+            return defaults
+
+        # defaults of base simulation are requested once for all vertices cloned from it
+        task_startup_defaults = self._app_session.registry.cached(("task defaults", simulation_id),
+                                                                  request_defaults,
+                                                                  Simulation.DEFAULTS_TTL)
+        if task_startup_defaults is None:
+            return None
+        return dict(task_startup_defaults)
+
+    async def __get_defaults_async(self, base_simulation_id=None):
+        """
+        Asynchronous version of `__get_defaults()`, defaults are not coalesced with concurrent requests of other
+        vertices, but they are revalidated with cached response and kept in metadata cache
+        """
+        simulation_id = base_simulation_id or self.identifier
+        cache = self._app_session.cache
+        defaults = cache.get("task defaults", simulation_id) if cache is not None else None
+        if defaults is None:
+            response = await self._async_sender.send_task_defaults_request(simulation_id)
+            defaults = await self._async_handler.handle_response_to_task_defaults_request(response)
+            if cache is not None:
+                cache.put("task defaults", simulation_id, defaults)
+        if defaults is None:
+            return None
+        return dict(defaults)
 
 # --------------------------------------------------- Task Object ---------------------------------------------------- #
 
@@ -610,10 +957,12 @@ class Task(AbstractEntity):
     """
     Class for representation of the task entity
     """
-    def __init__(self, app_session, identifier):
-        super().__init__(app_session, identifier)
-        self._set_entity_type(EntityTypes.TASK)
-        self._setup_attributes()
+
+    ENTITY_TYPE = EntityTypes.TASK
+
+    def __init__(self, app_session, identifier, **attributes):
+        super().__init__(app_session, identifier, **attributes)
+        self._set_entity_type(self.ENTITY_TYPE)
 
     @method_info
     def get_status(self):
@@ -621,9 +970,16 @@ class Task(AbstractEntity):
         :return: current task status, or None, if error occurred
         """
         response = self._sender.send_task_info_request(self.identifier)
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        task_status = self._handler.handle_response_to_task_status_response()
+        task_status = self._handler.handle_response_to_task_status_response(response)
+        return task_status
+
+    async def get_status_async(self):
+        """
+        Asynchronous version of `get_status()`
+        :return: current task status, or None, if error occurred
+        """
+        response = await self._async_sender.send_task_info_request(self.identifier)
+        task_status = await self._async_handler.handle_response_to_task_status_response(response)
         return task_status
 
     @method_info
@@ -632,9 +988,17 @@ class Task(AbstractEntity):
         :return: tuple of string representation of end waiting and end solving time, or (None, None) if error occurred
         """
         response = self._sender.send_task_info_request(self.identifier)
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        task_end_waiting, task_end_solving = self._handler.handle_response_to_task_estimations_response()
+        task_end_waiting, task_end_solving = self._handler.handle_response_to_task_estimations_response(response)
+        return task_end_waiting, task_end_solving
+
+    async def get_time_estimation_async(self):
+        """
+        Asynchronous version of `get_time_estimation()`
+        :return: tuple of string representation of end waiting and end solving time, or (None, None) if error occurred
+        """
+        response = await self._async_sender.send_task_info_request(self.identifier)
+        task_end_waiting, task_end_solving = await self._async_handler.handle_response_to_task_estimations_response(
+            response)
         return task_end_waiting, task_end_solving
 
 # -------------------------------------------------- S|Type Object --------------------------------------------------- #
@@ -644,24 +1008,23 @@ class SubmodelType(AbstractEntity):
     """
     Class for representation of the s|type entity
     """
-    def __init__(self, app_session, identifier):
-        super().__init__(app_session, identifier)
-        self._set_entity_type(EntityTypes.STYPE)
-        self._setup_attributes()
+
+    ENTITY_TYPE = EntityTypes.STYPE
+
+    def __init__(self, app_session, identifier, **attributes):
+        super().__init__(app_session, identifier, **attributes)
+        self._set_entity_type(self.ENTITY_TYPE)
 
     @method_info
     def get_submodels(self):
         """
         :return: list of existing submodels in current s|type, or None, if some error occurred
         """
-        response = self._sender.send_stype_submodels_request(self.tree_path)
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        stype_submodels_list = self._handler.handle_response_to_stype_submodels_requests()
-        if stype_submodels_list:
-            submodels = []
-            for submodel_id in stype_submodels_list:
-                submodels.append(Submodel(self._app_session, submodel_id))
+        submodels_data = self._paginate(self._sender.send_stype_submodels_request,
+                                        "handle_response_to_stype_submodels_requests",
+                                        self.tree_path)
+        submodels = [Submodel.get(self._app_session, item.get("id"), name=item.get("name")) for item in submodels_data]
+        if submodels:
             return submodels
         return None
 
@@ -676,7 +1039,7 @@ class SubmodelType(AbstractEntity):
         """
         # FIXME wtf??? create instance of SubmodelType inside its method
         if "stype" in params.keys():
-            stype = SubmodelType(self._app_session, params.get("stype"))
+            stype = SubmodelType.get(self._app_session, params.get("stype"))
         else:
             # stype = SubmodelType(self._app_session, self._app_session.cfg.server_storage)
             stype = self
@@ -686,12 +1049,113 @@ class SubmodelType(AbstractEntity):
         else:
             add_to_clipboard = "off"
 
-        submodels = []
-        for file in files:
-            response = self._sender.send_upload_submodel_request(file, stype.tree_id, add_to_clipboard)
-            Timeout.hold_your_horses()
-            self._handler.set_response(response)
-            result = self._handler.handle_response_to_upload_submodel_request()
+        # files with already known content are not uploaded, existing submodels are used instead
+        index = self._app_session.digest_index
+        index.sync(stype.tree_id, stype.list_submodels)
+        digests = index.digest_all(files)
+
+        submodels = [None] * len(files)
+        owned, waiting = [], []
+        for number, digest in enumerate(digests):
+            if self.__use_known_submodel(index, stype, files[number], digest, submodels, number):
+                continue
+            # the same file may be uploaded by another vertex right now
+            event = index.claim(stype.tree_id, digest)
+            if event is None:
+                owned.append(number)
+            else:
+                waiting.append((number, event))
+
+        try:
+            self.__upload_files(index, stype, files, digests, owned, submodels, add_to_clipboard)
+        finally:
+            for number in owned:
+                index.release(stype.tree_id, digests[number])
+
+        not_uploaded = []
+        for number, event in waiting:
+            event.wait()
+            if not self.__use_known_submodel(index, stype, files[number], digests[number], submodels, number):
+                not_uploaded.append(number)
+        self.__upload_files(index, stype, files, digests, not_uploaded, submodels, add_to_clipboard)
+
+        index.save()
+        return [submodel for submodel in submodels if submodel is not None]
+
+    @method_info
+    def list_submodels(self):
+        """
+        :return: list of dictionaries with keys `id`, `name` and `digest` for all submodels of current s|type,
+                 or None, if some error occurred
+        """
+        items = self._paginate(self._sender.send_stype_submodels_request,
+                               "handle_response_to_stype_submodels_requests",
+                               self.tree_path)
+        result = list(items)
+        if items.failed:
+            return None
+        return result
+
+    async def upload_submodel_async(self, *files, **params):
+        """
+        Asynchronous version of `upload_submodel()`, files are uploaded concurrently, not more than
+        `Upload connections` at the same time
+        :return: list of uploaded submodels
+        """
+        stype = SubmodelType.get(self._app_session, params.get("stype")) if "stype" in params.keys() else self
+        add_to_clipboard = "on" if bool(params.get("add_to_clipboard")) else "off"
+
+        if stype._tree_id is None:
+            await stype._load_async()
+        # listing of s|type and digests of files are read in threads, not to block event loop
+        loop = asyncio.get_running_loop()
+        index = self._app_session.digest_index
+        await loop.run_in_executor(None, lambda: index.sync(stype.tree_id, stype.list_submodels))
+        digests = await loop.run_in_executor(None, index.digest_all, files)
+        semaphore = asyncio.Semaphore(self._app_session.cfg.upload_connections or Uploader.DEFAULT_CONNECTIONS)
+        submodels = [None] * len(files)
+
+        async def upload(number):
+            if self.__use_known_submodel(index, stype, files[number], digests[number], submodels, number):
+                return
+            # the same file may be uploaded by another vertex right now
+            event = index.claim(stype.tree_id, digests[number])
+            if event is not None:
+                await loop.run_in_executor(None, event.wait)
+                if not self.__use_known_submodel(index, stype, files[number], digests[number], submodels, number):
+                    await self.__upload_file_async(index, stype, files[number], digests[number], submodels, number,
+                                                   add_to_clipboard, semaphore)
+                return
+            try:
+                await self.__upload_file_async(index, stype, files[number], digests[number], submodels, number,
+                                               add_to_clipboard, semaphore)
+            finally:
+                index.release(stype.tree_id, digests[number])
+
+        await asyncio.gather(*[upload(number) for number in range(len(files))])
+        index.save()
+        return [submodel for submodel in submodels if submodel is not None]
+
+    def __use_known_submodel(self, index, stype, file, digest, submodels, number):
+        submodel_id = index.lookup(stype.tree_id, digest)
+        if submodel_id is None:
+            return False
+        terminal.show_info_message("Submodel \"{}\" is already uploaded, submodel id to use in simulation: {}",
+                                   os.path.basename(file), submodel_id)
+        submodels[number] = Submodel.get(self._app_session, submodel_id)
+        return True
+
+    def __upload_files(self, index, stype, files, digests, numbers, submodels, add_to_clipboard):
+        """
+        Uploads files and remembers digests of uploaded submodels
+        :param numbers: indices of files to be uploaded
+        """
+        if not numbers:
+            return
+        responses = self._app_session.uploader.upload([files[number] for number in numbers],
+                                                      stype.tree_id, add_to_clipboard)
+        for number, response in zip(numbers, responses):
+            result = self._handler.handle_response_to_upload_submodel_request(response)
             if result is not None:
                 submodel_ids_to_delete = result["to_delete"]
                 submodel_ids_for_simulation = result["to_insert"]
@@ -699,21 +1163,43 @@ class SubmodelType(AbstractEntity):
                 if len(submodel_ids_to_delete) == 0:
                     terminal.show_info_message("Uploaded submodel id to use in simulation: {}",
                                                submodel_ids_for_simulation[0])
-                    submodels.append(Submodel(self._app_session, submodel_ids_for_simulation[0]))
                 else:
                     terminal.show_warning_message("Uploaded submodel duplicates already existing submodel")
                     terminal.show_warning_message("Created submodel with id {} will be deleted",
                                                   submodel_ids_to_delete[0])
                     response = self._sender.send_delete_submodel_from_server_request(submodel_ids_to_delete[0])
-                    Timeout.hold_your_horses()
-                    self._handler.set_response(response)
-                    _ = self._handler.handle_response_to_delete_submodel_from_server_request()
+                    _ = self._handler.handle_response_to_delete_submodel_from_server_request(response)
                     terminal.show_warning_message("Duplicate was deleted")
                     terminal.show_info_message("Already existing submodel id to use in simulation: {}",
                                                submodel_ids_for_simulation[0])
-                    submodels.append(Submodel(self._app_session, submodel_ids_for_simulation[0]))
+                index.remember(stype.tree_id, digests[number], submodel_ids_for_simulation[0])
+                submodels[number] = Submodel.get(self._app_session, submodel_ids_for_simulation[0])
 
-        return submodels
+    async def __upload_file_async(self, index, stype, file, digest, submodels, number, add_to_clipboard, semaphore):
+        """
+        Uploads file and remembers digest of uploaded submodel
+        :param semaphore: asyncio.Semaphore limiting number of concurrent uploads
+        """
+        async with semaphore:
+            response = await self._async_sender.send_upload_submodel_request(file, stype.tree_id, add_to_clipboard)
+        result = await self._async_handler.handle_response_to_upload_submodel_request(response)
+        if result is None:
+            return
+        submodel_ids_to_delete = result["to_delete"]
+        submodel_ids_for_simulation = result["to_insert"]
+
+        if len(submodel_ids_to_delete) == 0:
+            terminal.show_info_message("Uploaded submodel id to use in simulation: {}", submodel_ids_for_simulation[0])
+        else:
+            terminal.show_warning_message("Uploaded submodel duplicates already existing submodel")
+            terminal.show_warning_message("Created submodel with id {} will be deleted", submodel_ids_to_delete[0])
+            response = await self._async_sender.send_delete_submodel_from_server_request(submodel_ids_to_delete[0])
+            _ = await self._async_handler.handle_response_to_delete_submodel_from_server_request(response)
+            terminal.show_warning_message("Duplicate was deleted")
+            terminal.show_info_message("Already existing submodel id to use in simulation: {}",
+                                       submodel_ids_for_simulation[0])
+        index.remember(stype.tree_id, digest, submodel_ids_for_simulation[0])
+        submodels[number] = Submodel.get(self._app_session, submodel_ids_for_simulation[0])
 
 # ------------------------------------------------- Submodel Object -------------------------------------------------- #
 
@@ -722,7 +1208,9 @@ class Submodel(AbstractEntity):
     """
     Class for representation of the submodel entity
     """
-    def __init__(self, app_session, identifier):
-        super().__init__(app_session, identifier)
-        self._set_entity_type(EntityTypes.SUBMODEL)
-        self._setup_attributes()
+
+    ENTITY_TYPE = EntityTypes.SUBMODEL
+
+    def __init__(self, app_session, identifier, **attributes):
+        super().__init__(app_session, identifier, **attributes)
+        self._set_entity_type(self.ENTITY_TYPE)
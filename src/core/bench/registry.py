@@ -0,0 +1,133 @@
+# coding: utf-8
+import threading
+from concurrent.futures import Future
+from core.bench.entities import EntityTypes
+from core.network.timeout import Timeout
+
+
+class SingleFlight(object):
+    """
+    Coalesces concurrent identical calls: while call with some key is in progress,
+    other callers with the same key wait for its result instead of repeating it
+    """
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__calls = {}
+
+    def call(self, key, function):
+        """
+        :param key: hashable key of call
+        :param function: callable without parameters
+        :return: result of function, called by this or concurrent caller
+        """
+        with self.__lock:
+            future = self.__calls.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self.__calls[key] = future
+        if not owner:
+            return future.result()
+
+        try:
+            result = function()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+
+
+class EntityRegistry(object):
+    """
+    Identity map of CML-Bench entities shared by whole application session.
+    Every entity is requested from server once and reused by all vertices; concurrent requests of the same entity
+    are coalesced. Base information of entities (name, parent, path) is refreshed after time to live of entity type.
+    Registry also memoizes other read-only responses, e.g. default task parameters of simulations
+    """
+
+    # time to live of entities in seconds by entity type, None - entity never expires
+    TTL = {EntityTypes.LOADCASE: 600,
+           EntityTypes.SIMULATION: 300,
+           EntityTypes.TASK: 60,
+           EntityTypes.STYPE: 3600,
+           EntityTypes.SUBMODEL: None}
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__entries = {}
+        self.__single_flight = SingleFlight()
+
+    def get(self, entity_type, identifier, factory):
+        """
+        :param entity_type: entity type (EntityTypes)
+        :param identifier: entity ID
+        :param factory: callable creating entity object, if it is not registered yet
+        :return: registered entity object
+        """
+        ttl = EntityRegistry.TTL.get(entity_type)
+
+        def create_or_refresh(entity):
+            if entity is None:
+                return factory()
+            entity.refresh()
+            return entity
+
+        return self.__get((entity_type, identifier), create_or_refresh, ttl)
+
+    def cached(self, key, function, ttl=None):
+        """
+        Memoizes result of function
+        :param key: hashable key of result
+        :param function: callable without parameters; None results are not memoized
+        :param ttl: time to live of result in seconds; optional; default is unlimited
+        :return: memoized or new result of function
+        """
+        return self.__get(key, lambda _: function(), ttl)
+
+    def invalidate(self, key):
+        """
+        Removes entity (key is tuple of entity type and ID) or memoized result from registry
+        """
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def __get(self, key, load, ttl):
+        """
+        :param load: callable, taking expired value (or None, if there is no value) and returning new value
+        """
+        value = self.__lookup(key, ttl)
+        if value is not None:
+            return value
+
+        def load_once():
+            # value could be loaded by another caller after previous lookup
+            fresh_value = self.__lookup(key, ttl)
+            if fresh_value is not None:
+                return fresh_value
+            with self.__lock:
+                entry = self.__entries.get(key)
+            new_value = load(entry[0] if entry else None)
+            if new_value is not None:
+                with self.__lock:
+                    self.__entries[key] = (new_value, Timeout.now())
+            return new_value
+
+        return self.__single_flight.call(key, load_once)
+
+    def __lookup(self, key, ttl):
+        """
+        :return: value, which has not expired yet, or None
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+        if entry is None:
+            return None
+        value, timestamp = entry
+        if ttl is not None and Timeout.now() - timestamp > ttl:
+            return None
+        return value
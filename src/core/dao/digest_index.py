@@ -0,0 +1,162 @@
+# coding: utf-8
+import hashlib
+import json
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DigestIndex(object):
+    """
+    Persistent index of uploaded submodels: maps SHA-256 digest of local file content to ID of submodel on server.
+    Index is kept in JSON file in local storage, entries are separated by backend address and s|type.
+    Digests of local files are cached together with their size and modification time,
+    so unchanged files are not read again in the next runs.
+    Index is filled by uploads; listing of s|type adds submodels uploaded by other clients only if server reports
+    their digests, otherwise only submodels uploaded from this local storage are reused
+    """
+
+    FILE_NAME = ".submodels.digests.json"
+    CHUNK_SIZE = 16 * 1024 * 1024  # 16 MB
+    MAX_WORKERS = 8
+
+    def __init__(self, path, backend):
+        """
+        :param path: path to index file
+        :param backend: CML-Bench backend address
+        """
+        self.__path = path
+        self.__lock = threading.RLock()
+        self.__sync_locks = {}
+        self.__synced = set()
+        self.__in_flight = {}
+        self.__data = DigestIndex.__load(path)
+        self.__submodels = self.__data["submodels"].setdefault(backend, {})
+        self.__files = self.__data["files"]
+
+    def digest(self, path):
+        """
+        :param path: path to local file
+        :return: hex SHA-256 digest of file content
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        with self.__lock:
+            cached = self.__files.get(path)
+            if cached and cached.get("signature") == signature:
+                return cached.get("digest")
+
+        sha = hashlib.sha256()
+        if stat.st_size > 0:
+            with open(path, mode="rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    with memoryview(mapped) as view:
+                        for offset in range(0, stat.st_size, DigestIndex.CHUNK_SIZE):
+                            sha.update(view[offset:offset + DigestIndex.CHUNK_SIZE])
+        digest = sha.hexdigest()
+        with self.__lock:
+            self.__files[path] = {"signature": signature, "digest": digest}
+        return digest
+
+    def digest_all(self, paths):
+        """
+        Computes digests of several files in parallel
+        :param paths: paths to local files
+        :return: list of digests in the same order as paths
+        """
+        paths = list(paths)
+        if len(paths) < 2:
+            return [self.digest(path) for path in paths]
+        with ThreadPoolExecutor(max_workers=min(len(paths), DigestIndex.MAX_WORKERS),
+                                thread_name_prefix="digest") as pool:
+            return list(pool.map(self.digest, paths))
+
+    def sync(self, stype, fetch):
+        """
+        Seeds and validates entries of s|type with listing of its submodels, once per run.
+        Entries referring to submodels, which do not exist on server anymore, are removed
+        :param stype: tree ID of s|type
+        :param fetch: callable, returning list of dictionaries with keys `id` and `digest` (may be None)
+                      for all submodels of s|type, or None, if listing failed
+        """
+        with self.__lock:
+            stype_lock = self.__sync_locks.setdefault(str(stype), threading.Lock())
+        with stype_lock:
+            if str(stype) in self.__synced:
+                return
+            items = fetch()
+            if items is None:
+                return
+            with self.__lock:
+                entries = self.__submodels.setdefault(str(stype), {})
+                existing = {item.get("id") for item in items}
+                for digest in [d for d, submodel_id in entries.items() if submodel_id not in existing]:
+                    del entries[digest]
+                for item in items:
+                    if item.get("digest"):
+                        entries[item.get("digest")] = item.get("id")
+            self.__synced.add(str(stype))
+
+    def lookup(self, stype, digest):
+        """
+        :return: ID of submodel with the same content in s|type, or None, if there is no such submodel
+        """
+        with self.__lock:
+            return self.__submodels.get(str(stype), {}).get(digest)
+
+    def remember(self, stype, digest, submodel_id):
+        with self.__lock:
+            self.__submodels.setdefault(str(stype), {})[digest] = submodel_id
+
+    def claim(self, stype, digest):
+        """
+        Marks file content as being uploaded into s|type, so concurrent uploads of the same content are not started
+        :return: None, if caller has to upload file and call `release` afterwards,
+                 or event, which will be set when upload started by another caller is finished
+        """
+        with self.__lock:
+            key = (str(stype), digest)
+            event = self.__in_flight.get(key)
+            if event is not None:
+                return event
+            self.__in_flight[key] = threading.Event()
+            return None
+
+    def release(self, stype, digest):
+        with self.__lock:
+            event = self.__in_flight.pop((str(stype), digest), None)
+        if event is not None:
+            event.set()
+
+    def save(self):
+        """
+        Writes index into file, previous file is replaced atomically
+        """
+        with self.__lock:
+            # entries of deleted local files are not needed anymore
+            for path in [p for p in self.__files.keys() if not os.path.isfile(p)]:
+                del self.__files[path]
+            temp_path = self.__path + ".tmp"
+            try:
+                with open(temp_path, mode="w") as f:
+                    json.dump(self.__data, f)
+                os.replace(temp_path, self.__path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def __load(path):
+        data = None
+        if os.path.isfile(path):
+            try:
+                with open(path, mode="r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = None
+        if not isinstance(data, dict):
+            data = {}
+        data.setdefault("submodels", {})
+        data.setdefault("files", {})
+        return data
@@ -0,0 +1,102 @@
+# coding: utf-8
+import json
+import sqlite3
+import threading
+import time
+
+
+class MetadataCache(object):
+    """
+    Persistent cache of rarely changing CML-Bench data, kept in SQLite database in local storage:
+    base information of entities, default task parameters and key results of finished simulations.
+    Entries are separated by backend address, every entry is identified by its kind (e.g. entity type) and key
+    (e.g. entity ID) and expires after time to live of its kind
+    """
+
+    FILE_NAME = ".metadata.sqlite"
+
+    # time to live of entries in seconds by kind, None - entry never expires
+    DAY = 24 * 60 * 60
+    TTL = {"loadcase": DAY,
+           "simulation": DAY,
+           "task": DAY,
+           "submodelType": 7 * DAY,
+           "submodel": 30 * DAY,
+           "task defaults": DAY,
+           "values": None}
+
+    def __init__(self, path, backend):
+        """
+        :param path: path to database file
+        :param backend: CML-Bench backend address
+        """
+        self.__backend = backend
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        with self.__connection:
+            self.__connection.execute("CREATE TABLE IF NOT EXISTS entries ("
+                                      "backend TEXT NOT NULL, "
+                                      "kind TEXT NOT NULL, "
+                                      "key TEXT NOT NULL, "
+                                      "value TEXT NOT NULL, "
+                                      "expires REAL, "
+                                      "PRIMARY KEY (backend, kind, key))")
+
+    def get(self, kind, key):
+        """
+        :param kind: kind of entry, e.g. entity type
+        :param key: key of entry, e.g. entity ID
+        :return: cached value, or None, if there is no such entry or it has expired
+        """
+        with self.__lock:
+            row = self.__connection.execute("SELECT value, expires FROM entries "
+                                            "WHERE backend = ? AND kind = ? AND key = ?",
+                                            (self.__backend, kind, str(key))).fetchone()
+        if row is None:
+            return None
+        value, expires = row
+        if expires is not None and expires < time.time():
+            self.invalidate(kind, key)
+            return None
+        return json.loads(value)
+
+    def put(self, kind, key, value):
+        """
+        Saves value, which expires after time to live of its kind
+        :param kind: kind of entry, e.g. entity type
+        :param key: key of entry, e.g. entity ID
+        :param value: JSON serializable value; None is not saved
+        """
+        if value is None:
+            return
+        ttl = MetadataCache.TTL.get(kind, MetadataCache.DAY)
+        expires = time.time() + ttl if ttl is not None else None
+        with self.__lock, self.__connection:
+            self.__connection.execute("INSERT OR REPLACE INTO entries (backend, kind, key, value, expires) "
+                                      "VALUES (?, ?, ?, ?, ?)",
+                                      (self.__backend, kind, str(key), json.dumps(value), expires))
+
+    def invalidate(self, kind=None, key=None):
+        """
+        Removes entries of current backend
+        :param kind: kind of entries; optional; if not defined, all entries are removed
+        :param key: key of entry; optional; if not defined, all entries of kind are removed
+        """
+        query = "DELETE FROM entries WHERE backend = ?"
+        params = [self.__backend]
+        if kind is not None:
+            query += " AND kind = ?"
+            params.append(kind)
+            if key is not None:
+                query += " AND key = ?"
+                params.append(str(key))
+        with self.__lock, self.__connection:
+            self.__connection.execute(query, params)
+
+    def close(self):
+        with self.__lock:
+            # expired entries are removed once per run
+            with self.__connection:
+                self.__connection.execute("DELETE FROM entries WHERE expires IS NOT NULL AND expires < ?",
+                                          (time.time(),))
+            self.__connection.close()
@@ -1,10 +1,24 @@
 # coding: utf-8
+import os
 import requests
 import uuid
+from requests.adapters import HTTPAdapter
 from core.network.sender import Sender
 from core.network.handler import Handler
+from core.network.async_sender import AsyncSender
+from core.network.async_handler import AsyncHandler
+from core.network.limiter import RateLimiter
+from core.network.metrics import RequestMetrics
+from core.network.downloader import Downloader
+from core.network.uploader import Uploader
+from core.network.cassette import RecordingAdapter, ReplayAdapter
+from core.bench.registry import EntityRegistry
+from core.dao.digest_index import DigestIndex
+from core.dao.metadata_cache import MetadataCache
 from core.modules.healthcheck import Healthcheck
 from core.modules.authorization import Authorization
+from core.modules.exporter import MetricsExporter
+from core.modules.timeline import export_timeline
 from core.modules.workflow import WorkFlow
 from ui.console import terminal
 from core.utils.decorators import method_info
@@ -12,12 +26,37 @@ from core.utils.exception_manager import handle_unexpected_exception
 
 
 class AppSession(object):
+
+    CONNECTION_POOL_SIZE = 32
+
     def __init__(self, **kwargs):
         if "cfg" in kwargs.keys():
             self.__configuration_information = kwargs.get("cfg")
             self.__http_session = requests.Session()
+            # connections are shared by workers of bootstrap pipeline;
+            # traffic can be recorded into cassette file or replayed from it without network
+            if kwargs.get("replay"):
+                adapter = ReplayAdapter(kwargs.get("replay"), kwargs.get("replay_speed", 1.0),
+                                        pool_maxsize=AppSession.CONNECTION_POOL_SIZE)
+            elif kwargs.get("record"):
+                adapter = RecordingAdapter(kwargs.get("record"), pool_maxsize=AppSession.CONNECTION_POOL_SIZE)
+            else:
+                adapter = HTTPAdapter(pool_maxsize=AppSession.CONNECTION_POOL_SIZE)
+            self.__http_session.mount("http://", adapter)
+            self.__http_session.mount("https://", adapter)
+            self.__limiter = RateLimiter(self.__configuration_information.request_rate,
+                                         self.__configuration_information.request_burst)
+            self.__metrics = RequestMetrics()
             self.__sender = Sender(self)
             self.__handler = Handler(self)
+            self.__registry = EntityRegistry()
+            self.__downloader = Downloader(self)
+            self.__uploader = Uploader(self)
+            self.__digest_index = DigestIndex(os.path.join(self.__configuration_information.local_storage,
+                                                           DigestIndex.FILE_NAME),
+                                              self.__configuration_information.backend_address)
+            self.__async_sender = None
+            self.__async_handler = None
         else:
             raise ValueError("No configuration information available")
 
@@ -36,13 +75,31 @@ class AppSession(object):
         else:
             self.__save_results_path = None
 
+        # directory for timeline of vertices lifecycle, it is exported after workflow run
+        self.__timeline_path = kwargs.get("timeline")
+
         if "root" in kwargs.keys():
             self.__root_path = kwargs.get("root")
         else:
             raise ValueError("No root path selected")
 
+        # persistent metadata cache is used if it is enabled in configuration file and not disabled by caller;
+        # replayed session must send the same requests as recorded one, so it does not use cache
+        if (kwargs.get("cache", True) and not kwargs.get("replay") and
+                self.__configuration_information.metadata_cache):
+            self.__cache = MetadataCache(os.path.join(self.__configuration_information.local_storage,
+                                                      MetadataCache.FILE_NAME),
+                                         self.__configuration_information.backend_address)
+            if kwargs.get("clear_cache"):
+                self.__cache.invalidate()
+        else:
+            self.__cache = None
+
         self.__sid = uuid.uuid1()
 
+        # live state of workflow is exported, if metrics endpoint or file is configured
+        self.__exporter = MetricsExporter.from_configuration(self)
+
     @property
     def sid(self):
         return str(self.__sid)
@@ -63,6 +120,31 @@ class AppSession(object):
     def session(self):
         return self.__http_session
 
+    @property
+    def limiter(self):
+        return self.__limiter
+
+    @property
+    def metrics(self):
+        """
+        :return: RequestMetrics of all requests sent by this session
+        """
+        return self.__metrics
+
+    @property
+    def records_timeline(self):
+        """
+        :return: True if vertices record timelines of their lifecycle: timeline is exported or used by metrics
+        """
+        return self.__timeline_path is not None or self.__exporter is not None
+
+    @property
+    def exporter(self):
+        """
+        :return: MetricsExporter, or None, if it is not configured
+        """
+        return self.__exporter
+
     @property
     def sender(self):
         return self.__sender
@@ -71,6 +153,44 @@ class AppSession(object):
     def handler(self):
         return self.__handler
 
+    @property
+    def registry(self):
+        return self.__registry
+
+    @property
+    def cache(self):
+        """
+        :return: persistent metadata cache, or None, if it is disabled
+        """
+        return self.__cache
+
+    @property
+    def downloader(self):
+        return self.__downloader
+
+    @property
+    def uploader(self):
+        return self.__uploader
+
+    @property
+    def digest_index(self):
+        return self.__digest_index
+
+    @property
+    def async_sender(self):
+        """
+        :return: AsyncSender, created on first usage (requires `aiohttp` package)
+        """
+        if self.__async_sender is None:
+            self.__async_sender = AsyncSender(self)
+        return self.__async_sender
+
+    @property
+    def async_handler(self):
+        if self.__async_handler is None:
+            self.__async_handler = AsyncHandler(self)
+        return self.__async_handler
+
     @property
     def credentials(self):
         return self.__key_file
@@ -79,8 +199,18 @@ class AppSession(object):
     def results_path(self):
         return self.__save_results_path
 
+    def __export_timeline(self, graph):
+        try:
+            paths = export_timeline(list(graph.vertices.values()), self.__timeline_path)
+        except OSError as e:
+            terminal.show_warning_message("Failed to export timeline: {}", e)
+            return
+        terminal.show_info_message("Timeline of vertices is written into {}", ", ".join(paths))
+
     @method_info
     def execute(self):
+        if self.__exporter is not None:
+            self.__exporter.start()
         try:
             healthcheck = Healthcheck(self)
             state = healthcheck.get_status()
@@ -94,9 +224,20 @@ class AppSession(object):
 
             if status:
                 workflow = WorkFlow(self)
-                # God bless this script
-                workflow.process_json()
+                try:
+                    # God bless this script
+                    workflow.process_json()
+                finally:
+                    if self.__timeline_path is not None and workflow.graph is not None:
+                        self.__export_timeline(workflow.graph)
         except Exception as e:
             raise Exception(e)
         finally:
+            if self.__exporter is not None:
+                self.__exporter.stop()
+            if self.__metrics.total:
+                terminal.show_info_message("Requests summary:\n{}", "\n".join(
+                    terminal.get_blank() + line for line in self.__metrics.summary()))
             self.__http_session.close()
+            if self.__cache is not None:
+                self.__cache.close()
@@ -31,8 +31,7 @@ class Authorization(object):
                 self.__password = credentials_info.password
 
         login_response = self.__sender.send_login_request(self.__username, self.__password, False)
-        self.__handler.set_response(login_response)
-        connection_status = self.__handler.handle_response_to_login_request()
+        connection_status = self.__handler.handle_response_to_login_request(login_response)
         if not connection_status:
             self.__username = ''
             self.__password = ''
@@ -48,6 +48,102 @@ class ConfigurationInformation(object):
     def server_storage(self):
         return self.__info.get(self.__necessary_keys[2])
 
+    @property
+    def request_rate(self):
+        return self.__get_optional_value("request rate", float)
+
+    @property
+    def request_burst(self):
+        return self.__get_optional_value("request burst", int)
+
+    @property
+    def clone_workers(self):
+        return self.__get_optional_value("clone workers", int)
+
+    @property
+    def upload_workers(self):
+        return self.__get_optional_value("upload workers", int)
+
+    @property
+    def attach_workers(self):
+        return self.__get_optional_value("attach workers", int)
+
+    @property
+    def run_workers(self):
+        return self.__get_optional_value("run workers", int)
+
+    @property
+    def response_cache_size(self):
+        return self.__get_optional_value("response cache size", int)
+
+    @property
+    def fan_out_workers(self):
+        return self.__get_optional_value("fan-out workers", int)
+
+    @property
+    def upload_connections(self):
+        return self.__get_optional_value("upload connections", int)
+
+    @property
+    def upload_bandwidth(self):
+        return self.__get_optional_value("upload bandwidth", int)
+
+    @property
+    def download_workers(self):
+        return self.__get_optional_value("download workers", int)
+
+    @property
+    def download_chunk_size(self):
+        return self.__get_optional_value("download chunk size", int)
+
+    @property
+    def download_connections(self):
+        return self.__get_optional_value("download connections", int)
+
+    @property
+    def download_segment_threshold(self):
+        return self.__get_optional_value("download segment threshold", int)
+
+    @property
+    def metadata_cache(self):
+        return self.__get_optional_value("metadata cache", lambda value: value.lower() in ("on", "yes", "true"), False)
+
+    @property
+    def metrics_port(self):
+        """
+        :return: port or `host:port` of HTTP endpoint of metrics exporter, or None
+        """
+        return self.__get_optional_value("metrics port", str)
+
+    @property
+    def metrics_file(self):
+        return self.__get_optional_value("metrics file", str)
+
+    @property
+    def metrics_interval(self):
+        return self.__get_optional_value("metrics interval", float)
+
+    @property
+    def log_file(self):
+        """
+        :return: path of file, terminal messages are appended to in JSON lines format, or None
+        """
+        return self.__get_optional_value("log file", str)
+
+    @property
+    def log_level(self):
+        """
+        :return: minimal level of shown terminal messages (`debug`, `info`, `warning` or `error`), or None
+        """
+        return self.__get_optional_value("log level", str)
+
+    def page_size(self, endpoint):
+        """
+        :param endpoint: name of list endpoint, e.g. `loadcase simulations`
+        :return: page size of list requests to endpoint, or None, if not defined
+        """
+        return self.__get_optional_value(f"page size {endpoint}", int)
+
     @property
     def status_code(self):
         return self.__check_configuration_information().value.get("code")
@@ -56,6 +152,24 @@ class ConfigurationInformation(object):
     def status_description(self):
         return self.__check_configuration_information().value.get("description")
 
+    def __get_optional_value(self, key, value_type, default=None):
+        """
+        Reads optional value from configuration file
+        :param key: name of key in configuration file (lower case)
+        :param value_type: type of value (callable used for conversion)
+        :param default: value returned if key is missing or value can not be converted
+        :return: converted value
+        """
+        if not self.__info:
+            return default
+        value = self.__info.get(key)
+        if value is None or value == "":
+            return default
+        try:
+            return value_type(value)
+        except ValueError:
+            return default
+
     def __check_configuration_information(self):
         if not self.__file_exists:
             return ConfigurationInformationStatus.NO_CONFIG_FILE_ERROR
@@ -0,0 +1,224 @@
+# coding: utf-8
+import collections
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from core.modules.timeline import Steps
+from core.network.metrics import EndpointMetrics
+from ui.console import terminal
+
+
+class MetricsExporter(object):
+    """
+    Exporter of live workflow state and requests metrics in Prometheus text format: served by local HTTP endpoint
+    `/metrics` and/or periodically rewritten into text file (e.g. for textfile collector of node exporter).
+    All metrics are labelled with application session ID, so that metrics of concurrent runs can be distinguished
+    """
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+    DEFAULT_HOST = "127.0.0.1"
+    DEFAULT_INTERVAL = 15  # period of rewriting text file in seconds
+    PREFIX = "sinara"
+
+    def __init__(self, app_session, address=None, path=None, interval=None):
+        """
+        :param app_session: AppSession object
+        :param address: port or `host:port` of HTTP endpoint; optional
+        :param path: path of text file; optional
+        :param interval: period of rewriting text file in seconds; optional
+        """
+        self.__app_session = app_session
+        self.__address = address
+        self.__path = path
+        self.__interval = interval or MetricsExporter.DEFAULT_INTERVAL
+        self.__lock = threading.Lock()
+        self.__graph = None
+        self.__scheduler = None
+        self.__pipeline = None
+        self.__server = None
+        self.__writer = None
+        self.__stop = threading.Event()
+
+    @classmethod
+    def from_configuration(cls, app_session):
+        """
+        :return: MetricsExporter object, or None, if neither `Metrics port` nor `Metrics file` is configured
+        """
+        cfg = app_session.cfg
+        if not cfg.metrics_port and not cfg.metrics_file:
+            return None
+        return cls(app_session, cfg.metrics_port, cfg.metrics_file, cfg.metrics_interval)
+
+    @property
+    def url(self):
+        """
+        :return: URL of HTTP endpoint, or None, if it is not started
+        """
+        if self.__server is None:
+            return None
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def watch(self, graph=None, scheduler=None, pipeline=None):
+        """
+        Sets sources of workflow state; state of sources, which are not set, is not exported
+        :param graph: workflow graph
+        :param scheduler: Scheduler of workflow main loop
+        :param pipeline: BootstrapPipeline of workflow main loop
+        """
+        with self.__lock:
+            self.__graph = graph
+            self.__scheduler = scheduler
+            self.__pipeline = pipeline
+
+    def start(self):
+        if self.__address:
+            host, _, port = str(self.__address).rpartition(":")
+            self.__server = _MetricsHTTPServer((host or MetricsExporter.DEFAULT_HOST, int(port)), self)
+            threading.Thread(target=self.__server.serve_forever, name="metrics-server", daemon=True).start()
+            terminal.show_info_message("Metrics are served at {}", self.url)
+        if self.__path:
+            self.__writer = threading.Thread(target=self.__write_periodically, name="metrics-writer", daemon=True)
+            self.__writer.start()
+            terminal.show_info_message("Metrics are written into {}", self.__path)
+
+    def stop(self):
+        """
+        Stops HTTP endpoint and writes final state into text file
+        """
+        self.__stop.set()
+        if self.__writer is not None:
+            self.__writer.join()
+            self.__writer = None
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+
+    def render(self):
+        """
+        :return: current metrics in Prometheus text format
+        """
+        with self.__lock:
+            graph, scheduler, pipeline = self.__graph, self.__scheduler, self.__pipeline
+        labels = {"session": self.__app_session.sid}
+        families = []
+
+        if graph is not None:
+            statuses = collections.Counter()
+            waiting, solving = [], []
+            for vertex in list(graph.vertices.values()):
+                status = vertex.status
+                statuses[status if isinstance(status, str) else "Unknown"] += 1
+                queued = vertex.timeline.duration(Steps.QUEUED)
+                solved = vertex.timeline.duration(Steps.SOLVING)
+                if queued is not None:
+                    waiting.append(queued)
+                if solved is not None:
+                    solving.append(solved)
+            families.append(("vertices", "gauge", "Number of workflow vertices by status",
+                             [("", {"status": status}, count) for status, count in sorted(statuses.items())]))
+            families.append(("task_queue_wait_seconds", "summary",
+                             "Time from submission of task to observation of its solving",
+                             [("_count", {}, len(waiting)), ("_sum", {}, sum(waiting))]))
+            families.append(("task_solve_seconds", "summary",
+                             "Time from observation of task solving to observation of its end",
+                             [("_count", {}, len(solving)), ("_sum", {}, sum(solving))]))
+
+        if scheduler is not None:
+            families.append(("ready_vertices", "gauge", "Number of vertices ready to be processed",
+                             [("", {}, scheduler.ready_count)]))
+            families.append(("active_vertices", "gauge", "Number of vertices in progress",
+                             [("", {}, scheduler.active_count)]))
+            families.append(("done_vertices", "gauge", "Number of done vertices",
+                             [("", {}, scheduler.done_count)]))
+
+        if pipeline is not None:
+            families.append(("pipeline_in_flight", "gauge", "Number of vertices queued or processed by pipeline stage",
+                             [("", {"stage": stage.value}, count) for stage, count in pipeline.stages.items()]))
+
+        requests, errors, latency = [], [], []
+        for endpoint, metrics in sorted(self.__app_session.metrics.snapshot().items()):
+            label = {"endpoint": endpoint}
+            requests.append(("", label, metrics.count))
+            errors.append(("", label, metrics.errors))
+            cumulative = 0
+            for bound, number in zip(EndpointMetrics.LATENCY_BUCKETS + (float("inf"),), metrics.buckets):
+                cumulative += number
+                latency.append(("_bucket", dict(label, le="+Inf" if bound == float("inf") else repr(bound)),
+                                cumulative))
+            latency.append(("_count", label, metrics.count))
+            latency.append(("_sum", label, metrics.latency))
+        families.append(("requests_total", "counter", "Number of sent HTTP requests", requests))
+        families.append(("request_errors_total", "counter", "Number of HTTP responses with status code 400+", errors))
+        families.append(("request_duration_seconds", "histogram", "Latency of HTTP requests", latency))
+        families.append(("request_rate_limit", "gauge", "Current rate limit of requests per second",
+                         [("", {}, self.__app_session.limiter.rate)]))
+
+        # every family is a tuple of name, type, description and samples: suffix of name, labels and value
+        lines = []
+        for name, metric_type, description, samples in families:
+            name = f"{MetricsExporter.PREFIX}_{name}"
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for suffix, sample_labels, value in samples:
+                lines.append("{}{}{{{}}} {}".format(name, suffix, MetricsExporter.__labels(labels, sample_labels),
+                                                    MetricsExporter.__value(value)))
+        return "\n".join(lines) + "\n"
+
+    def write(self):
+        """
+        Writes current metrics into text file atomically, so that collector never reads incomplete file
+        """
+        temporary = f"{self.__path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(self.render())
+        os.replace(temporary, self.__path)
+
+    def __write_periodically(self):
+        while True:
+            stopped = self.__stop.wait(self.__interval)
+            try:
+                self.write()
+            except OSError as e:
+                terminal.show_warning_message("Failed to write metrics: {}", e)
+            if stopped:
+                return
+
+    @staticmethod
+    def __labels(common, labels):
+        items = list(common.items()) + list(labels.items())
+        return ",".join('{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace("\"", "\\\"")
+                                         .replace("\n", "\\n")) for key, value in items)
+
+    @staticmethod
+    def __value(value):
+        if isinstance(value, int):
+            return str(value)
+        return repr(float(value))
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.exporter.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", MetricsExporter.CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _MetricsHTTPServer(ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, address, exporter):
+        super().__init__(address, _MetricsRequestHandler)
+        self.exporter = exporter
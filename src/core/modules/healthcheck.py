@@ -1,5 +1,4 @@
 # coding: utf-8
-from core.network.timeout import Timeout
 
 
 class Healthcheck(object):
@@ -10,7 +9,5 @@ class Healthcheck(object):
 
     def get_status(self):
         response = self._sender.send_healthcheck_request()
-        Timeout.hold_your_horses()
-        self._handler.set_response(response)
-        state = self._handler.handle_response_to_healthcheck_request()
+        state = self._handler.handle_response_to_healthcheck_request(response)
         return state
@@ -0,0 +1,279 @@
+# coding: utf-8
+import enum
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from ui.console import terminal
+from core.modules.timeline import Steps
+from core.network.timeout import Timeout
+from core.utils.exception_manager import handle_raised_exception
+
+
+# ------------------------------------------------- Pipeline Stages -------------------------------------------------- #
+
+
+class Stages(enum.Enum):
+    CLONE = "clone"
+    UPLOAD = "upload"
+    ATTACH = "attach"
+    RUN = "run"
+    DOWNLOAD = "download"
+
+
+# ------------------------------------------------ Bootstrap Pipeline ------------------------------------------------ #
+
+
+class BootstrapPipeline(object):
+    """
+    Staged pipeline preparing "New" vertices for solving: clone → upload → attach → run.
+    Every stage has its own pool of workers with limited size, so stages of different vertices overlap.
+    Cloning of base simulation and uploading of submodels do not depend on each other and run concurrently,
+    attaching of submodels starts when both of them are done.
+    Results of "Finished" vertices are downloaded in background by separate pool of workers.
+    Bootstrapped vertices and vertices with downloaded results are collected by workflow main loop with `collect()`
+    """
+
+    DEFAULT_WORKERS = 4
+
+    def __init__(self, app_session):
+        cfg = app_session.cfg
+        workers = {Stages.CLONE: cfg.clone_workers,
+                   Stages.UPLOAD: cfg.upload_workers,
+                   Stages.ATTACH: cfg.attach_workers,
+                   Stages.RUN: cfg.run_workers,
+                   Stages.DOWNLOAD: cfg.download_workers}
+        self.__pools = {stage: ThreadPoolExecutor(max_workers=number or BootstrapPipeline.DEFAULT_WORKERS,
+                                                  thread_name_prefix=f"bootstrap-{stage.value}")
+                        for stage, number in workers.items()}
+        self.__lock = threading.Lock()
+        self.__in_flight = {}
+        # vertices processed by pipeline, which have not been returned by `collect()` yet
+        self.__finished = {}
+        self.__stages = {stage: 0 for stage in Stages}
+        self.__completed = queue.Queue()
+
+    @property
+    def in_flight(self):
+        """
+        :return: number of vertices being bootstrapped or downloaded
+        """
+        with self.__lock:
+            return len(self.__in_flight)
+
+    @property
+    def stages(self):
+        """
+        :return: dictionary {stage: number of vertices queued or being processed at stage}
+        """
+        with self.__lock:
+            return dict(self.__stages)
+
+    def contains(self, vertex):
+        """
+        :return: True if vertex is being bootstrapped or downloaded, or its processing has ended,
+                 but vertex has not been collected yet
+        """
+        with self.__lock:
+            return vertex.identifier in self.__in_flight or vertex.identifier in self.__finished
+
+    def submit(self, vertex):
+        """
+        Starts bootstrapping of vertex
+        :param vertex: vertex with status "New"
+        """
+        if not self.__start(vertex):
+            return
+
+        clone = self.__submit(Stages.CLONE, self.__clone, vertex)
+        upload = self.__submit(Stages.UPLOAD, self.__upload, vertex)
+        remaining = [2]
+
+        def join(_):
+            with self.__lock:
+                remaining[0] -= 1
+                if remaining[0] > 0:
+                    return
+            for future in (clone, upload):
+                if future.exception() is not None or future.result() is None:
+                    self.__finish(vertex, Stages.RUN, False, future.exception())
+                    return
+            self.__then(self.__submit(Stages.ATTACH, self.__attach, vertex, upload.result()),
+                        vertex,
+                        Stages.RUN,
+                        lambda _: self.__then(self.__submit(Stages.RUN, self.__run, vertex),
+                                              vertex,
+                                              Stages.RUN,
+                                              lambda _: self.__finish(vertex, Stages.RUN, True)))
+
+        clone.add_done_callback(join)
+        upload.add_done_callback(join)
+
+    def download(self, vertex):
+        """
+        Starts downloading of vertex results
+        :param vertex: vertex with status "Finished"
+        """
+        if not self.__start(vertex):
+            return
+        self.__then(self.__submit(Stages.DOWNLOAD, self.__download, vertex),
+                    vertex,
+                    Stages.DOWNLOAD,
+                    lambda _: self.__finish(vertex, Stages.DOWNLOAD, True))
+
+    def collect(self, timeout=None):
+        """
+        Returns vertices bootstrapped or downloaded since previous call.
+        Vertex is contained in pipeline until it is collected, so that main loop does not submit it again
+        before it handles result of its processing
+        :param timeout: time in seconds to wait for the first vertex; if None, does not wait
+        :return: list of tuples (vertex, last stage, success);
+                 last stage is `Stages.RUN` for bootstrapped vertices and `Stages.DOWNLOAD` for downloaded ones
+        """
+        completed = []
+        try:
+            if timeout is None:
+                completed.append(self.__completed.get_nowait())
+            else:
+                # clock of application waits in real or in virtual time
+                completed.append(Timeout.clock.get(self.__completed, timeout, lambda: self.in_flight > 0))
+            while True:
+                completed.append(self.__completed.get_nowait())
+        except queue.Empty:
+            pass
+        with self.__lock:
+            for vertex, _, _ in completed:
+                self.__finished.pop(vertex.identifier, None)
+        return completed
+
+    def shutdown(self):
+        for pool in self.__pools.values():
+            pool.shutdown(wait=True)
+
+    def __start(self, vertex):
+        """
+        :return: False if vertex is already in pipeline
+        """
+        with self.__lock:
+            if vertex.identifier in self.__in_flight or vertex.identifier in self.__finished:
+                return False
+            self.__in_flight[vertex.identifier] = vertex
+            return True
+
+    def __submit(self, stage, function, *args):
+        """
+        Submits stage method to pool of stage workers
+        :return: future of stage method result
+        """
+        with self.__lock:
+            self.__stages[stage] += 1
+        future = self.__pools[stage].submit(function, *args)
+
+        def done(_):
+            with self.__lock:
+                self.__stages[stage] -= 1
+        future.add_done_callback(done)
+        return future
+
+    def __then(self, future, vertex, last_stage, callback):
+        """
+        Calls callback with future result if stage succeeded, otherwise finishes vertex processing with failure
+        """
+        def done(f):
+            if f.exception() is not None or f.result() is None:
+                self.__finish(vertex, last_stage, False, f.exception())
+            else:
+                callback(f.result())
+        future.add_done_callback(done)
+
+    def __finish(self, vertex, last_stage, success, exception=None):
+        # vertex is queued before it is released, so that idle pipeline has no completed vertices on the way;
+        # it stays contained in pipeline until it is collected
+        with self.__lock:
+            self.__finished[vertex.identifier] = self.__in_flight.pop(vertex.identifier, vertex)
+            self.__completed.put((vertex, last_stage, success))
+        if exception is not None:
+            handle_raised_exception(exception)
+
+    # ------------------------------------------------ Stage Methods ------------------------------------------------- #
+
+    @staticmethod
+    def __clone(vertex):
+        """
+        Clones base simulation and sets description of cloned simulation
+        :return: cloned simulation, or None, if some error occurred
+        """
+        base_simulation = vertex.base_simulation
+        terminal.show_info_message("Vertex {}: trying to clone base simulation {}...",
+                                   vertex.identifier, base_simulation.identifier)
+        with vertex.timeline.step(Steps.CLONE):
+            current_simulation = base_simulation.clone()
+        if not current_simulation:
+            terminal.show_error_message("Vertex {}: simulation has not been cloned.", vertex.identifier)
+            return None
+        terminal.show_info_message("Vertex {}: modify current simulation description...", vertex.identifier)
+        with vertex.timeline.step(Steps.DESCRIPTION):
+            current_simulation.set_description(vertex.description)
+        vertex.current_simulation = current_simulation
+        terminal.show_info_message("Vertex {}: cloned simulation ID: {}",
+                                   vertex.identifier, current_simulation.identifier)
+        return current_simulation
+
+    @staticmethod
+    def __upload(vertex):
+        """
+        Uploads vertex submodels into s|type
+        :return: list of uploaded submodels
+        """
+        terminal.show_info_message("Vertex {}: uploading submodels...", vertex.identifier)
+        with vertex.timeline.step(Steps.UPLOAD):
+            return vertex.stype.upload_submodel(*vertex.submodels)
+
+    @staticmethod
+    def __attach(vertex, submodels):
+        """
+        Replaces submodels of cloned simulation with uploaded ones
+        :return: True
+        """
+        current_simulation = vertex.current_simulation
+        with vertex.timeline.step(Steps.ATTACH):
+            terminal.show_info_message("Vertex {}: erasing current (cloned) simulation submodels...", vertex.identifier)
+            if current_simulation.erase_submodels():
+                terminal.show_info_message("Vertex {}: done", vertex.identifier)
+            else:
+                terminal.show_error_message("Vertex {}: failed", vertex.identifier)
+            _ = current_simulation.add_submodels(*submodels)
+        terminal.show_info_message("Vertex {}: {} submodels added for current simulation",
+                                   vertex.identifier, len(submodels))
+        return True
+
+    @staticmethod
+    def __run(vertex):
+        """
+        Runs current simulation with default parameters obtained from base simulation
+        :return: created task, or None, if some error occurred
+        """
+        terminal.show_info_message("Vertex {}: trying to run current simulation...", vertex.identifier)
+        with vertex.timeline.step(Steps.SUBMIT):
+            current_task = vertex.current_simulation.run(bsi=vertex.base_simulation.identifier)
+        if not current_task:
+            terminal.show_error_message("Vertex {}: task has not been created.", vertex.identifier)
+            return None
+        vertex.current_task = current_task
+        terminal.show_info_message("Vertex {}: created task ID: {}", vertex.identifier, current_task.identifier)
+        vertex.status = current_task.get_status()
+        return current_task
+
+    @staticmethod
+    def __download(vertex):
+        """
+        Downloads results of vertex into local storage
+        :return: list of downloaded files
+        """
+        if len(vertex.results) == 0:
+            terminal.show_info_message("Vertex {}: no results selected for download", vertex.identifier)
+            return []
+        terminal.show_info_message("Vertex {}: downloading results...", vertex.identifier)
+        with vertex.timeline.step(Steps.DOWNLOAD):
+            downloaded = vertex.current_simulation.download_files(*vertex.results)
+        terminal.show_info_message("Vertex {}: successfully downloaded {} files", vertex.identifier, len(downloaded))
+        return downloaded
@@ -0,0 +1,102 @@
+# coding: utf-8
+import collections
+from ui.console import terminal
+
+
+class ProgressReporter(object):
+    """
+    Progress of workflow main loop: every tick shows only transitions of vertices states since the previous tick,
+    grouped by transition, and number of vertices in every state. Main loop reports vertices, which could change
+    their state (processed by main loop, collected from pipeline), with `update()`, only they are checked on tick,
+    so that cost and output of tick do not depend on number of vertices, whose state has not changed.
+    Full state of all vertices is shown only on request: with `dump()` or on every tick in debug output
+    """
+
+    DONE = "Done"
+    FAILED = "Failed"
+    UNKNOWN = "Unknown"
+    MAX_IDENTIFIERS = 20  # maximal number of identifiers of vertices shown for one transition
+
+    def __init__(self, vertices, results):
+        """
+        :param vertices: list of vertices of workflow graph
+        :param results: dictionary {vertex ID: result of main loop}, 1 - vertex is done, -1 - failed
+        """
+        self.__results = results
+        self.__states = {vertex.identifier: self.__state(vertex) for vertex in vertices}
+        self.__counts = collections.Counter(self.__states.values())
+        self.__updated = collections.OrderedDict()
+
+    @property
+    def states(self):
+        """
+        :return: dictionary {vertex ID: state}, as of the last tick
+        """
+        return dict(self.__states)
+
+    def counts(self):
+        """
+        :return: dictionary {state: number of vertices}, as of the last tick
+        """
+        return collections.Counter(+self.__counts)
+
+    def update(self, *vertices):
+        """
+        Reports vertices, whose state could have changed since the previous tick
+        :param vertices: vertices of workflow graph
+        """
+        for vertex in vertices:
+            self.__updated[vertex.identifier] = vertex
+
+    def tick(self):
+        """
+        Updates states of reported vertices and shows their transitions and numbers of vertices by state
+        :return: dictionary {(previous state, current state): list of vertex IDs}
+        """
+        transitions = collections.OrderedDict()
+        for vertex in self.__updated.values():
+            state = self.__state(vertex)
+            previous = self.__states[vertex.identifier]
+            if state != previous:
+                transitions.setdefault((previous, state), []).append(vertex.identifier)
+                self.__states[vertex.identifier] = state
+                self.__counts[previous] -= 1
+                self.__counts[state] += 1
+        self.__updated.clear()
+
+        if transitions:
+            message, values = [], []
+            for (previous, state), identifiers in transitions.items():
+                shown = ", ".join(str(identifier) for identifier in identifiers[:ProgressReporter.MAX_IDENTIFIERS])
+                if len(identifiers) > ProgressReporter.MAX_IDENTIFIERS:
+                    shown += f" ... (+{len(identifiers) - ProgressReporter.MAX_IDENTIFIERS})"
+                message.append(terminal.get_blank() + "{} → {}: {}")
+                values.extend([previous, state, shown])
+            terminal.show_info_message("Vertices changed state:\n" + "\n".join(message), *values)
+        self.show_summary()
+
+        if terminal.Output.FULL:
+            self.dump()
+        return transitions
+
+    def show_summary(self):
+        counts = sorted(self.counts().items())
+        terminal.show_info_message("Vertices by state: " + ", ".join(["{}: {}"] * len(counts)),
+                                   *[item for pair in counts for item in pair])
+
+    def dump(self):
+        """
+        Shows state of every vertex
+        """
+        lines = [terminal.get_blank() + "{} → {}"] * len(self.__states)
+        terminal.show_info_message("State of vertices:\n" + "\n".join(lines),
+                                   *[item for pair in self.__states.items() for item in pair])
+
+    def __state(self, vertex):
+        result = self.__results.get(vertex.identifier)
+        if result == 1:
+            return ProgressReporter.DONE
+        if result == -1:
+            return ProgressReporter.FAILED
+        status = vertex.status
+        return status if isinstance(status, str) else ProgressReporter.UNKNOWN
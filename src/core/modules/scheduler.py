@@ -0,0 +1,92 @@
+# coding: utf-8
+import collections
+
+
+class Scheduler(object):
+    """
+    Event-driven scheduler of workflow graph vertices.
+    Keeps number of unfinished parents (indegree) of every vertex and queue of vertices ready to be processed.
+    Vertex becomes ready when all its parents are done, vertices still waiting for parents are never visited
+    """
+    def __init__(self, graph):
+        self.__vertices = graph.vertices
+        self.__indegree = {key: 0 for key in self.__vertices.keys()}
+        self.__children = {key: [] for key in self.__vertices.keys()}
+
+        # edges are directed from child vertex to its parent
+        for vertex, parent in graph.edges:
+            self.__indegree[vertex.identifier] += 1
+            self.__children[parent.identifier].append(vertex)
+
+        self.__ready = collections.deque(self.__vertices[key] for key, value in self.__indegree.items() if value == 0)
+        self.__active = collections.OrderedDict()
+        self.__done = set()
+        self.__failed = set()
+
+    @property
+    def active(self):
+        """
+        :return: List of vertices which are being processed and wait for their tasks
+        """
+        return list(self.__active.values())
+
+    @property
+    def active_count(self):
+        return len(self.__active)
+
+    @property
+    def ready_count(self):
+        return len(self.__ready)
+
+    @property
+    def done_count(self):
+        return len(self.__done)
+
+    @property
+    def failed(self):
+        return len(self.__failed) > 0
+
+    @property
+    def finished(self):
+        """
+        :return: True if all vertices are done
+        """
+        return len(self.__done) == len(self.__vertices)
+
+    def has_ready(self):
+        return len(self.__ready) > 0
+
+    def next_ready(self):
+        """
+        Takes next ready vertex from queue and marks it active
+        :return: vertex object
+        """
+        vertex = self.__ready.popleft()
+        self.__active[vertex.identifier] = vertex
+        return vertex
+
+    def complete(self, vertex):
+        """
+        Marks vertex as done and releases its children, which have no more unfinished parents
+        :param vertex: done vertex
+        :return: list of released vertices
+        """
+        if vertex.identifier in self.__done:
+            return []
+        self.__active.pop(vertex.identifier, None)
+        self.__done.add(vertex.identifier)
+        released = []
+        for child in self.__children[vertex.identifier]:
+            self.__indegree[child.identifier] -= 1
+            if self.__indegree[child.identifier] == 0:
+                released.append(child)
+        self.__ready.extend(released)
+        return released
+
+    def fail(self, vertex):
+        """
+        Marks vertex as failed. Children of failed vertex will never be released
+        :param vertex: failed vertex
+        """
+        self.__active.pop(vertex.identifier, None)
+        self.__failed.add(vertex.identifier)
@@ -0,0 +1,291 @@
+# coding: utf-8
+import enum
+import html
+import json
+import os
+import threading
+from core.network.timeout import Timeout
+
+
+# -------------------------------------------------- Lifecycle Steps ------------------------------------------------- #
+
+
+class Steps(enum.Enum):
+    READY = "ready"
+    CLONE = "clone"
+    DESCRIPTION = "description"
+    UPLOAD = "upload"
+    ATTACH = "attach"
+    SUBMIT = "submit"
+    QUEUED = "queued"
+    SOLVING = "solving"
+    FINISHED = "finished"
+    DOWNLOAD = "download"
+    VALUES = "values"
+
+
+# steps are grouped into categories of critical path: work of client, waiting in cluster queue and solving
+CATEGORIES = {Steps.QUEUED: "queue", Steps.SOLVING: "solver"}
+
+COLORS = {Steps.READY: "#9e9e9e",
+          Steps.CLONE: "#42a5f5",
+          Steps.DESCRIPTION: "#26c6da",
+          Steps.UPLOAD: "#7e57c2",
+          Steps.ATTACH: "#ab47bc",
+          Steps.SUBMIT: "#5c6bc0",
+          Steps.QUEUED: "#ffca28",
+          Steps.SOLVING: "#66bb6a",
+          Steps.FINISHED: "#2e7d32",
+          Steps.DOWNLOAD: "#ef5350",
+          Steps.VALUES: "#8d6e63"}
+
+
+# ----------------------------------------------------- Timeline ----------------------------------------------------- #
+
+
+class Timeline(object):
+    """
+    Times of lifecycle steps of one vertex, by epoch clock of application (real or virtual time).
+    Step is a span with start and end time; instant steps (e.g. `ready`) have equal start and end
+    """
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__spans = {}
+
+    def begin(self, step):
+        with self.__lock:
+            self.__spans[step] = [Timeout.clock.time(), None]
+
+    def end(self, step):
+        """
+        Ends step, if it has been begun and has not been ended yet
+        """
+        with self.__lock:
+            span = self.__spans.get(step)
+            if span is not None and span[1] is None:
+                span[1] = Timeout.clock.time()
+
+    def mark(self, step):
+        """
+        Records instant step
+        """
+        now = Timeout.clock.time()
+        with self.__lock:
+            self.__spans[step] = [now, now]
+
+    def has(self, step):
+        with self.__lock:
+            return step in self.__spans
+
+    def spans(self):
+        """
+        :return: dictionary {step: (start, end)}, end is None for steps in progress
+        """
+        with self.__lock:
+            return {step: tuple(span) for step, span in self.__spans.items()}
+
+    def duration(self, step):
+        """
+        :return: duration of ended step in seconds, or None
+        """
+        with self.__lock:
+            span = self.__spans.get(step)
+        if span is None or span[1] is None:
+            return None
+        return span[1] - span[0]
+
+    def step(self, step):
+        """
+        :return: context manager recording step around block of code
+        """
+        return _StepContext(self, step)
+
+
+class _NullTimeline(Timeline):
+    """
+    Timeline, which records nothing: shared by all vertices, when timeline is neither exported nor used by metrics
+    exporter, so that vertices do not allocate timelines
+    """
+    def __init__(self):
+        super().__init__()
+        self.__context = _NullStepContext()
+
+    def begin(self, step):
+        pass
+
+    def end(self, step):
+        pass
+
+    def mark(self, step):
+        pass
+
+    def step(self, step):
+        return self.__context
+
+
+class _NullStepContext(object):
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class _StepContext(object):
+    def __init__(self, timeline, step):
+        self.__timeline = timeline
+        self.__step = step
+
+    def __enter__(self):
+        self.__timeline.begin(self.__step)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.__timeline.end(self.__step)
+
+
+NULL_TIMELINE = _NullTimeline()
+
+
+# ------------------------------------------------------ Export ------------------------------------------------------ #
+
+
+def _spans(vertices):
+    """
+    :return: list of tuples (vertex, step, start, end) of all vertices; steps in progress end now
+    """
+    now = Timeout.clock.time()
+    spans = []
+    for vertex in vertices:
+        for step, (start, end) in vertex.timeline.spans().items():
+            spans.append((vertex, step, start, end if end is not None else now))
+    return spans
+
+
+def critical_path(vertices):
+    """
+    Restores critical path of workflow: starts from vertex ended the last, goes to parent ended the last.
+    Key results are collected after the whole workflow, so step `values` does not define the end of vertex
+    :param vertices: list of vertices
+    :return: list of vertices of critical path, from the first to the last one
+    """
+    ends = {}
+    for vertex, step, _, end in _spans(vertices):
+        if step != Steps.VALUES:
+            ends[vertex.identifier] = max(end, ends.get(vertex.identifier, end))
+    if not ends:
+        return []
+    vertex = max((v for v in vertices if v.identifier in ends), key=lambda v: ends[v.identifier])
+    path = [vertex]
+    while True:
+        parents = [parent for parent in vertex.links if parent.identifier in ends]
+        if not parents:
+            break
+        vertex = max(parents, key=lambda v: ends[v.identifier])
+        path.append(vertex)
+    return path[::-1]
+
+
+def breakdown(path):
+    """
+    Splits time of critical path into waiting in cluster queue, solving and client overhead:
+    requests of client and gaps between steps (polling interval, waiting in pipeline queues)
+    :param path: list of vertices of critical path
+    :return: dictionary {category: time in seconds}: `client`, `queue` and `solver`
+    """
+    spans = _spans(path)
+    result = {"client": 0.0, "queue": 0.0, "solver": 0.0}
+    if not spans:
+        return result
+    for _, step, start, end in spans:
+        if step in CATEGORIES:
+            result[CATEGORIES[step]] += end - start
+    total = max(end for _, _, _, end in spans) - min(start for _, _, start, _ in spans)
+    result["client"] = max(0.0, total - result["queue"] - result["solver"])
+    return result
+
+
+def to_chrome_trace(vertices):
+    """
+    :param vertices: list of vertices
+    :return: dictionary in Chrome trace event format (`chrome://tracing`, Perfetto), one thread per vertex
+    """
+    spans = _spans(vertices)
+    origin = min((start for _, _, start, _ in spans), default=0.0)
+    events = []
+    for vertex in vertices:
+        events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": vertex.identifier,
+                       "args": {"name": f"Vertex {vertex.identifier}"}})
+    for vertex, step, start, end in spans:
+        event = {"name": step.value,
+                 "cat": CATEGORIES.get(step, "client"),
+                 "pid": 1,
+                 "tid": vertex.identifier,
+                 "ts": round((start - origin) * 1e6)}
+        if end > start:
+            event.update({"ph": "X", "dur": round((end - start) * 1e6)})
+        else:
+            event.update({"ph": "i", "s": "t"})
+        events.append(event)
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def to_html(vertices, title="Workflow timeline"):
+    """
+    :param vertices: list of vertices
+    :param title: title of page
+    :return: static HTML page with Gantt chart of vertices steps and breakdown of critical path
+    """
+    spans = _spans(vertices)
+    origin = min((start for _, _, start, _ in spans), default=0.0)
+    total = max((end for _, _, _, end in spans), default=origin) - origin or 1.0
+    path = critical_path(vertices)
+    on_path = {vertex.identifier for vertex in path}
+
+    rows = {vertex.identifier: [] for vertex in vertices}
+    for vertex, step, start, end in spans:
+        left = (start - origin) / total * 100
+        width = max((end - start) / total * 100, 0.15)
+        rows[vertex.identifier].append(
+            '<div class="bar" style="left:{:.3f}%;width:{:.3f}%;background:{}" title="{}: {:.3f} s"></div>'.format(
+                left, width, COLORS[step], step.value, end - start))
+
+    lines = ["<!DOCTYPE html>",
+             "<html><head><meta charset=\"utf-8\"><title>{}</title><style>".format(html.escape(title)),
+             "body{font-family:sans-serif;font-size:12px}",
+             ".row{display:flex;align-items:center;height:16px}",
+             ".label{width:120px;flex:none}.path{font-weight:bold}",
+             ".track{position:relative;flex:1;height:12px;background:#f5f5f5}",
+             ".bar{position:absolute;top:0;height:12px}",
+             ".legend span{display:inline-block;margin-right:12px}",
+             ".legend i{display:inline-block;width:10px;height:10px;margin-right:4px}",
+             "</style></head><body>",
+             "<h3>{}</h3>".format(html.escape(title)),
+             "<p>Makespan: {:.3f} s, vertices: {}</p>".format(total, len(vertices))]
+    categories = breakdown(path)
+    lines.append("<p>Critical path ({} vertices, bold): client {:.3f} s, queue {:.3f} s, solver {:.3f} s</p>".format(
+        len(path), categories["client"], categories["queue"], categories["solver"]))
+    lines.append('<div class="legend">' + "".join('<span><i style="background:{}"></i>{}</span>'.format(
+        color, step.value) for step, color in COLORS.items()) + "</div>")
+    for vertex in vertices:
+        lines.append('<div class="row"><div class="label{}">Vertex {}</div><div class="track">{}</div></div>'.format(
+            " path" if vertex.identifier in on_path else "", html.escape(str(vertex.identifier)),
+            "".join(rows[vertex.identifier])))
+    lines.append("</body></html>")
+    return "\n".join(lines) + "\n"
+
+
+def export_timeline(vertices, directory):
+    """
+    Writes `timeline.json` (Chrome trace) and `timeline.html` (Gantt chart) into directory
+    :param vertices: list of vertices
+    :param directory: path to directory, it is created if it does not exist
+    :return: list of paths to written files
+    """
+    os.makedirs(directory, exist_ok=True)
+    trace_path = os.path.join(directory, "timeline.json")
+    with open(trace_path, "w", encoding="utf-8") as file:
+        json.dump(to_chrome_trace(vertices), file)
+    html_path = os.path.join(directory, "timeline.html")
+    with open(html_path, "w", encoding="utf-8") as file:
+        file.write(to_html(vertices))
+    return [trace_path, html_path]
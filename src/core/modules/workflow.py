@@ -4,6 +4,10 @@ import enum
 import core.bench.entities
 from ui.console import terminal
 from core.dao.local_data_manager import JSONDataManager
+from core.modules.pipeline import BootstrapPipeline, Stages
+from core.modules.progress import ProgressReporter
+from core.modules.scheduler import Scheduler
+from core.modules.timeline import NULL_TIMELINE, Steps, Timeline
 from core.network.timeout import Timeout
 from core.utils.decorators import method_info
 
@@ -93,7 +97,10 @@ class Vertex(object):
         self.__values = None
 
         # • S|Type for current loadcase (basically defied in configuration file)
-        self.__stype = core.bench.entities.SubmodelType(self.app_session, self.app_session.cfg.server_storage)
+        self.__stype = core.bench.entities.SubmodelType.get(self.app_session, self.app_session.cfg.server_storage)
+
+        # • Times of lifecycle steps (by clock of application), recorded only if they are used
+        self.__timeline = Timeline() if app_session.records_timeline else NULL_TIMELINE
 
         # ------------------------------------ Fill fields with values from JSON ------------------------------------- #
         if JSONProps.VERTEX_ID.value in data.keys():
@@ -102,7 +109,7 @@ class Vertex(object):
         if JSONProps.LOADCASE_ID.value in data.keys():
             lc_id = data.get(JSONProps.LOADCASE_ID.value)
             if lc_id is not None:
-                self.__loadcase = core.bench.entities.Loadcase(self.app_session, lc_id)
+                self.__loadcase = core.bench.entities.Loadcase.get(self.app_session, lc_id)
 
         if self.__loadcase is not None and JSONProps.LOADCASE_NAME.value in data.keys():
             lc_name = data.get(JSONProps.LOADCASE_NAME.value)
@@ -112,19 +119,20 @@ class Vertex(object):
         if JSONProps.BASE_SIMULATION_ID.value in data.keys():
             base_sim_id = data.get(JSONProps.BASE_SIMULATION_ID.value)
             if base_sim_id is not None:
-                self.__base_simulation = core.bench.entities.Simulation(self.app_session, base_sim_id)
+                self.__base_simulation = core.bench.entities.Simulation.get(self.app_session, base_sim_id)
             else:
                 terminal.show_error_message("Base (Reference) simulation is not defined in JSON file")
 
         if self.__loadcase is not None and self.__base_simulation is not None:
-            if (self.__base_simulation.get_loadcase().identifier != self.__loadcase.identifier or
-                    self.__base_simulation.get_loadcase().name != self.__loadcase.name):
+            base_loadcase = self.__base_simulation.get_loadcase()
+            if (base_loadcase.identifier != self.__loadcase.identifier or
+                    base_loadcase.name != self.__loadcase.name):
                 terminal.show_error_message("Mismatch given loadcase and loadcase restored from base simulation")
 
         if JSONProps.CURR_SIMULATION_ID.value in data.keys():
             curr_sim_id = data.get(JSONProps.CURR_SIMULATION_ID.value)
             if curr_sim_id is not None:
-                self.__current_simulation = core.bench.entities.Simulation(self.app_session, curr_sim_id)
+                self.__current_simulation = core.bench.entities.Simulation.get(self.app_session, curr_sim_id)
 
         if JSONProps.DESCRIPTION.value in data.keys():
             description = data.get(JSONProps.DESCRIPTION.value)
@@ -134,7 +142,7 @@ class Vertex(object):
         if JSONProps.CURR_TASK_ID.value in data.keys():
             curr_task_id = data.get(JSONProps.CURR_TASK_ID.value)
             if curr_task_id is not None:
-                self.__current_task = core.bench.entities.Task(self.app_session, curr_task_id)
+                self.__current_task = core.bench.entities.Task.get(self.app_session, curr_task_id)
                 if self.__current_task not in self.__current_simulation.get_tasks():
                     terminal.show_error_message("Defined task does not belong to defined simulation")
 
@@ -262,6 +270,32 @@ class Vertex(object):
         """
         if status == self.__current_task.get_status():
             self.__vertex_status = status
+            self.__track_status(status)
+
+    def __track_status(self, status):
+        """
+        Records steps of task lifecycle on the backend side: task is queued since it has been observed with any status
+        except "New", until it is solved or ended
+        """
+        if status == "New":
+            return
+        if not self.__timeline.has(Steps.QUEUED):
+            self.__timeline.begin(Steps.QUEUED)
+        if status == "Solving":
+            self.__timeline.end(Steps.QUEUED)
+            if not self.__timeline.has(Steps.SOLVING):
+                self.__timeline.begin(Steps.SOLVING)
+        elif status in ("Finished", "Failed") and not self.__timeline.has(Steps.FINISHED):
+            self.__timeline.end(Steps.QUEUED)
+            self.__timeline.end(Steps.SOLVING)
+            self.__timeline.mark(Steps.FINISHED)
+
+    @property
+    def timeline(self):
+        """
+        :return: Timeline object with times of vertex lifecycle steps
+        """
+        return self.__timeline
 
     @property
     def solver(self):
@@ -456,23 +490,17 @@ class WorkFlow(object):
                 for data in self.__json_data.values():
                     self.__graph.add_vertex(data)
 
-                s = ""
-                vals = []
-                for v in self.graph.vertices.values():
-                    s += terminal.get_blank() + "{}\n"
-                    vals.append(v)
-                terminal.show_info_message("Workflow graph vertices:\n" + s, *vals)
-                # terminal.show_info_objects("Workflow graph vertices: ", list(self.graph.vertices.values()))
+                terminal.show_info_message("Workflow graph vertices: {}", len(self.graph.vertices))
+                if terminal.Output.FULL:
+                    terminal.show_debug_message("Workflow graph vertices:\n" + "\n".join(
+                        [terminal.get_blank() + "{}"] * len(self.graph.vertices)), *self.graph.vertices.values())
 
                 self.__graph.build_graph_edges()
 
-                s = ""
-                vals = []
-                for v in self.graph.edges:
-                    s += terminal.get_blank() + "{}\n"
-                    vals.append(v)
-                terminal.show_info_message("Workflow graph edges:\n" + s, *vals)
-                # terminal.show_info_objects("Workflow graph edges: ", list(self.graph.edges))
+                terminal.show_info_message("Workflow graph edges: {}", len(self.graph.edges))
+                if terminal.Output.FULL:
+                    terminal.show_debug_message("Workflow graph edges:\n" + "\n".join(
+                        [terminal.get_blank() + "{}"] * len(self.graph.edges)), *self.graph.edges)
 
             elif self.__json_behaviour == JSONTypes.UPDATE_TARGETS.value:
                 terminal.show_info_message("JSON behaviour: Update targets.")
@@ -539,6 +567,8 @@ class WorkFlow(object):
         if self.json_type != JSONTypes.SOLVE.value:
             raise ValueError("Method `run_all_tasks()` can not be called for JSON of type `{}`".format(self.json_type))
 
+        failed_statuses = ["Failed", "failed", "Error", "error"]
+
         @method_info
         def status_based_behaviour(vertex):
             """
@@ -553,67 +583,25 @@ class WorkFlow(object):
             terminal.show_info_message("Processing vertex with ID: {}", vertex.identifier)
 
             # if status is "New",
-            #   - clone base simulation
-            #   - upload submodels
-            #   - run cloned (current vertex) simulation
-            #   - update vertex status from simulation task status
+            #   - hand vertex over to bootstrap pipeline, which clones base simulation, uploads submodels,
+            #     runs cloned (current vertex) simulation and updates vertex status from simulation task status
             if vertex.status == "New":
                 terminal.show_info_message("Vertex status: {}", vertex.status)
                 terminal.show_info_message("Vertex base simulation ID: {}", vertex.base_simulation.identifier)
-                base_simulation = vertex.base_simulation
-                terminal.show_info_message("Trying to clone base simulation...")
-                current_simulation = base_simulation.clone()
-                terminal.show_info_message("Modify current simulation description...")
-                current_simulation.set_description(vertex.description)
-                terminal.show_info_message("Update vertex current simulation...")
-                vertex.current_simulation = current_simulation
-                if current_simulation:
-                    # if cloned successfully, upload submodels
-                    terminal.show_info_message("Cloned simulation ID: {}", vertex.current_simulation.identifier)
-                    terminal.show_info_message("Uploading submodels for current simulation...")
-                    stype = vertex.stype
-                    uploaded_submodels = stype.upload_submodel(*vertex.submodels)
-                    # uploaded_submodels_ids = [submodel.identifier for submodel in uploaded_submodels]
-                    terminal.show_info_message("Erasing current (cloned) simulation submodels...")
-                    status = current_simulation.erase_submodels()
-                    if status:
-                        terminal.show_info_message("Done")
-                    else:
-                        terminal.show_error_message("Failed")
-                    _ = current_simulation.add_submodels(*uploaded_submodels)
-                    terminal.show_info_message("{} submodels added for current simulations", len(uploaded_submodels))
-                    # start with default parameters
-                    terminal.show_info_message("Trying to run current simulation...")
-                    # obtain default parameters to run tasks from base simulation
-                    current_task = current_simulation.run(bsi=base_simulation.identifier)
-                    vertex.current_task = current_task
-                    if current_task:
-                        # if task created successfully, get status
-                        terminal.show_info_message(f"Created task ID: {vertex.current_task.identifier}")
-                        vertex.status = current_task.get_status()
-                        return 0
-                    terminal.show_error_message("Task has not been created.")
-                    return -1
-                terminal.show_error_message("Simulation has not been cloned.")
-                return -1
+                pipeline.submit(vertex)
+                return 0
 
             # if status is "Finished",
-            #   - download vertex results
-            #   - save status; when all vertices will have the same status, loop can be stopped
+            #   - hand vertex over to pipeline, which downloads vertex results in background;
+            #     vertex is done when its results are downloaded
             elif vertex.status == "Finished":
                 terminal.show_info_message("Vertex status: {}", vertex.status)
-                if len(vertex.results) == 0:
-                    terminal.show_info_message("No results selected for download")
-                else:
-                    terminal.show_info_message("Downloading results...")
-                    current_simulation = vertex.current_simulation
-                    lst = current_simulation.download_files(*vertex.results)
-                    terminal.show_info_message("Successfully downloaded {} files", len(lst))
-                return 1
+                pipeline.download(vertex)
+                return 0
 
             # if status is "Failed",
             #   - terminate main loop
-            elif vertex.status in ["Failed", "failed", "Error", "error"]:
+            elif vertex.status in failed_statuses:
                 terminal.show_warning_message("Vertex status: {}", vertex.status)
                 return -1
 
@@ -629,97 +617,119 @@ class WorkFlow(object):
                     terminal.show_info_message("Current task estimated end waiting time: {}", task_end_waiting)
                     terminal.show_info_message("Current task estimated end solving time: {}", task_end_solving)
                 terminal.show_info_message("Vertex status: {}", vertex.status)
+                # task may have finished since the previous pass: its results are downloaded in the same pass,
+                # not on the next poll of vertex
+                if vertex.status == "Finished" or vertex.status in failed_statuses:
+                    return status_based_behaviour(vertex)
                 return 0
 
+        @method_info
+        def process_vertex(vertex):
+            """
+            Processes vertex and updates scheduler state depending on result
+            :param vertex: vertex in workflow graph
+            :return: result of `status_based_behaviour`
+            """
+            r = status_based_behaviour(vertex)
+            terminal.show_info_message("Current vertex result status: {}", r)
+            rs[vertex.identifier] = r
+            progress.update(vertex)
+            if r == -1:
+                terminal.show_error_message("Failed while processing vertex {}", vertex.identifier)
+                scheduler.fail(vertex)
+            if r == 1:
+                complete_vertex(vertex)
+            return r
+
+        def complete_vertex(vertex):
+            """
+            Marks vertex as done and releases its children
+            :param vertex: vertex in workflow graph
+            """
+            rs[vertex.identifier] = 1
+            progress.update(vertex)
+            terminal.show_info_message("Vertex {} is done", vertex.identifier)
+            released = scheduler.complete(vertex)
+            if released:
+                terminal.show_info_message("Vertices released by vertex {}: {}",
+                                           vertex.identifier, [item.identifier for item in released])
+
         # --- main section --- main section --- main section --- main section --- main section --- main section ---
         stop_main_loop = False
 
-        # list of graph vertices to iterate over it with possibility to modify it
         vertices = list(self.graph.vertices.values())
         assert all(isinstance(v, Vertex) for v in vertices)
 
+        # vertices without unfinished parents are ready to be processed,
+        # other vertices are released by scheduler as soon as their last parent is done
+        scheduler = Scheduler(self.graph)
+
         # initialize dictionary for saving loop results
         rs = {key: 0 for key in [v.identifier for v in vertices]}
 
-        # terminal.show_info_dict("Initial state of results storage", rs)
-
-        s = ""
-        vals = []
-        for k, v in rs.items():
-            s += terminal.get_blank() + "{} → {}\n"
-            vals.append(k)
-            vals.append(v)
+        # only transitions of vertices states are shown on every pass, full state is shown in debug output;
+        # progress is checked only for vertices processed by main loop or collected from pipeline
+        progress = ProgressReporter(vertices, rs)
+        progress.show_summary()
 
-        terminal.show_info_message("Initial state of results storage:\n" + s, *vals)
+        # "New" vertices are bootstrapped and results of "Finished" vertices are downloaded concurrently by pipeline,
+        # main loop collects them when they are done
+        pipeline = BootstrapPipeline(self.app_session)
+        if self.app_session.exporter is not None:
+            self.app_session.exporter.watch(self.graph, scheduler, pipeline)
+        collected = []
+        last_poll_time = None
 
         # main loop - while all tasks are done or some failure occurred
-        while not stop_main_loop:
-
-            # iterate over all workflow graph vertices
-            # remove vertices wish status = "Finished"
-            # modify original list, no list copies, only one pass: traditional solution is to iterate backwards
-            for i in reversed(range(len(vertices))):
-                v = vertices[i]
-
-                # check vertex links
-                # if links list is empty, vertex is at root level and it's simulation can be started
-                if len(v.links) == 0:
-                    terminal.show_info_message("Vertex {} has no linked vertices", v.identifier)
-                    r = status_based_behaviour(v)
-                    terminal.show_info_message("Current vertex result status: {}", r)
-                    rs[v.identifier] = r
-                    # terminal.show_info_message(f"Current state of the list of vertices results status: {str(rs)}")
-                    if r == -1:
-                        terminal.show_error_message("Failed while processing vertex {}", v.identifier)
-                        # stop_main_loop = True
-                        break
-                    if r == 1:
-                        terminal.show_info_message("Vertex {} is done", v.identifier)
-                        del vertices[i]
-
-                # else, if links list is not empty,
-                else:
-                    terminal.show_info_message("Vertex {} has {} linked vertices", v.identifier, len(v.links))
-                    terminal.show_info_message("Checking status of linked vertices...")
-
-                    # check status of all linked vertices
-                    if all(l.status == "Finished" for l in v.links):
-                        # if all parent vertices successfully finished,
-                        # current vertex can run
-                        terminal.show_info_message("All linked vertices successfully finished")
-                        r = status_based_behaviour(v)
-                        terminal.show_info_message("Current vertex result status: {}", r)
-                        rs[v.identifier] = r
-                        # terminal.show_info_message(f"Current state of the list of vertices results status: {str(rs)}")
-                        if r == -1:
-                            terminal.show_error_message("Failed while processing vertex {}", v.identifier)
-                            # stop_main_loop = True
+        try:
+            while not stop_main_loop:
+
+                for v, stage, success in collected:
+                    # status of vertex is changed by pipeline
+                    progress.update(v)
+                    if not success:
+                        terminal.show_error_message("Failed while {} vertex {}",
+                                                    "downloading results of" if stage == Stages.DOWNLOAD
+                                                    else "bootstrapping", v.identifier)
+                        rs[v.identifier] = -1
+                        scheduler.fail(v)
+                    elif stage == Stages.DOWNLOAD:
+                        complete_vertex(v)
+
+                # poll vertices which are already in progress once per walk interval
+                if last_poll_time is None or Timeout.now() - last_poll_time >= WorkFlow.WALK_INTERVAL:
+                    last_poll_time = Timeout.now()
+                    for v in scheduler.active:
+                        if pipeline.contains(v):
+                            continue
+                        if process_vertex(v) == -1:
                             break
-                        if r == 1:
-                            terminal.show_info_message("Vertex {} is done", v.identifier)
-                            del vertices[i]
-                    else:
-                        terminal.show_info_message("Some linked vertices is not finished yet...")
 
-            stop_main_loop = all(item == 1 for item in rs.values()) or any(item == -1 for item in rs.values())
+                # process ready vertices, including children released during this pass
+                while not scheduler.failed and scheduler.has_ready():
+                    v = scheduler.next_ready()
+                    v.timeline.mark(Steps.READY)
+                    terminal.show_info_message("Vertex {} is ready, all linked vertices are done", v.identifier)
+                    process_vertex(v)
 
-            # terminal.show_info_message(f"List of vertices results status: {str(rs)}")
-            # terminal.show_info_dict("Current state of results storage", rs)
+                stop_main_loop = scheduler.finished or scheduler.failed
 
-            s = ""
-            vals = []
-            for k, v in rs.items():
-                s += terminal.get_blank() + "{} → {}\n"
-                vals.append(k)
-                vals.append(v)
+                if not stop_main_loop and not scheduler.active and not scheduler.has_ready():
+                    terminal.show_error_message("Remaining vertices can not be started, "
+                                                "check cyclic links between them")
+                    stop_main_loop = True
 
-            terminal.show_info_message("Initial state of results storage:\n" + s, *vals)
+                progress.tick()
 
-            if not stop_main_loop:
-                terminal.show_info_message(f"Waiting for the next loop ... [{WorkFlow.WALK_INTERVAL} sec]")
-                Timeout.pause(WorkFlow.WALK_INTERVAL)
-            else:
-                terminal.show_info_message("Terminating main loop ...")
+                if not stop_main_loop:
+                    # wait until the next walk, or until some vertex is bootstrapped or downloaded
+                    interval = max(0.0, WorkFlow.WALK_INTERVAL - (Timeout.now() - last_poll_time))
+                    terminal.show_info_message(f"Waiting for the next loop ... [{interval:.1f} sec]")
+                    collected = pipeline.collect(interval)
+                else:
+                    terminal.show_info_message("Terminating main loop ...")
+        finally:
+            pipeline.shutdown()
 
     @method_info
     def _change_targets(self):
@@ -781,7 +791,8 @@ class WorkFlow(object):
                                             f"could not collect key results")
                 continue
 
-            values = v.current_simulation.get_values()
+            with v.timeline.step(Steps.VALUES):
+                values = v.current_simulation.get_values(finished=True)
             current_values = [{"name": val.name,
                                "value": val.value,
                                "dimension": val.dimension,
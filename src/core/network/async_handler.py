@@ -0,0 +1,107 @@
+# coding: utf-8
+from ui.console import terminal
+
+
+class AsyncHandler(object):
+    """
+    Asynchronous counterpart of Handler, all `handle_*` methods are coroutines which take response as parameter.
+    Responses of AsyncSender are completely read, so parsing is delegated to shared stateless Handler
+    """
+    def __init__(self, app_session):
+        self.__handler = app_session.handler
+
+    def __parse(self, response, method_name, **params):
+        return getattr(self.__handler, method_name)(response, **params)
+
+# ----------------------------------------------- Healthcheck requests ----------------------------------------------- #
+
+    async def handle_response_to_healthcheck_request(self, response):
+        return self.__parse(response, "handle_response_to_healthcheck_request")
+
+# ---------------------------------------------- Authorization requests ---------------------------------------------- #
+
+    async def handle_response_to_login_request(self, response):
+        return self.__parse(response, "handle_response_to_login_request")
+
+# --------------------------------------------- Common entities requests --------------------------------------------- #
+
+    async def handle_response_to_entity_base_info_request(self, response):
+        return self.__parse(response, "handle_response_to_entity_base_info_request")
+
+    async def get_full_server_base_response(self, response):
+        return self.__parse(response, "get_full_server_base_response")
+
+# ------------------------------------------------ Loadcase requests ------------------------------------------------- #
+
+    async def handle_response_to_loadcase_simulations_request(self, response):
+        return self.__parse(response, "handle_response_to_loadcase_simulations_request")
+
+    async def handle_response_to_loadcase_targets_request(self, response):
+        return self.__parse(response, "handle_response_to_loadcase_targets_request")
+
+    async def handle_response_to_add_loadcase_target_request(self, response):
+        return self.__parse(response, "handle_response_to_add_loadcase_target_request")
+
+    async def handle_response_to_remove_loadcase_target_request(self, response):
+        return self.__parse(response, "handle_response_to_remove_loadcase_target_request")
+
+# ----------------------------------------------- Simulation requests ------------------------------------------------ #
+
+    async def handle_response_to_update_simulation_request(self, response, **params):
+        return self.__parse(response, "handle_response_to_update_simulation_request", **params)
+
+    async def handle_response_to_clone_simulation_request(self, response):
+        return self.__parse(response, "handle_response_to_clone_simulation_request")
+
+    async def handle_response_to_simulation_tasks_request(self, response):
+        return self.__parse(response, "handle_response_to_simulation_tasks_request")
+
+    async def handle_response_to_simulation_submodels_erase_request(self, response):
+        return self.__parse(response, "handle_response_to_simulation_submodels_erase_request")
+
+    async def handle_response_to_simulation_submodels_request(self, response):
+        return self.__parse(response, "handle_response_to_simulation_submodels_request")
+
+    async def handle_response_to_simulation_files_request(self, response):
+        return self.__parse(response, "handle_response_to_simulation_files_request")
+
+    async def handle_response_to_task_defaults_request(self, response):
+        return self.__parse(response, "handle_response_to_task_defaults_request")
+
+    async def handle_response_to_download_file_request(self, response):
+        """
+        Handles response to download file request, body of which has been streamed into file by consumer
+        :return: True, or None, if response status code is not 200
+        """
+        if response.status_code == 200:
+            return True
+        terminal.show_error_message("There were some errors during downloading file: {}", response.status_code)
+        return None
+
+    async def handle_response_to_run_request(self, response):
+        return self.__parse(response, "handle_response_to_run_request")
+
+    async def handle_response_to_simulation_values_request(self, response):
+        return self.__parse(response, "handle_response_to_simulation_values_request")
+
+    async def handle_response_to_simulation_value_request(self, response, name, overview):
+        return self.__parse(response, "handle_response_to_simulation_value_request", name=name, overview=overview)
+
+# -------------------------------------------------- Task requests --------------------------------------------------- #
+
+    async def handle_response_to_task_status_response(self, response):
+        return self.__parse(response, "handle_response_to_task_status_response")
+
+    async def handle_response_to_task_estimations_response(self, response):
+        return self.__parse(response, "handle_response_to_task_estimations_response")
+
+# ------------------------------------------------ Submodel requests ------------------------------------------------- #
+
+    async def handle_response_to_upload_submodel_request(self, response):
+        return self.__parse(response, "handle_response_to_upload_submodel_request")
+
+    async def handle_response_to_stype_submodels_requests(self, response):
+        return self.__parse(response, "handle_response_to_stype_submodels_requests")
+
+    async def handle_response_to_delete_submodel_from_server_request(self, response):
+        return self.__parse(response, "handle_response_to_delete_submodel_from_server_request")
@@ -0,0 +1,343 @@
+# coding: utf-8
+import asyncio
+import json
+import time
+from ui.console import terminal
+from core.network.metrics import body_size
+from core.network.paginator import AsyncPaginator, get_page_size
+from core.network.sender import Sender
+from core.network.response import BufferedResponse
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncSender(object):
+    """
+    Asynchronous counterpart of Sender, all `send_*` methods are coroutines.
+    Requests are sent with `aiohttp` session, which reuses cookies of authorized `requests` session
+    and shares rate limiter with Sender.
+    Responses are returned completely read as BufferedResponse objects, except of bodies of downloaded files,
+    which are passed to consumer while they are received. Cache of GET responses is shared with Sender
+    """
+
+    MAX_RETRIES = 3  # number of repeats of requests throttled by server
+    CONNECTIONS_LIMIT = 100
+
+    def __init__(self, app_session):
+        if aiohttp is None:
+            raise ImportError("Package `aiohttp` is required for asynchronous requests")
+        self.__app_session = app_session
+        self.__host = self.__app_session.cfg.backend_address
+        self.__limiter = self.__app_session.limiter
+        self.__metrics = self.__app_session.metrics
+        self.__cache = self.__app_session.sender.cache
+        self.__http_session = None
+        self.__loop = None
+
+    async def fan_out(self, send_method, arguments):
+        """
+        Sends independent requests concurrently, not more than `Fan-out workers` at the same time.
+        Identical requests are sent only once
+        :param send_method: request coroutine method of AsyncSender, e.g. `send_simulation_value_request`
+        :param arguments: iterable of tuples of positional arguments of request method
+        :return: dictionary {arguments: response}
+        """
+        semaphore = asyncio.Semaphore(self.__app_session.cfg.fan_out_workers or Sender.FAN_OUT_WORKERS)
+
+        async def send(args):
+            async with semaphore:
+                return await send_method(*args)
+
+        unique = list(dict.fromkeys(arguments))
+        responses = await asyncio.gather(*[send(args) for args in unique])
+        return dict(zip(unique, responses))
+
+    def paginate(self, send_method, parse, *args, page_size=None):
+        """
+        Creates asynchronous lazy iterator over all items of list request
+        :param send_method: list request coroutine method of AsyncSender, e.g. `send_loadcase_simulations_request`
+        :param parse: coroutine function, taking response and returning list of items, or None, if some error occurred
+        :param args: positional arguments of list request method
+        :param page_size: number of items per page; optional; default is defined for each endpoint
+        :return: AsyncPaginator object
+        """
+        endpoint = Sender.LIST_ENDPOINTS[send_method.__name__]
+        page_size = page_size or get_page_size(self.__app_session.cfg, endpoint)
+        return AsyncPaginator(lambda page: send_method(*args, page=page, page_size=page_size),
+                              parse,
+                              page_size)
+
+    async def close(self):
+        """
+        Closes `aiohttp` session. Must be awaited in the same event loop, where requests were sent
+        """
+        if self.__http_session is not None and not self.__http_session.closed:
+            await self.__http_session.close()
+        self.__http_session = None
+
+    def __get_http_session(self):
+        # session is bound to event loop, so it is created in the first running loop and recreated for new ones
+        loop = asyncio.get_running_loop()
+        if self.__http_session is None or self.__http_session.closed or self.__loop is not loop:
+            # backend is usually addressed by IP, so cookie jar must accept cookies for IP addresses
+            cookie_jar = aiohttp.CookieJar(unsafe=True)
+            self.__http_session = aiohttp.ClientSession(
+                cookie_jar=cookie_jar,
+                cookies=self.__app_session.session.cookies.get_dict(),
+                connector=aiohttp.TCPConnector(limit=AsyncSender.CONNECTIONS_LIMIT))
+            self.__loop = loop
+        return self.__http_session
+
+    async def __conditional_get(self, url):
+        """
+        Sends GET request, revalidating cached response if there is one
+        :param url: request URL
+        :return: BufferedResponse object; cached response, if server responded with `304 Not Modified`
+        """
+        response = await self.__request("GET", url, headers=self.__cache.validators(url))
+        if response.status_code == 304:
+            cached = self.__cache.get(url)
+            if cached is not None:
+                return cached
+            # cached response was evicted while request was sent
+            response = await self.__request("GET", url)
+        return self.__cache.store(url, response)
+
+    async def __request(self, method, url, data_factory=None, consumer=None, **kwargs):
+        """
+        Sends request through the shared rate limiter.
+        Requests throttled by server (`429`, or `503` for idempotent methods) are repeated after delay of limiter
+        :param method: HTTP method
+        :param url: request URL
+        :param data_factory: callable building request body for each attempt (`aiohttp.FormData` can be sent once)
+        :param consumer: coroutine function, taking body stream (`aiohttp.StreamReader`) of successful response and
+                         returning number of read bytes; body of such response is not buffered; optional
+        :param kwargs: keyword arguments passed to `aiohttp.ClientSession.request`
+        :return: BufferedResponse object; its content is empty, if body has been passed to consumer
+        """
+        if method != "GET" and not url.endswith("/list"):
+            # resource is modified, its cached responses are not valid anymore
+            self.__cache.invalidate(url)
+        http_session = self.__get_http_session()
+        response = None
+        for _ in range(AsyncSender.MAX_RETRIES + 1):
+            delay = self.__limiter.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if data_factory is not None:
+                kwargs["data"] = data_factory()
+            start = time.monotonic()
+            async with http_session.request(method, url, **kwargs) as raw_response:
+                if consumer is not None and raw_response.status == 200:
+                    content = b""
+                    received = await consumer(raw_response.content)
+                else:
+                    content = await raw_response.read()
+                    received = len(content)
+                response = BufferedResponse(raw_response.status, raw_response.headers, content, str(raw_response.url))
+            latency = time.monotonic() - start
+            sent = len(json.dumps(kwargs["json"])) if "json" in kwargs else body_size(kwargs.get("data"))
+            self.__metrics.record(method, url, response.status_code, latency, sent, received)
+            if not self.__limiter.feedback(response.status_code, latency, response.headers.get("Retry-After"), method):
+                break
+            terminal.show_warning_message("Request throttled by server ({}), retrying...", response.status_code)
+        return response
+
+# ----------------------------------------------- Healthcheck requests ----------------------------------------------- #
+
+    async def send_healthcheck_request(self):
+        url = f"{self.__host}/cml-bench/rest/version"
+        response = await self.__request("GET", url)
+        return response
+
+# ---------------------------------------------- Authorization requests ---------------------------------------------- #
+
+    async def send_login_request(self, username, password, remember_me=False):
+        url = f"{self.__host}/rest/login"
+        response = await self.__request("POST", url, data={"username": username,
+                                                           "password": password,
+                                                           "remember-me": str(remember_me).lower()})
+        return response
+
+# --------------------------------------------- Common entities requests --------------------------------------------- #
+
+    async def send_entity_base_info_request(self, entity_id, entity_type):
+        url = f"{self.__host}/rest/{entity_type}/{entity_id}"
+        terminal.show_get_request(url)
+        response = await self.__conditional_get(url)
+        return response
+
+# ------------------------------------------------ Loadcase requests ------------------------------------------------- #
+
+    async def send_loadcase_simulations_request(self, entity_id, page=1, page_size=None):
+        url = f"{self.__host}/rest/loadcase/{entity_id}/simulation/list"
+        page_size = page_size or get_page_size(self.__app_session.cfg, "loadcase simulations")
+        terminal.show_post_request(url)
+        response = await self.__request("POST", url,
+                                        json={"filters": {},
+                                              "sort": [],
+                                              "pageable": {"size": page_size,
+                                                           "page": page}})
+        return response
+
+    async def send_loadcase_targets_request(self, entity_id, page=1, page_size=None):
+        url = f"{self.__host}/rest/loadcase/{entity_id}/targetValue/list"
+        page_size = page_size or get_page_size(self.__app_session.cfg, "loadcase targets")
+        terminal.show_post_request(url)
+        response = await self.__request("POST", url,
+                                        json={"filters": {},
+                                              "sort": [],
+                                              "pageable": {"size": page_size,
+                                                           "page": page}})
+        return response
+
+    async def send_add_loadcase_target_request(self, entity_id, payload):
+        url = f"{self.__host}/rest/loadcase/{entity_id}/targetValue"
+        terminal.show_post_request(url)
+        response = await self.__request("POST", url,
+                                        json=payload)
+        return response
+
+    async def send_remove_loadcase_target_request(self, entity_id, payload):
+        url = f"{self.__host}/rest/loadcase/{entity_id}/targetValue?ids={payload}"
+        terminal.show_delete_request(url)
+        response = await self.__request("DELETE", url)
+        return response
+
+# ----------------------------------------------- Simulation requests ------------------------------------------------ #
+
+    async def send_modify_simulation_request(self, entity_id, payload):
+        url = f"{self.__host}/rest/simulation/{entity_id}"
+        terminal.show_put_request(url)
+        response = await self.__request("PUT", url, json=payload)
+        return response
+
+    async def send_clone_simulation_request(self, entity_id, add_to_clipboard=False, dmu_id=None):
+        url = f"{self.__host}/rest/simulation/{entity_id}/clone"
+        terminal.show_post_request(url)
+        response = await self.__request("POST", url,
+                                        json={"addToClipboard": add_to_clipboard,
+                                              "dmuID": dmu_id})
+        return response
+
+    async def send_simulation_tasks_request(self, entity_id, page=1, page_size=None):
+        url = f"{self.__host}/rest/simulation/{entity_id}/tasks/list"
+        page_size = page_size or get_page_size(self.__app_session.cfg, "simulation tasks")
+        terminal.show_post_request(url)
+        response = await self.__request("POST", url,
+                                        json={"filters": {},
+                                              "sort": [{"direction": "DESC",
+                                                        "field": "modificationDate"}],
+                                              "pageable": {"size": page_size,
+                                                           "page": page}})
+        return response
+
+    async def send_simulation_submodels_request(self, entity_id):
+        url = f"{self.__host}/rest/simulation/{entity_id}/submodel"
+        terminal.show_get_request(url)
+        response = await self.__conditional_get(url)
+        return response
+
+    async def send_simulation_submodels_update_request(self, entity_id, sumbodels):
+        url = f"{self.__host}/rest/simulation/{entity_id}/submodel"
+        terminal.show_post_request(url)
+        response = await self.__request("POST", url,
+                                        json=[*sumbodels])
+        return response
+
+    async def send_simulation_files_request(self, entity_id, page=1, page_size=None):
+        url = f"{self.__host}/rest/simulation/{entity_id}/file/list"
+        page_size = page_size or get_page_size(self.__app_session.cfg, "simulation files")
+        terminal.show_post_request(url)
+        response = await self.__request("POST", url,
+                                        json={"filters": {"list": [{"name": "path",
+                                                                    "value": "Bench"}]},
+                                              "sort": [],
+                                              "pageable": {"size": page_size,
+                                                           "page": page}})
+        return response
+
+    async def send_task_defaults_request(self, entity_id):
+        url = f"{self.__host}/rest/simulation/{entity_id}/task/"
+        terminal.show_get_request(url)
+        response = await self.__conditional_get(url)
+        return response
+
+    async def send_download_file_request(self, entity_id, file_id, consumer):
+        """
+        Body of file is not buffered, it is passed to consumer while it is received
+        :param consumer: coroutine function, taking body stream and returning number of read bytes
+        """
+        url = f"{self.__host}/rest/simulation/{entity_id}/file/{file_id}/export?_"
+        terminal.show_get_request(url)
+        # file size must be equal to number of transferred bytes, so compression is disabled
+        response = await self.__request("GET", url, consumer=consumer, headers={"Accept-Encoding": "identity"})
+        return response
+
+    async def send_run_request(self, parameters):
+        url = f"{self.__host}/rest/task/"
+        terminal.show_post_request(url)
+        response = await self.__request("POST", url, json=parameters)
+        return response
+
+    async def send_simulation_values_request(self, entity_id, page=1, page_size=None):
+        url = f"{self.__host}/rest/simulation/{entity_id}/keyResult/list"
+        page_size = page_size or get_page_size(self.__app_session.cfg, "simulation values")
+        terminal.show_post_request(url)
+        response = await self.__request("POST", url, json={"filters": {"list": [{"name": "type",
+                                                                                 "value": "value"}]},
+                                                           "sort": [],
+                                                           "pageable": {"size": page_size,
+                                                                        "page": page}})
+        return response
+
+    async def send_simulation_value_request(self, simulation_id, value_id):
+        url = f"{self.__host}/rest/simulation/{simulation_id}/keyResult/{value_id}"
+        terminal.show_get_request(url)
+        response = await self.__conditional_get(url)
+        return response
+
+# -------------------------------------------------- Task requests --------------------------------------------------- #
+
+    async def send_task_info_request(self, entity_id):
+        from core.bench.entities import EntityTypes
+        return await self.send_entity_base_info_request(entity_id, EntityTypes.TASK.value)
+
+# ------------------------------------------------ Submodel requests ------------------------------------------------- #
+
+    async def send_upload_submodel_request(self, file, stype_tree_id, add_to_clipboard="off"):
+        url = f"{self.__host}/rest/submodel"
+        terminal.show_post_request(url)
+        with open(file, mode="rb") as f:
+
+            def form():
+                f.seek(0)
+                data = aiohttp.FormData()
+                data.add_field("pid", str(stype_tree_id))
+                data.add_field("addToClipboard", add_to_clipboard)
+                data.add_field("file", f)
+                return data
+
+            response = await self.__request("POST", url, data_factory=form)
+        return response
+
+    async def send_stype_submodels_request(self, entity_path, page=1, page_size=None):
+        url = f"{self.__host}/rest/submodel/list"
+        page_size = page_size or get_page_size(self.__app_session.cfg, "stype submodels")
+        terminal.show_post_request(url)
+        response = await self.__request("POST", url,
+                                        json={"filters": {"list": [{"name": "path",
+                                                                    "value": entity_path}]},
+                                              "sort": [],
+                                              "pageable": {"size": page_size,
+                                                           "page": page}})
+        return response
+
+    async def send_delete_submodel_from_server_request(self, entity_id):
+        url = f"{self.__host}/rest/submodel/{entity_id}"
+        terminal.show_delete_request(url)
+        response = await self.__request("DELETE", url)
+        return response
@@ -0,0 +1,224 @@
+# coding: utf-8
+import base64
+import collections
+import hashlib
+import http.client
+import io
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+
+# headers which are never written into cassette
+SECRET_HEADERS = {"authorization", "cookie", "set-cookie", "proxy-authorization"}
+
+# headers of recorded response which are not valid for replayed body (body is recorded decoded and completely)
+TRANSFER_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection", "keep-alive"}
+
+
+class _OriginalResponse(object):
+    """
+    Minimal `http.client.HTTPResponse` replacement, `requests` reads cookies from its headers
+    """
+    def __init__(self, headers):
+        self.msg = http.client.HTTPMessage()
+        for key, value in headers.items():
+            self.msg[key] = value
+
+    def isclosed(self):
+        return True
+
+    def close(self):
+        pass
+
+
+def build_response(adapter, request, status_code, headers, body):
+    """
+    Creates `requests.Response` object without network connection
+    :param adapter: transport adapter of request
+    :param request: prepared request
+    :param status_code: response status code
+    :param headers: response headers
+    :param body: binary response body
+    :return: response object
+    """
+    headers = dict(headers)
+    headers["Content-Length"] = str(len(body))
+    raw = HTTPResponse(body=io.BytesIO(body),
+                       headers=headers,
+                       status=status_code,
+                       reason=http.client.responses.get(status_code),
+                       preload_content=False,
+                       decode_content=False,
+                       original_response=_OriginalResponse(headers))
+    return adapter.build_response(request, raw)
+
+
+def request_key(method, url, body):
+    """
+    :return: key identifying request in cassette: method, path with query and digest of JSON body
+    """
+    parts = urlsplit(url)
+    path = parts.path + ("?" + parts.query if parts.query else "")
+    digest = hashlib.sha1(body).hexdigest() if isinstance(body, bytes) and body[:1] in (b"{", b"[") else None
+    return method, path, digest
+
+
+def _request_body(request):
+    """
+    :return: JSON body of request as bytes, or None for other bodies (forms with credentials, streamed files)
+    """
+    content_type = request.headers.get("Content-Type", "")
+    body = request.body
+    if not content_type.startswith("application/json") or body is None:
+        return None
+    return body.encode("utf-8") if isinstance(body, str) else body
+
+
+def _content_length(headers):
+    """
+    :return: value of `Content-Length` header, or None, if it is missing or malformed
+    """
+    try:
+        length = int(headers.get("Content-Length"))
+    except (TypeError, ValueError):
+        return None
+    return length if length >= 0 else None
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Transport adapter writing every request and response into cassette file, one JSON object per line:
+    offset of request from the start of recording, duration, request method, path, JSON body and headers,
+    response status code, headers and body.
+    Credentials are not recorded: authorization headers, cookies and form bodies (login request) are stripped.
+    Bodies of streamed responses larger than `max_body_size` are not recorded, only their size is recorded;
+    such bodies are not read by recorder, unless their size is unknown
+    """
+
+    DEFAULT_MAX_BODY_SIZE = 1024 * 1024  # 1 MB
+
+    def __init__(self, path, max_body_size=None, **kwargs):
+        """
+        :param path: path to cassette file
+        :param max_body_size: maximal size of recorded body of streamed response in bytes; optional
+        :param kwargs: keyword arguments of `HTTPAdapter`
+        """
+        super().__init__(**kwargs)
+        self.__lock = threading.Lock()
+        self.__file = open(path, "w", encoding="utf-8")
+        self.__max_body_size = max_body_size or RecordingAdapter.DEFAULT_MAX_BODY_SIZE
+        self.__start = time.monotonic()
+
+    def send(self, request, stream=False, **kwargs):
+        start = time.monotonic()
+        response = super().send(request, stream=stream, **kwargs)
+        length = _content_length(response.headers)
+        if stream and length is not None and length > self.__max_body_size:
+            body, size = None, length
+        else:
+            # size of streamed body is measured by reading it, if server has not sent valid `Content-Length`
+            body = response.content
+            size = len(body)
+            if stream and size > self.__max_body_size:
+                body = None
+        duration = time.monotonic() - start
+
+        request_body = _request_body(request)
+        interaction = {"offset": round(start - self.__start, 6),
+                       "duration": round(duration, 6),
+                       "request": {"method": request.method,
+                                   "path": request_key(request.method, request.url, None)[1],
+                                   "headers": self.__strip(request.headers),
+                                   "body": request_body.decode("utf-8") if request_body is not None else None},
+                       "response": {"status": response.status_code,
+                                    "headers": self.__strip(response.headers),
+                                    "body": base64.b64encode(body).decode("ascii") if body is not None else None,
+                                    "size": size}}
+        line = json.dumps(interaction, ensure_ascii=False)
+        with self.__lock:
+            if not self.__file.closed:
+                self.__file.write(line + "\n")
+                self.__file.flush()
+        return response
+
+    def close(self):
+        super().close()
+        with self.__lock:
+            self.__file.close()
+
+    @staticmethod
+    def __strip(headers):
+        return {key: value for key, value in headers.items() if key.lower() not in SECRET_HEADERS}
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Transport adapter responding with responses recorded by RecordingAdapter, without network.
+    Request is matched by method, path and JSON body, repeated requests get recorded responses in recorded order,
+    the last one is repeated when they are exhausted (e.g. polling of task status).
+    Responses are delayed by recorded durations divided by `speed`; speed 0 replays as fast as possible.
+    Bodies which were not recorded are replaced with zero bytes of recorded size
+    """
+    def __init__(self, path, speed=1.0, **kwargs):
+        """
+        :param path: path to cassette file
+        :param speed: replay speed relative to recorded one; 0 - no delays
+        :param kwargs: keyword arguments of `HTTPAdapter`
+        """
+        super().__init__(**kwargs)
+        self.__lock = threading.Lock()
+        self.__speed = speed
+        self.__interactions = collections.defaultdict(collections.deque)
+        self.__fallback = collections.defaultdict(collections.deque)
+        self.__last = {}
+        self.__used = set()
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                interaction = json.loads(line)
+                recorded = interaction["request"]
+                body = recorded["body"].encode("utf-8") if recorded["body"] is not None else None
+                key = request_key(recorded["method"], recorded["path"], body)
+                self.__interactions[key].append(interaction)
+                self.__fallback[key[:2]].append(interaction)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        key = request_key(request.method, request.url, _request_body(request))
+        interaction = self.__next(key)
+        if interaction is None:
+            return build_response(self, request, 404, {"Content-Type": "application/json"},
+                                  json.dumps({"message": "Request was not recorded"}).encode("utf-8"))
+        if self.__speed:
+            time.sleep(interaction["duration"] / self.__speed)
+
+        recorded = interaction["response"]
+        if recorded["body"] is not None:
+            body = base64.b64decode(recorded["body"])
+        else:
+            body = bytes(recorded["size"] or 0)
+        headers = {key: value for key, value in recorded["headers"].items() if key.lower() not in TRANSFER_HEADERS}
+        return build_response(self, request, recorded["status"], headers, body)
+
+    def __next(self, key):
+        """
+        :return: next recorded interaction for request, matched by JSON body if possible, or None
+        """
+        with self.__lock:
+            for queues, queue_key in ((self.__interactions, key), (self.__fallback, key[:2])):
+                queue = queues.get(queue_key)
+                # the same interaction is queued by exact and fallback keys, it is replayed once
+                while queue and id(queue[0]) in self.__used:
+                    queue.popleft()
+                if queue:
+                    interaction = queue.popleft()
+                    self.__used.add(id(interaction))
+                    self.__last[queue_key] = interaction
+                    return interaction
+                if queue_key in self.__last:
+                    return self.__last[queue_key]
+        return None
@@ -0,0 +1,348 @@
+# coding: utf-8
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from requests.exceptions import ConnectionError, ChunkedEncodingError, Timeout as RequestTimeout
+from ui.console import terminal
+from core.utils.formatting import format_size
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class Downloader(object):
+    """
+    Downloads simulation files straight to local storage.
+    File is streamed in chunks into temporary `<name>.<simulation ID>.part` file, which is renamed when download is
+    complete. Vertices may download files with the same name concurrently, so downloads into the same local file are
+    serialized and temporary files of different simulations are never mixed.
+    Interrupted downloads are resumed from the last received byte with HTTP `Range` requests, which carry validator
+    of file in `If-Range` header, so that partial file of another revision is never completed.
+    Large files are fetched as several byte ranges in parallel;
+    validator and progress of downloads are kept in `.part.json` file, so they are resumed by the next run too
+    """
+
+    DEFAULT_CHUNK_SIZE = 1024 * 1024  # 1 MB
+    DEFAULT_CONNECTIONS = 4
+    DEFAULT_SEGMENT_THRESHOLD = 64 * 1024 * 1024  # 64 MB
+    MAX_ATTEMPTS = 5
+    STATE_SAVE_INTERVAL = 16  # chunks
+    CONNECTION_ERRORS = (ConnectionError, ChunkedEncodingError, RequestTimeout)
+    ASYNC_CONNECTION_ERRORS = (asyncio.TimeoutError, aiohttp.ClientError) if aiohttp else (asyncio.TimeoutError,)
+
+    def __init__(self, app_session):
+        cfg = app_session.cfg
+        self.__app_session = app_session
+        self.__sender = app_session.sender
+        self.__handler = app_session.handler
+        self.__chunk_size = cfg.download_chunk_size or Downloader.DEFAULT_CHUNK_SIZE
+        self.__connections = cfg.download_connections or Downloader.DEFAULT_CONNECTIONS
+        self.__segment_threshold = cfg.download_segment_threshold or Downloader.DEFAULT_SEGMENT_THRESHOLD
+        self.__lock = threading.Lock()
+        self.__path_locks = {}
+        self.__async_path_locks = weakref.WeakKeyDictionary()  # {event loop: {path: lock}}
+
+    def download(self, simulation_id, file_id, path):
+        """
+        Downloads simulation file
+        :param simulation_id: simulation ID
+        :param file_id: ID of simulation file
+        :param path: path to local file
+        :return: number of downloaded bytes, or None, if download failed
+        """
+        part_path = Downloader.__get_part_path(path, simulation_id)
+        with self.__lock:
+            path_lock = self.__path_locks.setdefault(path, threading.Lock())
+        with path_lock:
+            start = time.monotonic()
+            size = self.__download(simulation_id, file_id, part_path)
+            if size is None:
+                terminal.show_error_message("Failed to download \"{}\"", os.path.basename(path))
+                return None
+            os.replace(part_path, path)
+        elapsed = max(time.monotonic() - start, 1e-6)
+        terminal.show_info_message("Downloaded \"{}\": {} in {} sec ({}/s)",
+                                   os.path.basename(path), format_size(size), round(elapsed, 2),
+                                   format_size(size / elapsed))
+        return size
+
+    async def download_async(self, simulation_id, file_id, path):
+        """
+        Asynchronous version of `download()`: file is streamed in chunks into `.part` file, which is renamed when
+        download is complete. Interrupted download is not resumed and not split into byte ranges
+        :return: number of downloaded bytes, or None, if download failed
+        """
+        part_path = Downloader.__get_part_path(path, simulation_id)
+        path_lock = self.__async_path_locks.setdefault(asyncio.get_running_loop(), {}).setdefault(path, asyncio.Lock())
+        async with path_lock:
+            return await self.__download_async(simulation_id, file_id, path, part_path)
+
+    async def __download_async(self, simulation_id, file_id, path, part_path):
+        start = time.monotonic()
+
+        async def write(stream):
+            size = 0
+            with open(part_path, mode="wb") as f:
+                async for chunk in stream.iter_chunked(self.__chunk_size):
+                    f.write(chunk)
+                    size += len(chunk)
+            return size
+
+        try:
+            response = await self.__app_session.async_sender.send_download_file_request(simulation_id, file_id, write)
+            downloaded = await self.__app_session.async_handler.handle_response_to_download_file_request(response)
+        except Downloader.ASYNC_CONNECTION_ERRORS as e:
+            terminal.show_warning_message("Connection dropped while downloading \"{}\": {}", os.path.basename(path), e)
+            downloaded = None
+        if not downloaded or not os.path.isfile(part_path):
+            terminal.show_error_message("Failed to download \"{}\"", os.path.basename(path))
+            if os.path.isfile(part_path):
+                os.remove(part_path)
+            return None
+        size = os.path.getsize(part_path)
+        os.replace(part_path, path)
+        elapsed = max(time.monotonic() - start, 1e-6)
+        terminal.show_info_message("Downloaded \"{}\": {} in {} sec ({}/s)",
+                                   os.path.basename(path), format_size(size), round(elapsed, 2),
+                                   format_size(size / elapsed))
+        return size
+
+    def __download(self, simulation_id, file_id, part_path):
+        """
+        Streams file into `.part` file, resuming it if it already exists.
+        Partial file is resumed only with validator (`ETag` or `Last-Modified`) of the revision it belongs to,
+        which is sent in `If-Range` header: if file has changed on server, it is downloaded anew
+        :return: file size, or None, if download failed
+        """
+        state = Downloader.__read_state(part_path)
+        validator = state.get("validator") if state else None
+        if state and state.get("segments"):
+            terminal.show_info_message("Resuming parallel download of \"{}\"", os.path.basename(part_path))
+            size = self.__download_segments(simulation_id, file_id, part_path, validator, state["size"],
+                                            state["segments"])
+            if size is not None or os.path.isfile(part_path + ".json"):
+                return size
+            validator = None  # file has changed on server, download is started anew
+
+        for _ in range(Downloader.MAX_ATTEMPTS):
+            if validator is None and os.path.isfile(part_path):
+                # it is unknown, which revision of file partial file belongs to
+                os.remove(part_path)
+            offset = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+            # reconnection fails, when server is unreachable, so request is sent inside of `try` too
+            response = None
+            try:
+                response = self.__sender.send_download_file_request(simulation_id, file_id, start=offset or None,
+                                                                    validator=validator if offset else None)
+                if response.status_code == 416 and offset > 0:
+                    # requested range is beyond the end of file: it is either complete or changed on server
+                    if Downloader.__get_total_size(response) == offset:
+                        Downloader.__remove_state(part_path)
+                        return offset
+                    os.remove(part_path)
+                    continue
+
+                chunks = self.__handler.handle_response_to_download_file_request(response, self.__chunk_size)
+                if chunks is None:
+                    return None
+
+                if response.status_code == 206:
+                    mode = "ab"
+                else:
+                    # server ignored requested range (or file has changed) and sends the whole file
+                    mode = "wb"
+                    offset = 0
+                total_size = Downloader.__get_total_size(response)
+
+                if offset == 0:
+                    validator = Downloader.__get_validator(response)
+                    if validator is not None and self.__is_segmentable(response, total_size):
+                        response.close()
+                        size = self.__download_segments(simulation_id, file_id, part_path, validator, total_size,
+                                                        Downloader.__split(total_size, self.__connections))
+                        if size is not None or os.path.isfile(part_path + ".json"):
+                            return size
+                        validator = None
+                        continue
+                    if validator is None:
+                        Downloader.__remove_state(part_path)
+                    else:
+                        Downloader.__write_state(part_path, {"validator": validator})
+
+                with open(part_path, mode=mode) as f:
+                    for chunk in chunks:
+                        f.write(chunk)
+                size = os.path.getsize(part_path)
+                if total_size is None or size == total_size:
+                    Downloader.__remove_state(part_path)
+                    return size
+                terminal.show_warning_message("Download of \"{}\" was interrupted at {} of {}, resuming...",
+                                              os.path.basename(part_path), format_size(size), format_size(total_size))
+            except Downloader.CONNECTION_ERRORS:
+                terminal.show_warning_message("Connection dropped while downloading \"{}\", resuming...",
+                                              os.path.basename(part_path))
+            finally:
+                if response is not None:
+                    response.close()
+        return None
+
+    def __is_segmentable(self, response, total_size):
+        supports_ranges = response.status_code == 206 or response.headers.get("Accept-Ranges") == "bytes"
+        return (self.__connections > 1 and supports_ranges and
+                total_size is not None and total_size >= self.__segment_threshold)
+
+    def __download_segments(self, simulation_id, file_id, part_path, validator, total_size, segments):
+        """
+        Downloads file as several byte ranges in parallel, each range is written into its place of `.part` file.
+        State is saved before `.part` file is allocated, so zero-filled file is never taken for downloaded bytes
+        :param validator: `ETag` or `Last-Modified` of file
+        :param segments: list of [first byte, last byte, number of downloaded bytes]
+        :return: file size, or None, if download failed;
+        if file has changed on server, both `.part` file and state are removed
+        """
+        state = {"validator": validator, "size": total_size, "segments": segments}
+        lock = threading.Lock()
+        if not os.path.isfile(part_path) or os.path.getsize(part_path) != total_size:
+            for segment in segments:
+                segment[2] = 0
+            Downloader.__write_state(part_path, state)
+            with open(part_path, mode="wb") as f:
+                f.truncate(total_size)
+        changed = threading.Event()
+
+        def download_segment(segment):
+            return self.__download_segment(simulation_id, file_id, part_path, state, segment, lock, changed)
+
+        with ThreadPoolExecutor(max_workers=len(segments), thread_name_prefix="download") as pool:
+            results = list(pool.map(download_segment, segments))
+
+        if changed.is_set():
+            terminal.show_warning_message("File \"{}\" has changed on server, downloading it anew...",
+                                          os.path.basename(part_path))
+            Downloader.__remove_state(part_path)
+            os.remove(part_path)
+            return None
+        if all(results):
+            Downloader.__remove_state(part_path)
+            return total_size
+        with lock:
+            Downloader.__write_state(part_path, state)
+        return None
+
+    def __download_segment(self, simulation_id, file_id, part_path, state, segment, lock, changed):
+        first, last, _ = segment
+        for _ in range(Downloader.MAX_ATTEMPTS):
+            position = first + segment[2]
+            if position > last or changed.is_set():
+                return position > last
+            response = None
+            try:
+                response = self.__sender.send_download_file_request(simulation_id, file_id, start=position, end=last,
+                                                                    validator=state["validator"])
+                if response.status_code == 200:
+                    # `If-Range` validator does not match: the whole file of another revision is sent
+                    changed.set()
+                    return False
+                if response.status_code != 206:
+                    terminal.show_error_message("Server does not support partial download ({})", response.status_code)
+                    return False
+                chunks = self.__handler.handle_response_to_download_file_request(response, self.__chunk_size)
+                with open(part_path, mode="r+b") as f:
+                    f.seek(position)
+                    for number, chunk in enumerate(chunks, start=1):
+                        f.write(chunk)
+                        segment[2] += len(chunk)
+                        if number % Downloader.STATE_SAVE_INTERVAL == 0:
+                            f.flush()
+                            with lock:
+                                Downloader.__write_state(part_path, state)
+            except Downloader.CONNECTION_ERRORS:
+                terminal.show_warning_message("Connection dropped while downloading bytes {}-{} of \"{}\", resuming...",
+                                              position, last, os.path.basename(part_path))
+            finally:
+                if response is not None:
+                    response.close()
+        return first + segment[2] > last
+
+    @staticmethod
+    def __get_part_path(path, simulation_id):
+        return f"{path}.{simulation_id}.part"
+
+    @staticmethod
+    def __split(total_size, connections):
+        segment_size = -(-total_size // connections)
+        return [[first, min(first + segment_size, total_size) - 1, 0]
+                for first in range(0, total_size, segment_size)]
+
+    @staticmethod
+    def __get_total_size(response):
+        """
+        :return: full size of file from `Content-Range` or `Content-Length` headers, or None, if unknown
+        """
+        content_range = response.headers.get("Content-Range")
+        if content_range:
+            match = re.search(r"/(\d+)\s*$", content_range)
+            if match:
+                return int(match.group(1))
+        content_length = response.headers.get("Content-Length")
+        if content_length and content_length.isdigit() and response.status_code == 200:
+            return int(content_length)
+        return None
+
+    @staticmethod
+    def __get_validator(response):
+        """
+        :return: `ETag` or `Last-Modified` header, which can be sent in `If-Range` header, or None;
+        weak `ETag` cannot be used for ranges
+        """
+        etag = response.headers.get("ETag")
+        if etag and not etag.startswith("W/"):
+            return etag
+        return response.headers.get("Last-Modified")
+
+    @staticmethod
+    def __read_state(part_path):
+        """
+        :return: state of interrupted download: validator of file and, for parallel download, its size and segments;
+        or None, if there is no state. If state cannot be read, `.part` file cannot be trusted and is removed
+        """
+        state_path = part_path + ".json"
+        if not os.path.isfile(state_path):
+            return None
+        try:
+            with open(state_path, mode="r") as f:
+                state = json.load(f)
+            segments = state.get("segments")
+            if segments is not None and not (isinstance(state["size"], int) and
+                                             all(len(segment) == 3 for segment in segments)):
+                raise ValueError("Invalid segments")
+            return state
+        except (ValueError, TypeError, KeyError, AttributeError):
+            terminal.show_warning_message("State of download \"{}\" is damaged, downloading file anew...",
+                                          os.path.basename(part_path))
+            Downloader.__remove_state(part_path)
+            if os.path.isfile(part_path):
+                os.remove(part_path)
+            return None
+
+    @staticmethod
+    def __write_state(part_path, state):
+        """
+        State is written into temporary file, which replaces the previous state, so state is never left truncated
+        """
+        state_path = part_path + ".json"
+        with open(state_path + ".tmp", mode="w") as f:
+            json.dump(state, f)
+        os.replace(state_path + ".tmp", state_path)
+
+    @staticmethod
+    def __remove_state(part_path):
+        if os.path.isfile(part_path + ".json"):
+            os.remove(part_path + ".json")
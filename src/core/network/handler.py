@@ -1,23 +1,39 @@
 # coding: utf-8
+from functools import wraps
 from ui.console import terminal
+from core.network.response import release
 from core.utils.decorators import method_info
 
 
+def releases_response(func):
+    """
+    Releases response passed to handle method, when it has been parsed, so that body is not kept until the next one
+    """
+    @wraps(func)
+    def wrapper(self, response, *args, **kwargs):
+        try:
+            return func(self, response, *args, **kwargs)
+        finally:
+            release(response)
+
+    return wrapper
+
+
 class Handler(object):
-    def __init__(self, app_session, response=None):
-        self.__response = response
+    """
+    Parses responses of CML-Bench REST API.
+    Handler has no state depending on response: every `handle_*` method takes response as the first parameter,
+    so one Handler object is shared by all threads and tasks
+    """
+    def __init__(self, app_session):
         self.__app_session = app_session
-        self.__http_session = self.__app_session.session
-
-    @method_info
-    def set_response(self, response):
-        self.__response = response
 
 # ----------------------------------------------- Healthcheck requests ----------------------------------------------- #
 
     @method_info
-    def handle_response_to_healthcheck_request(self):
-        response_json = self.__response.json()
+    @releases_response
+    def handle_response_to_healthcheck_request(self, response):
+        response_json = response.json()
         if response_json is not None and isinstance(response_json, dict):
             version = response_json.get("message")
             status = response_json.get("status")
@@ -28,12 +44,13 @@ class Handler(object):
 # ---------------------------------------------- Authorization requests ---------------------------------------------- #
 
     @method_info
-    def handle_response_to_login_request(self):
+    @releases_response
+    def handle_response_to_login_request(self, response):
         """
         Handles response to login request
         :return: True if connection has been established, False otherwise
         """
-        response_json = self.__response.json()
+        response_json = response.json()
         if response_json and isinstance(response_json, dict):
             user = response_json.get("login")
             if user:
@@ -45,12 +62,13 @@ class Handler(object):
 # --------------------------------------------- Common entities requests --------------------------------------------- #
 
     @method_info
-    def handle_response_to_entity_base_info_request(self):
+    @releases_response
+    def handle_response_to_entity_base_info_request(self, response):
         """
         Handles response to basic information about CML-Bench entity: name, parent ID, path in tree, tree ID
         :return: dictionary with keys `name`, `parent_id`, `tree_path`, `tree_id`, `description`
         """
-        response_json = self.__response.json()
+        response_json = response.json()
         info = {"name": None,
                 "parent_id": None,
                 "tree_path": None,
@@ -99,19 +117,21 @@ class Handler(object):
         return info
 
     @method_info
-    def get_full_server_base_response(self):
-        response_json = self.__response.json()
+    @releases_response
+    def get_full_server_base_response(self, response):
+        response_json = response.json()
         return response_json
 
 # ------------------------------------------------ Loadcase requests ------------------------------------------------- #
 
     @method_info
-    def handle_response_to_loadcase_simulations_request(self):
+    @releases_response
+    def handle_response_to_loadcase_simulations_request(self, response):
         """
         Handles response to loadcase simulations request
-        :return: list containing IDs of loadcase simulations, or None, if some error occurred
+        :return: list of dictionaries with keys `id` and `name` of loadcase simulations, or None, if some error occurred
         """
-        response_json = self.__response.json()
+        response_json = response.json()
         if response_json and isinstance(response_json, dict):
             list_of_simulations = []
             content = response_json.get("content")
@@ -120,7 +140,8 @@ class Handler(object):
                     if item and isinstance(item, dict):
                         simulation_id = item.get("id")
                         if simulation_id:
-                            list_of_simulations.append(simulation_id)
+                            list_of_simulations.append({"id": simulation_id,
+                                                        "name": item.get("name")})
                 return list_of_simulations
             terminal.show_warning_message("No simulations read from loadcase!")
             return []
@@ -128,7 +149,8 @@ class Handler(object):
         return None
 
     @method_info
-    def handle_response_to_loadcase_targets_request(self):
+    @releases_response
+    def handle_response_to_loadcase_targets_request(self, response):
         """
         Handles response to loadcase targets request
         :return: list of dictionaries with keys:
@@ -139,7 +161,7 @@ class Handler(object):
                  - `dimension`
                  containing information of loadcase targets, or None, if some error occurred
         """
-        response_json = self.__response.json()
+        response_json = response.json()
         if response_json and isinstance(response_json, dict):
             targets_data = []
             content = response_json.get("content")
@@ -164,7 +186,8 @@ class Handler(object):
         return None
 
     @method_info
-    def handle_response_to_add_loadcase_target_request(self):
+    @releases_response
+    def handle_response_to_add_loadcase_target_request(self, response):
         """
         Handles response to add new loadcase target request
         :return: dictionary with keys:
@@ -175,7 +198,7 @@ class Handler(object):
                  - `dimension`
                  containing information of created target, or None, if some error occurred
         """
-        response_json = self.__response.json()
+        response_json = response.json()
         if response_json and isinstance(response_json, dict):
             target_id = response_json.get("id")
             target_name = response_json.get("name")
@@ -192,12 +215,13 @@ class Handler(object):
         return None
 
     @method_info
-    def handle_response_to_remove_loadcase_target_request(self):
+    @releases_response
+    def handle_response_to_remove_loadcase_target_request(self, response):
         """
         Handles response to delete target from loadcase
         :return: `id` of deleted target or None, if some error occurred
         """
-        response_json = self.__response.json()
+        response_json = response.json()
         if response_json and isinstance(response_json, list):
             target_id = response_json[0].get("id")
             if target_id:
@@ -207,13 +231,14 @@ class Handler(object):
 # ----------------------------------------------- Simulation requests ------------------------------------------------ #
 
     @method_info
-    def handle_response_to_update_simulation_request(self, **params):
+    @releases_response
+    def handle_response_to_update_simulation_request(self, response, **params):
         """
         Handles response to update simulation
         :param params: parameters which were updated
         :return: True if updated successfully, otherwise False
         """
-        response_json = self.__response.json()
+        response_json = response.json()
         if response_json and isinstance(response_json, dict):
             for key in params.keys():
                 if key not in response_json.keys():
@@ -223,12 +248,13 @@ class Handler(object):
         return True
 
     @method_info
-    def handle_response_to_clone_simulation_request(self):
+    @releases_response
+    def handle_response_to_clone_simulation_request(self, response):
         """
         Handles response to clone simulation request
         :return: ID of cloned simulation, or None, if some error occurred
         """
-        response_json = self.__response.json()
+        response_json = response.json()
         if response_json and isinstance(response_json, dict):
             simulation_id = response_json.get("id")
             if simulation_id:
@@ -237,12 +263,13 @@ class Handler(object):
         return None
 
     @method_info
-    def handle_response_to_simulation_tasks_request(self):
+    @releases_response
+    def handle_response_to_simulation_tasks_request(self, response):
         """
         Handles response to simulation tasks request
-        :return: list containing IDs of simulation tasks, or None, if some error occurred
+        :return: list of dictionaries with keys `id` and `name` of simulation tasks, or None, if some error occurred
         """
-        response_json = self.__response.json()
+        response_json = response.json()
         if response_json and isinstance(response_json, dict):
             list_of_tasks = []
             content = response_json.get("content")
@@ -251,7 +278,8 @@ class Handler(object):
                     if item and isinstance(item, dict):
                         task_id = item.get("id")
                         if task_id:
-                            list_of_tasks.append(task_id)
+                            list_of_tasks.append({"id": task_id,
+                                                  "name": item.get("name")})
                 return list_of_tasks
             terminal.show_warning_message("No tasks read from simulation!")
             return []
@@ -259,33 +287,36 @@ class Handler(object):
         return None
 
     @method_info
-    def handle_response_to_simulation_submodels_erase_request(self):
+    @releases_response
+    def handle_response_to_simulation_submodels_erase_request(self, response):
         """
         Handles response to simulation submodels erase request
         Server returns empty response
         :return: true if response status code is 200, otherwise false
         """
-        if self.__response.status_code == 200:
+        if response.status_code == 200:
             return True
         return False
 
     @method_info
-    def handle_response_to_simulation_submodels_request(self):
+    @releases_response
+    def handle_response_to_simulation_submodels_request(self, response):
         """
         Handles response to simulation submodels request
-        :return: list containing IDs of simulation submodels, or None, if some error occurred
+        :return: list of dictionaries with keys `id` and `name` of simulation submodels, or None, if some error occurred
         """
-        response_json = self.__response.json()
+        response_json = response.json()
         list_of_submodels = []
         if response_json and isinstance(response_json, list):
             for item in response_json:
                 if item and isinstance(item, dict):
                     item_id = item.get("id")
                     if item_id:
-                        list_of_submodels.append(item_id)
+                        list_of_submodels.append({"id": item_id,
+                                                  "name": item.get("name")})
             return list_of_submodels
         # for the case of empty response
-        response_status = self.__response.status_code
+        response_status = response.status_code
         if response_status == 200:
             terminal.show_warning_message("Simulation has no submodels!")
             return list_of_submodels
@@ -293,13 +324,14 @@ class Handler(object):
         return None
 
     @method_info
-    def handle_response_to_simulation_files_request(self):
+    @releases_response
+    def handle_response_to_simulation_files_request(self, response):
         """
         Handles response to simulation files request
         :return: list of dictionaries with keys `id`, `name`, representing simulation files,
                  or None, if some error occurred
         """
-        response_json = self.__response.json()
+        response_json = response.json()
         if response_json and isinstance(response_json, dict):
             list_of_files = []
             content = response_json.get("content")
@@ -315,12 +347,12 @@ class Handler(object):
         return None
 
     @method_info
-    def handle_response_to_task_defaults_request(self):
+    @releases_response
+    def handle_response_to_task_defaults_request(self, response):
         """
         Handles response to default task parameters request
         :return: dictionary with request json parameters to run new task, or None, if some error occurred
         """
-        response = self.__response
         response_json_list = response.json()
         if isinstance(response_json_list, list) and response_json_list:
             defaults_json = response_json_list[0]
@@ -333,23 +365,26 @@ class Handler(object):
         return None
 
     @method_info
-    def handle_response_to_download_file_request(self):
+    def handle_response_to_download_file_request(self, response, chunk_size):
         """
         Handles response to download file requeest
-        :return: response content (binary data) or None, response status code is not 200
+        :param chunk_size: size of chunks in bytes
+        :return: iterator over chunks of response content (binary data),
+                 or None, if response status code is not 200 (whole file) or 206 (part of file)
         """
-        response = self.__response
-        if response.status_code == 200:
-            return response.content
+        if response.status_code in (200, 206):
+            return response.iter_content(chunk_size=chunk_size)
+        terminal.show_error_message("There were some errors during downloading file: {}", response.status_code)
         return None
 
     @method_info
-    def handle_response_to_run_request(self):
+    @releases_response
+    def handle_response_to_run_request(self, response):
         """
         Handles response to run request
         :return: task ID if new task was created, or None otherwise
         """
-        response_json = self.__response.json()
+        response_json = response.json()
         if response_json and isinstance(response_json, dict) and ("id" in response_json):
             task_identifier = response_json.get("id")
             return task_identifier
@@ -361,58 +396,66 @@ class Handler(object):
         return None
 
     @method_info
-    def handle_response_to_simulation_values_request(self):
+    @releases_response
+    def handle_response_to_simulation_values_request(self, response):
         """
-        Handles response to simulation key results
-        :return: list of dictionaries with keys `id`, `name`, `value`, `dimension`, `description`, `parent` representing
-                 simulation key results, or None, if some error occurred
+        Handles response to simulation key results list.
+        List does not contain values of key results, they are read with `handle_response_to_simulation_value_request`
+        :return: list of dictionaries with keys `id`, `name`, `value` (None), `dimension` (None), `description`,
+                 `parent`, `type`, `overview` representing simulation key results, or None, if some error occurred
         """
-
-        def remove_prefix(string, prefix):
-            if string.startswith(prefix):
-                return string[len(prefix):]
-            return string
-
-        response_json = self.__response.json()
+        response_json = response.json()
         if response_json and isinstance(response_json, dict):
             list_of_values = []
             content = response_json.get("content")
             if content:
                 for item in content:
                     if item and isinstance(item, dict):
-                        kr_id = item.get("id")
-                        kr_name = item.get("name")
-                        kr_dimension = None
-                        kr_value = None
-                        kr_description = item.get("description")
-                        kr_repr = item.get("overview").get("content")
-                        kr_parent = item.get("simulationId")
-                        kr_type = item.get("type")
-                        if kr_id and kr_type == "value":
-                            details_response = self.__app_session.sender.send_simulation_value_request(kr_parent, kr_id)
-                            if details_response and details_response.status_code == 200:
-                                details_response_json = details_response.json()
-                                kr_value = details_response_json.get(kr_name)
-                                kr_dimension = remove_prefix(str(kr_repr), str(kr_value))
-                        list_of_values.append({"id": kr_id,
-                                               "name": kr_name,
-                                               "value": kr_value,
-                                               "dimension": kr_dimension,
-                                               "description": kr_description,
-                                               "parent": kr_parent})
+                        list_of_values.append({"id": item.get("id"),
+                                               "name": item.get("name"),
+                                               "value": None,
+                                               "dimension": None,
+                                               "description": item.get("description"),
+                                               "parent": item.get("simulationId"),
+                                               "type": item.get("type"),
+                                               "overview": (item.get("overview") or {}).get("content")})
                 return list_of_values
         terminal.show_error_message("There were some errors during reading simulation key results")
         return None
 
+    @method_info
+    @releases_response
+    def handle_response_to_simulation_value_request(self, response, name, overview):
+        """
+        Handles response to simulation key result details request
+        :param name: key result name
+        :param overview: string representation of key result from key results list
+        :return: dictionary with keys `value` and `dimension`, or None, if some error occurred
+        """
+
+        def remove_prefix(string, prefix):
+            if string.startswith(prefix):
+                return string[len(prefix):]
+            return string
+
+        if response is not None and response.status_code == 200:
+            response_json = response.json()
+            if response_json and isinstance(response_json, dict):
+                value = response_json.get(name)
+                return {"value": value,
+                        "dimension": remove_prefix(str(overview), str(value))}
+        return None
+
 # -------------------------------------------------- Task requests --------------------------------------------------- #
 
     @method_info
-    def handle_response_to_task_status_response(self):
+    @releases_response
+    def handle_response_to_task_status_response(self, response):
         """
         Handles response to task status request
         :return: current task status, or None, if some error occurred
         """
-        response_json = self.__response.json()
+        response_json = response.json()
         if response_json and isinstance(response_json, dict):
             task_status = response_json.get("status")
             if task_status:
@@ -421,13 +464,14 @@ class Handler(object):
         return None
 
     @method_info
-    def handle_response_to_task_estimations_response(self):
+    @releases_response
+    def handle_response_to_task_estimations_response(self, response):
         """
         Handles response to task estimations
         :return: tuple of end waiting and end solving times, or None, if some error occurred
         """
         from datetime import datetime
-        response_json = self.__response.json()
+        response_json = response.json()
         if response_json and isinstance(response_json, dict):
             task_end_waiting = response_json.get("expectedWaitingEndTime")
             task_end_solving = response_json.get("expectedSolvingEndTime")
@@ -440,12 +484,13 @@ class Handler(object):
 # ------------------------------------------------ Submodel requests ------------------------------------------------- #
 
     @method_info
-    def handle_response_to_upload_submodel_request(self):
+    @releases_response
+    def handle_response_to_upload_submodel_request(self, response):
         """
         Handles response to upload submodel request
         :return: dict with keys `to_insert` and `to_delete`, or None, of some error occurred
         """
-        response_json = self.__response.json()
+        response_json = response.json()
         if response_json and isinstance(response_json, dict):
             result = {"to_insert": [], "to_delete": []}
 
@@ -483,41 +528,52 @@ class Handler(object):
         return None
 
     @method_info
-    def handle_response_to_stype_submodels_requests(self):
+    @releases_response
+    def handle_response_to_stype_submodels_requests(self, response):
         """
         Handles response to s|type submodels request
-        :return: list of submodel IDs, containing in current s|type, or None, if some error occurred
-        """
-        response_json = self.__response.json()
+        :return: list of dictionaries with keys `id`, `name` and `digest` (SHA-256 of submodel content, if server
+                 reports it, otherwise None) of submodels, containing in current s|type, or None, if some error occurred
+        """
+        def get_digest(item):
+            for key in ("sha256", "checksum", "hash"):
+                value = item.get(key)
+                if isinstance(value, str) and len(value) == 64:
+                    return value.lower()
+            return None
+
+        response_json = response.json()
         if response_json and isinstance(response_json, dict):
             list_of_submodels = []
             content = response_json.get("content")
-            if content and isinstance(content, list):
+            # s|type may have no submodels yet
+            if isinstance(content, list):
                 for item in content:
                     if item and isinstance(item, dict):
                         submodel_id = item.get("id")
                         if submodel_id:
-                            list_of_submodels.append(submodel_id)
+                            list_of_submodels.append({"id": submodel_id,
+                                                      "name": item.get("name"),
+                                                      "digest": get_digest(item)})
                 return list_of_submodels
         terminal.show_error_message("There were some errors during reading s|type submodels!")
         return None
 
     @method_info
-    def handle_response_to_delete_submodel_from_server_request(self):
+    @releases_response
+    def handle_response_to_delete_submodel_from_server_request(self, response):
         """
         Handles response to delete submodel from server request
         :return: deleted submodel ID, if successfully deleted, or None otherwise
         """
-        response = self.__response
-
         if response.status_code == 200:
-            response_json = self.__response.json()
+            response_json = response.json()
             deleted_submodel_identifier = response_json.get("id")
             if deleted_submodel_identifier:
                 return deleted_submodel_identifier
 
         if response.status_code == 409:
-            response_json = self.__response.json()
+            response_json = response.json()
             if response_json and isinstance(response_json, dict):
                 message = response_json.get("message")
                 terminal.show_error_message("There were conflicts during deleting submodel from server: \"{}\"",
@@ -525,7 +581,7 @@ class Handler(object):
                 return None
 
         if response.status_code == 403:
-            response_json = self.__response.json()
+            response_json = response.json()
             if response_json and isinstance(response_json, dict):
                 message = response_json.get("message")
                 terminal.show_error_message("There were conflicts during deleting submodel from server: \"{}\"",
@@ -0,0 +1,157 @@
+# coding: utf-8
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import timezone
+from core.network.timeout import Timeout
+
+
+class TokenBucket(object):
+    """
+    Thread-safe token bucket.
+    Tokens are refilled continuously with `rate` tokens per second up to `capacity` tokens
+    """
+    def __init__(self, rate, capacity):
+        self.__lock = threading.Lock()
+        self.__rate = float(rate)
+        self.__capacity = float(capacity)
+        self.__tokens = float(capacity)
+        self.__timestamp = Timeout.now()
+
+    @property
+    def rate(self):
+        return self.__rate
+
+    @rate.setter
+    def rate(self, rate):
+        with self.__lock:
+            self.__refill()
+            self.__rate = float(rate)
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+    def reserve(self, tokens=1.0):
+        """
+        Takes tokens from bucket, going into debt if there are not enough of them
+        :param tokens: number of tokens to take
+        :return: time in seconds caller must wait before using reserved tokens
+        """
+        with self.__lock:
+            self.__refill()
+            self.__tokens -= tokens
+            if self.__tokens >= 0:
+                return 0.0
+            return -self.__tokens / self.__rate
+
+    def acquire(self, tokens=1.0):
+        """
+        Takes tokens from bucket, blocking until they are available
+        :param tokens: number of tokens to take
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            Timeout.pause(delay)
+
+    def __refill(self):
+        now = Timeout.now()
+        self.__tokens = min(self.__capacity, self.__tokens + (now - self.__timestamp) * self.__rate)
+        self.__timestamp = now
+
+
+class RateLimiter(object):
+    """
+    Adaptive requests rate limiter, shared by all requests sent to CML-Bench.
+    Rate is controlled with additive-increase/multiplicative-decrease algorithm:
+    - every successful fast response increases rate by `INCREASE_STEP` requests per second,
+      up to maximal rate from configuration file;
+    - responses with `429` or `503` status codes, or slow responses, decrease rate by `DECREASE_FACTOR`;
+    - `Retry-After` header blocks all further requests for the specified time.
+    Request rejected with `429` was not processed by server, so it may be repeated; request rejected with `503` may
+    have been processed partially, so it is repeated only if its method is idempotent
+    """
+
+    DEFAULT_RATE = 10.0  # requests per second
+    DEFAULT_BURST = 5  # requests
+    MIN_RATE = 0.2  # requests per second
+    INCREASE_STEP = 0.5  # requests per second
+    DECREASE_FACTOR = 0.5
+    LATENCY_THRESHOLD = 2.0  # 2 seconds
+    THROTTLING_CODES = (429, 503)
+    IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT")
+
+    def __init__(self, rate=None, burst=None):
+        self.__max_rate = float(rate) if rate else RateLimiter.DEFAULT_RATE
+        burst = int(burst) if burst else RateLimiter.DEFAULT_BURST
+        self.__bucket = TokenBucket(self.__max_rate, max(1, burst))
+        self.__lock = threading.Lock()
+        self.__blocked_until = 0.0
+
+    @property
+    def rate(self):
+        return self.__bucket.rate
+
+    @property
+    def max_rate(self):
+        return self.__max_rate
+
+    def reserve(self):
+        """
+        Reserves slot for one request
+        :return: time in seconds caller must wait before sending request
+        """
+        with self.__lock:
+            blocked = max(0.0, self.__blocked_until - Timeout.now())
+        return max(blocked, self.__bucket.reserve())
+
+    def acquire(self):
+        """
+        Blocks until one request can be sent
+        """
+        delay = self.reserve()
+        if delay > 0:
+            Timeout.pause(delay)
+
+    def feedback(self, status_code, latency, retry_after=None, method=None):
+        """
+        Adjusts rate based on server response
+        :param status_code: response status code
+        :param latency: response time in seconds
+        :param retry_after: value of `Retry-After` response header, if any
+        :param method: HTTP method of request; if it is unknown, request is not considered idempotent
+        :return: True if request was throttled by server and may be repeated, False otherwise
+        """
+        throttled = status_code in RateLimiter.THROTTLING_CODES
+        with self.__lock:
+            rate = self.__bucket.rate
+            if throttled or latency > RateLimiter.LATENCY_THRESHOLD:
+                rate = max(RateLimiter.MIN_RATE, rate * RateLimiter.DECREASE_FACTOR)
+            else:
+                rate = min(self.__max_rate, rate + RateLimiter.INCREASE_STEP)
+            self.__bucket.rate = rate
+
+            delay = RateLimiter.parse_retry_after(retry_after)
+            if delay is None and throttled:
+                delay = 1.0 / rate
+            if delay:
+                self.__blocked_until = max(self.__blocked_until, Timeout.now() + delay)
+        return status_code == 429 or (throttled and method in RateLimiter.IDEMPOTENT_METHODS)
+
+    @staticmethod
+    def parse_retry_after(value):
+        """
+        :param value: `Retry-After` header value: either number of seconds or HTTP date
+        :return: delay in seconds, or None if value is missing or malformed
+        """
+        if not value:
+            return None
+        value = str(value).strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        return max(0.0, date.timestamp() - Timeout.clock.time())
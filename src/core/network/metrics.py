@@ -0,0 +1,172 @@
+# coding: utf-8
+import bisect
+import re
+import threading
+from urllib.parse import urlsplit
+from core.utils.formatting import format_size
+
+
+class EndpointMetrics(object):
+    """
+    Aggregated metrics of requests to one endpoint
+    """
+
+    # upper bounds of latency histogram buckets in seconds, the last bucket is unbounded
+    LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    __slots__ = ("count", "latency", "buckets", "sent", "received", "statuses")
+
+    def __init__(self):
+        self.count = 0
+        self.latency = 0.0
+        self.buckets = [0] * (len(EndpointMetrics.LATENCY_BUCKETS) + 1)
+        self.sent = 0
+        self.received = 0
+        self.statuses = {}
+
+    @property
+    def errors(self):
+        """
+        :return: number of responses with status code 400+
+        """
+        return sum(count for status, count in self.statuses.items() if status >= 400)
+
+    def quantile(self, q):
+        """
+        Estimates latency quantile from histogram: upper bound of bucket, containing it
+        :param q: quantile, e.g. 0.95
+        :return: latency in seconds, or None, if there were no requests;
+                 infinity, if quantile is in the unbounded bucket
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        total = 0
+        for bound, number in zip(EndpointMetrics.LATENCY_BUCKETS + (float("inf"),), self.buckets):
+            total += number
+            if total >= rank:
+                return bound
+        return float("inf")
+
+    def copy(self):
+        metrics = EndpointMetrics()
+        metrics.count = self.count
+        metrics.latency = self.latency
+        metrics.buckets = list(self.buckets)
+        metrics.sent = self.sent
+        metrics.received = self.received
+        metrics.statuses = dict(self.statuses)
+        return metrics
+
+
+class RequestMetrics(object):
+    """
+    Thread-safe metrics of HTTP requests, labelled by endpoint template: method and path of URL,
+    in which numeric identifiers are replaced with `{id}`, e.g. `GET /rest/simulation/{id}/submodel`.
+    Every attempt of request is recorded, including requests repeated after throttling
+    """
+
+    ID_PATTERN = re.compile(r"/\d+(?=/|$)")
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__endpoints = {}
+
+    @staticmethod
+    def endpoint(method, url):
+        """
+        :return: endpoint template of request
+        """
+        path = urlsplit(url).path.rstrip("/")
+        if path.startswith("/cml-bench"):
+            path = path[len("/cml-bench"):]
+        return "{} {}".format(method, RequestMetrics.ID_PATTERN.sub("/{id}", path))
+
+    def record(self, method, url, status_code, latency, sent, received):
+        """
+        :param method: HTTP method
+        :param url: request URL
+        :param status_code: response status code
+        :param latency: time of response in seconds
+        :param sent: size of request body in bytes
+        :param received: size of response body in bytes
+        """
+        endpoint = RequestMetrics.endpoint(method, url)
+        bucket = bisect.bisect_left(EndpointMetrics.LATENCY_BUCKETS, latency)
+        with self.__lock:
+            metrics = self.__endpoints.get(endpoint)
+            if metrics is None:
+                metrics = self.__endpoints[endpoint] = EndpointMetrics()
+            metrics.count += 1
+            metrics.latency += latency
+            metrics.buckets[bucket] += 1
+            metrics.sent += sent
+            metrics.received += received
+            metrics.statuses[status_code] = metrics.statuses.get(status_code, 0) + 1
+
+    def snapshot(self):
+        """
+        :return: dictionary {endpoint: EndpointMetrics}, copy of current metrics
+        """
+        with self.__lock:
+            return {endpoint: metrics.copy() for endpoint, metrics in self.__endpoints.items()}
+
+    def get(self, endpoint):
+        """
+        :param endpoint: endpoint template, e.g. `GET /rest/task/{id}`
+        :return: copy of EndpointMetrics of endpoint, or None, if there were no requests
+        """
+        with self.__lock:
+            metrics = self.__endpoints.get(endpoint)
+            return metrics.copy() if metrics is not None else None
+
+    @property
+    def total(self):
+        """
+        :return: number of all recorded requests
+        """
+        with self.__lock:
+            return sum(metrics.count for metrics in self.__endpoints.values())
+
+    def reset(self):
+        with self.__lock:
+            self.__endpoints.clear()
+
+    def summary(self):
+        """
+        :return: list of lines of table with metrics of endpoints, sorted by number of requests
+        """
+        lines = ["{:<48}{:>8}{:>10}{:>10}{:>10}{:>10}{:>10}  {}".format("Endpoint", "count", "avg ms", "p50 ms",
+                                                                        "p95 ms", "sent", "received", "statuses")]
+        snapshot = self.snapshot()
+        for endpoint, metrics in sorted(snapshot.items(), key=lambda pair: (-pair[1].count, pair[0])):
+            statuses = ", ".join(f"{status}: {count}" for status, count in sorted(metrics.statuses.items()))
+            lines.append("{:<48}{:>8}{:>10.1f}{:>10}{:>10}{:>10}{:>10}  {}".format(
+                endpoint, metrics.count, metrics.latency / metrics.count * 1000,
+                RequestMetrics.__milliseconds(metrics.quantile(0.5)),
+                RequestMetrics.__milliseconds(metrics.quantile(0.95)),
+                format_size(metrics.sent), format_size(metrics.received), statuses))
+        return lines
+
+    @staticmethod
+    def __milliseconds(bound):
+        return "<{:g}".format(bound * 1000) if bound != float("inf") else ">{:g}".format(
+            EndpointMetrics.LATENCY_BUCKETS[-1] * 1000)
+
+
+def body_size(body):
+    """
+    :param body: body of prepared request: bytes, string, streamed body with length, or None
+    :return: size of body in bytes, 0 if it is unknown
+    """
+    if body is None:
+        return 0
+    if isinstance(body, bytes):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    try:
+        return len(body)
+    except TypeError:
+        return 0
+
@@ -0,0 +1,71 @@
+# coding: utf-8
+import mmap
+import os
+import uuid
+
+
+class MultipartFileStream(object):
+    """
+    Body of `multipart/form-data` request with a single file, streamed from memory-mapped file.
+    Body is never built in memory: form fields and file are sent chunk by chunk while iterating over stream.
+    Stream has known length (sent as `Content-Length`) and can be iterated again, if request is repeated
+    """
+
+    CHUNK_SIZE = 256 * 1024  # 256 KB
+
+    def __init__(self, path, fields, file_field="file", bandwidth=None, progress=None):
+        """
+        :param path: path to file
+        :param fields: dictionary of other form fields
+        :param file_field: name of file form field
+        :param bandwidth: token bucket limiting number of sent bytes per second; optional
+        :param progress: callable, taking number of sent and total file bytes; optional
+        """
+        self.__path = path
+        self.__bandwidth = bandwidth
+        self.__progress = progress
+        self.__boundary = uuid.uuid4().hex
+        self.__file_size = os.path.getsize(path)
+
+        preamble = []
+        for name, value in fields.items():
+            preamble.append(f"--{self.__boundary}\r\n"
+                            f"Content-Disposition: form-data; name=\"{name}\"\r\n\r\n"
+                            f"{value}\r\n")
+        file_name = os.path.basename(path).replace("\"", "%22")
+        preamble.append(f"--{self.__boundary}\r\n"
+                        f"Content-Disposition: form-data; name=\"{file_field}\"; filename=\"{file_name}\"\r\n"
+                        f"Content-Type: application/octet-stream\r\n\r\n")
+        self.__preamble = "".join(preamble).encode("utf-8")
+        self.__epilogue = f"\r\n--{self.__boundary}--\r\n".encode("utf-8")
+
+    @property
+    def content_type(self):
+        return f"multipart/form-data; boundary={self.__boundary}"
+
+    @property
+    def file_size(self):
+        return self.__file_size
+
+    def __len__(self):
+        return len(self.__preamble) + self.__file_size + len(self.__epilogue)
+
+    def __iter__(self):
+        yield self.__preamble
+        if self.__file_size > 0:
+            with open(self.__path, mode="rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        for offset in range(0, self.__file_size, MultipartFileStream.CHUNK_SIZE):
+                            chunk = view[offset:offset + MultipartFileStream.CHUNK_SIZE]
+                            if self.__bandwidth is not None:
+                                self.__bandwidth.acquire(len(chunk))
+                            yield chunk
+                            chunk.release()
+                            if self.__progress is not None:
+                                self.__progress(min(offset + MultipartFileStream.CHUNK_SIZE, self.__file_size),
+                                                self.__file_size)
+                    finally:
+                        view.release()
+        yield self.__epilogue
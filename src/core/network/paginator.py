@@ -0,0 +1,138 @@
+# coding: utf-8
+import asyncio
+from core.network.response import BufferedResponse, release
+
+
+# default page sizes of list endpoints, can be changed with `Page size <endpoint>` keys of configuration file
+PAGE_SIZES = {"loadcase simulations": 100,
+              "loadcase targets": 100,
+              "simulation tasks": 100,
+              "simulation files": 500,
+              "simulation values": 100,
+              "stype submodels": 1000}
+
+
+def get_page_size(cfg, endpoint):
+    """
+    :param cfg: configuration information
+    :param endpoint: name of list endpoint, one of `PAGE_SIZES` keys
+    :return: page size from configuration file, or default page size of endpoint
+    """
+    return cfg.page_size(endpoint) or PAGE_SIZES[endpoint]
+
+
+def is_last_page(response, page, page_size):
+    """
+    :param response: response to list request
+    :param page: number of requested page
+    :param page_size: number of requested items
+    :return: True if there are no more pages after this one
+    """
+    try:
+        response_json = response.json()
+    except ValueError:
+        return True
+    if not isinstance(response_json, dict):
+        return True
+    content = response_json.get("content")
+    if not content or response_json.get("last") is True:
+        return True
+    total_pages = response_json.get("totalPages")
+    if isinstance(total_pages, int):
+        return page >= total_pages
+    return len(content) < page_size
+
+
+class Paginator(object):
+    """
+    Lazy iterator over items of list endpoint.
+    Pages are requested one by one, page N+1 is requested in background while items of page N are parsed and used
+    """
+    def __init__(self, fetch, parse, page_size, executor):
+        """
+        :param fetch: callable, taking page number (starting from 1) and returning response
+        :param parse: callable, taking response and returning list of items, or None, if some error occurred
+        :param page_size: number of items requested per page
+        :param executor: executor for requesting pages in background
+        """
+        self.__fetch = fetch
+        self.__parse = parse
+        self.__page_size = page_size
+        self.__executor = executor
+        self.__failed = False
+
+    @property
+    def failed(self):
+        """
+        :return: True if some page could not be parsed, items of next pages were not read
+        """
+        return self.__failed
+
+    def __iter__(self):
+        page = 1
+        future = self.__executor.submit(self.__fetch_page, page)
+        while future is not None:
+            response = future.result()
+            if is_last_page(response, page, self.__page_size):
+                future = None
+            else:
+                future = self.__executor.submit(self.__fetch_page, page + 1)
+            items = self.__parse(response)
+            del response
+            if items is None:
+                self.__failed = True
+                return
+            yield from items
+            page += 1
+
+    def __fetch_page(self, page):
+        # page body is read and decoded in background too, handler gets already decoded JSON
+        response = self.__fetch(page)
+        buffered = BufferedResponse(response.status_code, response.headers, response.content, response.url)
+        release(response)
+        try:
+            buffered.json()
+        except ValueError:
+            pass
+        return buffered
+
+
+class AsyncPaginator(object):
+    """
+    Asynchronous lazy iterator over items of list endpoint, to be used with `async for`.
+    Page N+1 is requested in background task while items of page N are parsed and used
+    """
+    def __init__(self, fetch, parse, page_size):
+        """
+        :param fetch: coroutine function, taking page number (starting from 1) and returning response
+        :param parse: coroutine function, taking response and returning list of items, or None, if some error occurred
+        :param page_size: number of items requested per page
+        """
+        self.__fetch = fetch
+        self.__parse = parse
+        self.__page_size = page_size
+        self.__failed = False
+
+    @property
+    def failed(self):
+        return self.__failed
+
+    async def __aiter__(self):
+        page = 1
+        task = asyncio.ensure_future(self.__fetch(page))
+        while task is not None:
+            response = await task
+            if is_last_page(response, page, self.__page_size):
+                task = None
+            else:
+                task = asyncio.ensure_future(self.__fetch(page + 1))
+            items = await self.__parse(response)
+            del response
+            if items is None:
+                self.__failed = True
+                if task is not None:
+                    task.cancel()
+                return
+            for item in items:
+                yield item
+            page += 1
@@ -0,0 +1,61 @@
+# coding: utf-8
+import json
+import requests
+
+
+class BufferedResponse(object):
+    """
+    Response with completely read body.
+    Provides the same interface as `requests.Response` used by Handler: `status_code`, `headers`, `content`, `json()`
+    """
+    def __init__(self, status_code, headers, content, url=None):
+        self.__status_code = status_code
+        self.__headers = headers if headers is not None else {}
+        self.__content = content
+        self.__url = url
+        self.__json = None
+        self.__json_decoded = False
+
+    def __repr__(self):
+        return "<BufferedResponse [{}]>".format(self.status_code)
+
+    @property
+    def status_code(self):
+        return self.__status_code
+
+    @property
+    def headers(self):
+        return self.__headers
+
+    @property
+    def content(self):
+        return self.__content
+
+    @property
+    def url(self):
+        return self.__url
+
+    @property
+    def text(self):
+        return self.__content.decode("utf-8", errors="replace") if self.__content else ""
+
+    def json(self):
+        """
+        Decodes response body, body is decoded only once
+        :return: decoded JSON object
+        """
+        if not self.__json_decoded:
+            self.__json = json.loads(self.__content)
+            self.__json_decoded = True
+        return self.__json
+
+
+def release(response):
+    """
+    Returns connection of response to pool and drops its body, when response has been parsed.
+    BufferedResponse objects are kept as is: they may be shared with response cache
+    :param response: response object, or None
+    """
+    if isinstance(response, requests.Response):
+        response.close()
+        response._content = None
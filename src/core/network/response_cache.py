@@ -0,0 +1,79 @@
+# coding: utf-8
+import threading
+from collections import OrderedDict
+from requests.structures import CaseInsensitiveDict
+from core.network.response import BufferedResponse
+
+
+class ResponseCache(object):
+    """
+    Bounded LRU cache of responses to GET requests, which have validators (`ETag` or `Last-Modified` headers).
+    Cached responses are revalidated with conditional requests; `304 Not Modified` response is replaced with cached one,
+    so its body is neither transferred nor decoded again.
+    Cached responses are shared, handlers must not modify decoded JSON objects
+    """
+
+    DEFAULT_CAPACITY = 512  # responses
+    MAX_BODY_SIZE = 1024 * 1024  # 1 MB, larger responses are not cached
+
+    def __init__(self, capacity=None):
+        self.__capacity = capacity or ResponseCache.DEFAULT_CAPACITY
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()
+
+    def validators(self, url):
+        """
+        :return: headers of conditional request for URL; empty, if there is no cached response
+        """
+        with self.__lock:
+            cached = self.__entries.get(url)
+        headers = {}
+        if cached is not None:
+            if cached.headers.get("ETag"):
+                headers["If-None-Match"] = cached.headers.get("ETag")
+            if cached.headers.get("Last-Modified"):
+                headers["If-Modified-Since"] = cached.headers.get("Last-Modified")
+        return headers
+
+    def get(self, url):
+        """
+        :return: cached response, or None, if there is no cached response
+        """
+        with self.__lock:
+            cached = self.__entries.get(url)
+            if cached is not None:
+                self.__entries.move_to_end(url)
+            return cached
+
+    def store(self, url, response):
+        """
+        Caches response, if it has validators
+        :param url: request URL
+        :param response: response object
+        :return: cached BufferedResponse, or original response, if it can not be cached
+        """
+        headers = CaseInsensitiveDict(response.headers)
+        if (response.status_code != 200 or
+                not (headers.get("ETag") or headers.get("Last-Modified")) or
+                "no-store" in headers.get("Cache-Control", "") or
+                len(response.content) > ResponseCache.MAX_BODY_SIZE):
+            return response
+        buffered = BufferedResponse(response.status_code, headers, response.content, url)
+        with self.__lock:
+            self.__entries[url] = buffered
+            self.__entries.move_to_end(url)
+            while len(self.__entries) > self.__capacity:
+                self.__entries.popitem(last=False)
+        return buffered
+
+    def invalidate(self, url):
+        """
+        Removes cached responses of resource and of its parent and nested resources,
+        e.g. `/rest/simulation/1/submodel` invalidates `/rest/simulation/1` and `/rest/simulation/1/submodel/2`
+        """
+        url = url.rstrip("/")
+        with self.__lock:
+            for cached_url in list(self.__entries.keys()):
+                stripped = cached_url.rstrip("/")
+                if stripped == url or stripped.startswith(url + "/") or url.startswith(stripped + "/"):
+                    del self.__entries[cached_url]
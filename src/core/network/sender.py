@@ -1,20 +1,135 @@
 # coding: utf-8
+import time
+from concurrent.futures import ThreadPoolExecutor
 from ui.console import terminal
+from core.network.metrics import body_size
+from core.network.multipart import MultipartFileStream
+from core.network.paginator import Paginator, get_page_size
+from core.network.response_cache import ResponseCache
 from core.utils.decorators import method_info
 
 
 class Sender(object):
+
+    MAX_RETRIES = 3  # number of repeats of requests throttled by server
+    PREFETCH_WORKERS = 4  # number of list pages requested in background at the same time
+    FAN_OUT_WORKERS = 8  # default number of concurrent detail requests, e.g. key results values
+
+    # list requests and names of their endpoints in configuration file
+    LIST_ENDPOINTS = {"send_loadcase_simulations_request": "loadcase simulations",
+                      "send_loadcase_targets_request": "loadcase targets",
+                      "send_simulation_tasks_request": "simulation tasks",
+                      "send_simulation_files_request": "simulation files",
+                      "send_simulation_values_request": "simulation values",
+                      "send_stype_submodels_request": "stype submodels"}
+
     def __init__(self, app_session):
         self.__app_session = app_session
         self.__http_session = self.__app_session.session
         self.__host = self.__app_session.cfg.backend_address
+        self.__limiter = self.__app_session.limiter
+        self.__metrics = self.__app_session.metrics
+        self.__prefetch_executor = ThreadPoolExecutor(max_workers=Sender.PREFETCH_WORKERS,
+                                                      thread_name_prefix="prefetch")
+        self.__cache = ResponseCache(self.__app_session.cfg.response_cache_size)
+        self.__fan_out_executor = ThreadPoolExecutor(max_workers=(self.__app_session.cfg.fan_out_workers or
+                                                                  Sender.FAN_OUT_WORKERS),
+                                                     thread_name_prefix="fan-out")
+
+    @property
+    def cache(self):
+        """
+        :return: ResponseCache of GET responses, shared with AsyncSender
+        """
+        return self.__cache
+
+    def paginate(self, send_method, parse, *args, page_size=None):
+        """
+        Creates lazy iterator over all items of list request
+        :param send_method: list request method of Sender, e.g. `send_loadcase_simulations_request`
+        :param parse: callable, taking response and returning list of items, or None, if some error occurred
+        :param args: positional arguments of list request method
+        :param page_size: number of items per page; optional; default is defined for each endpoint
+        :return: Paginator object
+        """
+        endpoint = Sender.LIST_ENDPOINTS[send_method.__name__]
+        page_size = page_size or get_page_size(self.__app_session.cfg, endpoint)
+        return Paginator(lambda page: send_method(*args, page=page, page_size=page_size),
+                         parse,
+                         page_size,
+                         self.__prefetch_executor)
+
+    def fan_out(self, send_method, arguments):
+        """
+        Sends independent requests concurrently, identical requests are sent only once
+        :param send_method: request method of Sender, e.g. `send_simulation_value_request`
+        :param arguments: iterable of tuples of positional arguments of request method
+        :return: dictionary {arguments: response}
+        """
+        futures = {}
+        for args in arguments:
+            if args not in futures:
+                futures[args] = self.__fan_out_executor.submit(send_method, *args)
+        return {args: future.result() for args, future in futures.items()}
+
+    def __conditional_get(self, url):
+        """
+        Sends GET request, revalidating cached response if there is one
+        :param url: request URL
+        :return: response object; cached response, if server responded with `304 Not Modified`
+        """
+        response = self.__request("GET", url, headers=self.__cache.validators(url))
+        if response.status_code == 304:
+            response.close()
+            cached = self.__cache.get(url)
+            if cached is not None:
+                return cached
+            # cached response was evicted while request was sent
+            response = self.__request("GET", url)
+        return self.__cache.store(url, response)
+
+    def __request(self, method, url, **kwargs):
+        """
+        Sends request through the shared rate limiter.
+        Requests throttled by server (`429`, or `503` for idempotent methods) are repeated after delay of limiter
+        :param method: HTTP method
+        :param url: request URL
+        :param kwargs: keyword arguments passed to `requests.Session.request`
+        :return: response object
+        """
+        if method != "GET" and not url.endswith("/list"):
+            # resource is modified, its cached responses are not valid anymore
+            self.__cache.invalidate(url)
+        response = None
+        for _ in range(Sender.MAX_RETRIES + 1):
+            self.__limiter.acquire()
+            start = time.monotonic()
+            response = self.__http_session.request(method, url, **kwargs)
+            latency = time.monotonic() - start
+            self.__record(method, url, response, latency, kwargs.get("stream", False))
+            if not self.__limiter.feedback(response.status_code, latency, response.headers.get("Retry-After"), method):
+                break
+            response.close()
+            terminal.show_warning_message("Request throttled by server ({}), retrying...", response.status_code)
+        return response
+
+    def __record(self, method, url, response, latency, stream):
+        """
+        Records request into metrics of session; body of streamed response is not read, its size is taken from headers
+        """
+        length = response.headers.get("Content-Length")
+        if length is not None and length.isdigit():
+            received = int(length)
+        else:
+            received = 0 if stream else len(response.content)
+        self.__metrics.record(method, url, response.status_code, latency, body_size(response.request.body), received)
 
 # ----------------------------------------------- Healthcheck requests ----------------------------------------------- #
 
     @method_info
     def send_healthcheck_request(self):
         url = f"{self.__host}/cml-bench/rest/version"
-        response = self.__http_session.get(url)
+        response = self.__request("GET", url)
         return response
 
 # ---------------------------------------------- Authorization requests ---------------------------------------------- #
@@ -22,9 +137,9 @@ class Sender(object):
     @method_info
     def send_login_request(self, username, password, remember_me=False):
         url = f"{self.__host}/rest/login"
-        response = self.__http_session.post(url, data={"username": username,
-                                                       "password": password,
-                                                       "remember-me": str(remember_me).lower})
+        response = self.__request("POST", url, data={"username": username,
+                                                     "password": password,
+                                                     "remember-me": str(remember_me).lower})
         return response
 
 # --------------------------------------------- Common entities requests --------------------------------------------- #
@@ -33,46 +148,48 @@ class Sender(object):
     def send_entity_base_info_request(self, entity_id, entity_type):
         url = f"{self.__host}/rest/{entity_type}/{entity_id}"
         terminal.show_get_request(url)
-        response = self.__http_session.get(url)
+        response = self.__conditional_get(url)
         return response
 
 # ------------------------------------------------ Loadcase requests ------------------------------------------------- #
 
     @method_info
-    def send_loadcase_simulations_request(self, entity_id, max_number=10):
+    def send_loadcase_simulations_request(self, entity_id, page=1, page_size=None):
         url = f"{self.__host}/rest/loadcase/{entity_id}/simulation/list"
+        page_size = page_size or get_page_size(self.__app_session.cfg, "loadcase simulations")
         terminal.show_post_request(url)
-        response = self.__http_session.post(url,
-                                            json={"filters": {},
-                                                  "sort": [],
-                                                  "pageable": {"size": max_number,
-                                                               "page": 1}})
+        response = self.__request("POST", url,
+                                  json={"filters": {},
+                                        "sort": [],
+                                        "pageable": {"size": page_size,
+                                                     "page": page}})
         return response
 
     @method_info
-    def send_loadcase_targets_request(self, entity_id, max_number=10):
+    def send_loadcase_targets_request(self, entity_id, page=1, page_size=None):
         url = f"{self.__host}/rest/loadcase/{entity_id}/targetValue/list"
+        page_size = page_size or get_page_size(self.__app_session.cfg, "loadcase targets")
         terminal.show_post_request(url)
-        response = self.__http_session.post(url,
-                                            json={"filters": {},
-                                                  "sort": [],
-                                                  "pageable": {"size": max_number,
-                                                               "page": 1}})
+        response = self.__request("POST", url,
+                                  json={"filters": {},
+                                        "sort": [],
+                                        "pageable": {"size": page_size,
+                                                     "page": page}})
         return response
 
     @method_info
     def send_add_loadcase_target_request(self, entity_id, payload):
         url = f"{self.__host}/rest/loadcase/{entity_id}/targetValue"
         terminal.show_post_request(url)
-        response = self.__http_session.post(url,
-                                            json=payload)
+        response = self.__request("POST", url,
+                                  json=payload)
         return response
 
     @method_info
     def send_remove_loadcase_target_request(self, entity_id, payload):
         url = f"{self.__host}/rest/loadcase/{entity_id}/targetValue?ids={payload}"
         terminal.show_delete_request(url)
-        response = self.__http_session.delete(url)
+        response = self.__request("DELETE", url)
         return response
 
 # ----------------------------------------------- Simulation requests ------------------------------------------------ #
@@ -81,94 +198,110 @@ class Sender(object):
     def send_modify_simulation_request(self, entity_id, payload):
         url = f"{self.__host}/rest/simulation/{entity_id}"
         terminal.show_put_request(url)
-        response = self.__http_session.put(url, json=payload)
+        response = self.__request("PUT", url, json=payload)
         return response
 
     @method_info
     def send_clone_simulation_request(self, entity_id, add_to_clipboard=False, dmu_id=None):
         url = f"{self.__host}/rest/simulation/{entity_id}/clone"
         terminal.show_post_request(url)
-        response = self.__http_session.post(url,
-                                            json={"addToClipboard": add_to_clipboard,
-                                                  "dmuID": dmu_id})
+        response = self.__request("POST", url,
+                                  json={"addToClipboard": add_to_clipboard,
+                                        "dmuID": dmu_id})
         return response
 
     @method_info
-    def send_simulation_tasks_request(self, entity_id, max_number=10):
+    def send_simulation_tasks_request(self, entity_id, page=1, page_size=None):
         url = f"{self.__host}/rest/simulation/{entity_id}/tasks/list"
+        page_size = page_size or get_page_size(self.__app_session.cfg, "simulation tasks")
         terminal.show_post_request(url)
-        response = self.__http_session.post(url,
-                                            json={"filters": {},
-                                                  "sort": [{"direction": "DESC",
-                                                            "field": "modificationDate"}],
-                                                  "pageable": {"size": max_number,
-                                                               "page": 1}})
+        response = self.__request("POST", url,
+                                  json={"filters": {},
+                                        "sort": [{"direction": "DESC",
+                                                  "field": "modificationDate"}],
+                                        "pageable": {"size": page_size,
+                                                     "page": page}})
         return response
 
     @method_info
     def send_simulation_submodels_request(self, entity_id):
         url = f"{self.__host}/rest/simulation/{entity_id}/submodel"
         terminal.show_get_request(url)
-        response = self.__http_session.get(url)
+        response = self.__conditional_get(url)
         return response
 
     @method_info
     def send_simulation_submodels_update_request(self, entity_id, sumbodels):
         url = f"{self.__host}/rest/simulation/{entity_id}/submodel"
         terminal.show_post_request(url)
-        response = self.__http_session.post(url,
-                                            json=[*sumbodels])
+        response = self.__request("POST", url,
+                                  json=[*sumbodels])
         return response
 
     @method_info
-    def send_simulation_files_request(self, entity_id, max_number=100):
+    def send_simulation_files_request(self, entity_id, page=1, page_size=None):
         url = f"{self.__host}/rest/simulation/{entity_id}/file/list"
+        page_size = page_size or get_page_size(self.__app_session.cfg, "simulation files")
         terminal.show_post_request(url)
-        response = self.__http_session.post(url,
-                                            json={"filters": {"list": [{"name": "path",
-                                                                        "value": "Bench"}]},
-                                                  "sort": [],
-                                                  "pageable": {"size": max_number,
-                                                               "page": 1}})
+        response = self.__request("POST", url,
+                                  json={"filters": {"list": [{"name": "path",
+                                                              "value": "Bench"}]},
+                                        "sort": [],
+                                        "pageable": {"size": page_size,
+                                                     "page": page}})
         return response
 
     @method_info
     def send_task_defaults_request(self, entity_id):
         url = f"{self.__host}/rest/simulation/{entity_id}/task/"
         terminal.show_get_request(url)
-        response = self.__http_session.get(url)
+        response = self.__conditional_get(url)
         return response
 
     @method_info
-    def send_download_file_request(self, entity_id, file_id):
+    def send_download_file_request(self, entity_id, file_id, start=None, end=None, validator=None):
+        """
+        Response body is not read, it must be streamed by caller
+        :param start: first byte of requested range; optional
+        :param end: last byte of requested range; optional
+        :param validator: `ETag` or `Last-Modified` of file, which range belongs to; if file has changed since then,
+        server sends the whole file instead of range; optional
+        """
         url = f"{self.__host}/rest/simulation/{entity_id}/file/{file_id}/export?_"
         terminal.show_get_request(url)
-        response = self.__http_session.get(url)
+        # file size must be equal to number of transferred bytes, so compression is disabled
+        headers = {"Accept-Encoding": "identity"}
+        if start is not None or end is not None:
+            headers["Range"] = "bytes={}-{}".format(start or 0, "" if end is None else end)
+            if validator is not None:
+                headers["If-Range"] = validator
+        response = self.__request("GET", url, headers=headers, stream=True)
         return response
 
     @method_info
     def send_run_request(self, parameters):
         url = f"{self.__host}/rest/task/"
         terminal.show_post_request(url)
-        response = self.__http_session.post(url, json=parameters)
+        response = self.__request("POST", url, json=parameters)
         return response
 
     @method_info
-    def send_simulation_values_request(self, entity_id, max_number=10):
+    def send_simulation_values_request(self, entity_id, page=1, page_size=None):
         url = f"{self.__host}/rest/simulation/{entity_id}/keyResult/list"
+        page_size = page_size or get_page_size(self.__app_session.cfg, "simulation values")
         terminal.show_post_request(url)
-        response = self.__http_session.post(url, json={"filters": {"list": [{"name": "type",
-                                                                             "value": "value"}]},
-                                                       "sort": [],
-                                                       "pageable": {"size": max_number,
-                                                                    "page": 1}})
+        response = self.__request("POST", url, json={"filters": {"list": [{"name": "type",
+                                                                           "value": "value"}]},
+                                                     "sort": [],
+                                                     "pageable": {"size": page_size,
+                                                                  "page": page}})
         return response
 
     @method_info
     def send_simulation_value_request(self, simulation_id, value_id):
         url = f"{self.__host}/rest/simulation/{simulation_id}/keyResult/{value_id}"
         terminal.show_get_request(url)
-        response = self.__http_session.get(url)
+        response = self.__conditional_get(url)
         return response
 
 # -------------------------------------------------- Task requests --------------------------------------------------- #
@@ -181,31 +314,40 @@ class Sender(object):
 # ------------------------------------------------ Submodel requests ------------------------------------------------- #
 
     @method_info
-    def send_upload_submodel_request(self, file, stype_tree_id, add_to_clipboard="off"):
+    def send_upload_submodel_request(self, file, stype_tree_id, add_to_clipboard="off", bandwidth=None, progress=None):
+        """
+        Uploads file, multipart body is streamed from memory-mapped file
+        :param bandwidth: token bucket limiting upload speed in bytes per second; optional
+        :param progress: callable, taking number of sent and total file bytes; optional
+        """
         url = f"{self.__host}/rest/submodel"
         terminal.show_post_request(url)
-        with open(file, mode="rb") as f:
-            response = self.__http_session.post(url,
-                                                data={"pid": stype_tree_id,
-                                                      "addToClipboard": add_to_clipboard},
-                                                files={"file": f})
+        body = MultipartFileStream(file,
+                                   {"pid": stype_tree_id,
+                                    "addToClipboard": add_to_clipboard},
+                                   bandwidth=bandwidth,
+                                   progress=progress)
+        response = self.__request("POST", url,
+                                  data=body,
+                                  headers={"Content-Type": body.content_type})
         return response
 
     @method_info
-    def send_stype_submodels_request(self, entity_path, max_number=1000):
+    def send_stype_submodels_request(self, entity_path, page=1, page_size=None):
         url = f"{self.__host}/rest/submodel/list"
+        page_size = page_size or get_page_size(self.__app_session.cfg, "stype submodels")
         terminal.show_post_request(url)
-        response = self.__http_session.post(url,
-                                            json={"filters": {"list": [{"name": "path",
-                                                                        "value": entity_path}]},
-                                                  "sort": [],
-                                                  "pageable": {"size": max_number,
-                                                               "page": 1}})
+        response = self.__request("POST", url,
+                                  json={"filters": {"list": [{"name": "path",
+                                                              "value": entity_path}]},
+                                        "sort": [],
+                                        "pageable": {"size": page_size,
+                                                     "page": page}})
         return response
 
     @method_info
     def send_delete_submodel_from_server_request(self, entity_id):
         url = f"{self.__host}/rest/submodel/{entity_id}"
         terminal.show_delete_request(url)
-        response = self.__http_session.delete(url)
+        response = self.__request("DELETE", url)
         return response
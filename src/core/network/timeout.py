@@ -1,15 +1,132 @@
 # coding: utf-8
+import queue
+import threading
 import time
 
 
+class SystemClock(object):
+    """
+    Real time: clock of application, unless another one is set with `Timeout.set_clock()`
+    """
+
+    def time(self):
+        """
+        :return: current time in seconds since the epoch
+        """
+        return time.time()
+
+    def monotonic(self):
+        """
+        :return: value of monotonic clock in seconds, used for intervals
+        """
+        return time.monotonic()
+
+    def sleep(self, interval):
+        time.sleep(interval)
+
+    def get(self, items, timeout, busy):
+        """
+        Takes item from queue filled by background workers
+        :param items: queue.Queue object
+        :param timeout: time in seconds to wait for item
+        :param busy: callable, returning True while workers may put new items into queue
+        :return: item
+        :raise queue.Empty: if there is no item after timeout
+        """
+        return items.get(timeout=timeout)
+
+
+class VirtualClock(SystemClock):
+    """
+    Simulated time, which does not pass by itself: sleeping and waiting for idle workers advance clock instantly.
+    Work of background workers takes no virtual time, so that waiting for queue blocks in real time while they are
+    busy, and advances clock by timeout when they are idle and queue is empty.
+    Used to run workflows with long task lifecycle (e.g. stub backend with hours of solving) in seconds
+    """
+
+    EPOCH = 1600000000.0  # virtual time of the epoch clock at start
+    POLL_INTERVAL = 0.01  # real time in seconds between checks of busy workers
+
+    def __init__(self, start=0.0):
+        """
+        :param start: initial value of monotonic clock in seconds
+        """
+        self.__lock = threading.Lock()
+        self.__now = float(start)
+        self.__start = float(start)
+        self.__slept = 0.0
+
+    @property
+    def elapsed(self):
+        """
+        :return: virtual time in seconds passed since clock creation
+        """
+        with self.__lock:
+            return self.__now - self.__start
+
+    @property
+    def slept(self):
+        """
+        :return: total virtual time in seconds, which clock was advanced by sleeping and waiting
+        """
+        with self.__lock:
+            return self.__slept
+
+    def time(self):
+        return VirtualClock.EPOCH + self.monotonic()
+
+    def monotonic(self):
+        with self.__lock:
+            return self.__now
+
+    def sleep(self, interval):
+        self.advance(interval)
+
+    def get(self, items, timeout, busy):
+        while True:
+            try:
+                return items.get(timeout=VirtualClock.POLL_INTERVAL) if busy() else items.get_nowait()
+            except queue.Empty:
+                if not busy() and items.empty():
+                    self.advance(timeout)
+                    raise
+
+    def advance(self, interval):
+        """
+        Moves clock forward
+        :param interval: time in seconds
+        """
+        if interval is None or interval <= 0:
+            return
+        with self.__lock:
+            self.__now += interval
+            self.__slept += interval
+
+
 class Timeout(object):
+    """
+    Access to clock of application: every pause, interval and timestamp of workflow, pipeline and rate limiter
+    is measured by it, so that clock may be replaced with virtual one
+    """
 
-    INTERVAL = 0.270  # 270 ms
+    clock = SystemClock()
 
     @staticmethod
-    def hold_your_horses():
-        time.sleep(Timeout.INTERVAL)
+    def set_clock(clock):
+        """
+        :param clock: SystemClock or VirtualClock object
+        :return: previous clock
+        """
+        previous, Timeout.clock = Timeout.clock, clock
+        return previous
 
     @staticmethod
     def pause(interval):
-        time.sleep(interval)
+        Timeout.clock.sleep(interval)
+
+    @staticmethod
+    def now():
+        """
+        :return: value of monotonic clock in seconds
+        """
+        return Timeout.clock.monotonic()
@@ -0,0 +1,77 @@
+# coding: utf-8
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ui.console import terminal
+from core.network.limiter import TokenBucket
+from core.utils.formatting import format_size
+
+
+class Uploader(object):
+    """
+    Uploads submodel files to CML-Bench.
+    Files are streamed from memory-mapped files (see MultipartFileStream) through the shared pool of upload connections,
+    so files of one vertex and files of different vertices are uploaded in parallel.
+    Total upload speed of all connections can be limited with `Upload bandwidth` key of configuration file
+    """
+
+    DEFAULT_CONNECTIONS = 4
+    PROGRESS_THRESHOLD = 16 * 1024 * 1024  # 16 MB, progress of smaller files is not shown
+    PROGRESS_STEP = 25  # percents
+
+    def __init__(self, app_session):
+        cfg = app_session.cfg
+        self.__sender = app_session.sender
+        self.__executor = ThreadPoolExecutor(max_workers=cfg.upload_connections or Uploader.DEFAULT_CONNECTIONS,
+                                             thread_name_prefix="upload")
+        bandwidth = cfg.upload_bandwidth
+        if bandwidth:
+            # bucket holds one second of traffic, so bursts do not exceed bandwidth noticeably
+            self.__bandwidth = TokenBucket(bandwidth, bandwidth)
+        else:
+            self.__bandwidth = None
+
+    def upload(self, files, stype_tree_id, add_to_clipboard="off"):
+        """
+        Uploads files in parallel
+        :param files: paths to files
+        :param stype_tree_id: tree ID of s|type for uploading submodels
+        :param add_to_clipboard: `on` or `off`
+        :return: list of responses in the same order as files
+        """
+        futures = [self.__executor.submit(self.__upload, file, stype_tree_id, add_to_clipboard) for file in files]
+        return [future.result() for future in futures]
+
+    def __upload(self, file, stype_tree_id, add_to_clipboard):
+        name = os.path.basename(file)
+        start = time.monotonic()
+        progress = Uploader.__get_progress_reporter(name)
+        response = self.__sender.send_upload_submodel_request(file, stype_tree_id, add_to_clipboard,
+                                                              bandwidth=self.__bandwidth, progress=progress)
+        size = os.path.getsize(file)
+        elapsed = max(time.monotonic() - start, 1e-6)
+        if response is not None and response.status_code == 200:
+            terminal.show_info_message("Uploaded \"{}\": {} in {} sec ({}/s)",
+                                       name, format_size(size), round(elapsed, 2), format_size(size / elapsed))
+        return response
+
+    @staticmethod
+    def __get_progress_reporter(name):
+        """
+        :return: callable, showing upload progress of large file every `PROGRESS_STEP` percents
+        """
+        lock = threading.Lock()
+        state = {"shown": 0}
+
+        def report(sent, total):
+            if total < Uploader.PROGRESS_THRESHOLD:
+                return
+            percent = sent * 100 // total
+            with lock:
+                if percent < state["shown"] + Uploader.PROGRESS_STEP or percent >= 100:
+                    return
+                state["shown"] = percent - percent % Uploader.PROGRESS_STEP
+            terminal.show_info_message("Uploading \"{}\": {}% of {}", name, state["shown"], format_size(total))
+
+        return report
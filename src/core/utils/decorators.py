@@ -1,16 +1,63 @@
 # coding: utf-8
 
 import inspect
+import reprlib
 from functools import wraps
 from ui.console import terminal
 
 
-def method_info(func):
+class _ShortRepr(reprlib.Repr):
+    """
+    Representation of values bounded in length, long strings and bytes (e.g. bodies of responses) are cut before
+    they are formatted
+    """
+    MAX_LENGTH = 100
+
+    def __init__(self):
+        super().__init__()
+        self.maxstring = _ShortRepr.MAX_LENGTH
+        self.maxother = _ShortRepr.MAX_LENGTH
+
+    def repr_bytes(self, x, level):
+        if len(x) > self.maxstring:
+            return repr(x[:self.maxstring]) + "..."
+        return repr(x)
+
+
+_short_repr = _ShortRepr().repr
+
 
+class _CallArguments(object):
+    """
+    Arguments of call, bound to parameters of function on the calling thread.
+    Only names of parameters and short representations of values are kept, so that message neither keeps arguments
+    (e.g. responses) alive until it is written nor shows their state at the moment of writing
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self, func, args, kwargs):
+        try:
+            arguments = inspect.getcallargs(func, *args, **kwargs)
+        except TypeError:
+            arguments = {"args": args, "kwargs": kwargs}
+        self.values = [(name, _short_repr(value)) for name, value in arguments.items()]
+
+    def __str__(self):
+        return "{" + ", ".join(f"'{name}': {value}" for name, value in self.values) + "}"
+
+
+def method_info(func):
+    """
+    Shows debug messages with name and arguments of every call of function.
+    Whether debug output is enabled, is checked on every call, so that it does not depend on the order, in which
+    modules are imported and `Output` is set up
+    """
     @wraps(func)
     def wrapper(*args, **kwargs):
-        terminal.show_debug_message("Function called: {}", func.__qualname__)
-        terminal.show_debug_message("Values: {}", inspect.getcallargs(func, *args, **kwargs))
+        if terminal.Output.FULL:
+            terminal.show_debug_message("Function called: {}", func.__qualname__)
+            terminal.show_debug_message("Values: {}", _CallArguments(func, args, kwargs))
         return func(*args, **kwargs)
 
     return wrapper
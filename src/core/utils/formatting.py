@@ -0,0 +1,15 @@
+# coding: utf-8
+
+
+def format_size(size):
+    """
+    Method formats number of bytes for output
+    :param size: number of bytes
+    :return: string like `12.3 MB`
+    """
+    size = float(size)
+    for unit in ["B", "KB", "MB", "GB"]:
+        if abs(size) < 1024.0:
+            return "{:.1f} {}".format(size, unit)
+        size /= 1024.0
+    return "{:.1f} TB".format(size)
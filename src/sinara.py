@@ -19,11 +19,23 @@ def main():
     terminal.show_info_message(f"Backend address: {config_info.backend_address}")
     terminal.show_info_message(f"Local storage  : {config_info.local_storage}")
     terminal.show_info_message(f"Server storage : {config_info.server_storage}")
+    if config_info.log_file:
+        terminal.set_log_file(config_info.log_file)
+    if config_info.log_level:
+        terminal.Output.set_level(config_info.log_level)
 
     credentials_file = None
     json_file = None
     save_results = False
+    use_cache = True
+    clear_cache = False
+    record = None
+    replay = None
+    replay_speed = 1.0
+    timeline = None
 
+    # messages are written in background, help and errors of arguments are printed directly
+    terminal.flush()
     arguments = argparser.get_arguments()
     if arguments:
         key = arguments.k
@@ -44,9 +56,23 @@ def main():
         else:
             save_results = None
 
+        if arguments.l:
+            terminal.Output.set_level(arguments.l)
+
         add_dsp = arguments.d
         if add_dsp:
             terminal.Output.set_type(2)
+
+        use_cache = not arguments.n
+        clear_cache = arguments.c
+
+        if arguments.record:
+            record = os.path.abspath(arguments.record)
+        if arguments.p:
+            replay = os.path.abspath(arguments.p)
+            replay_speed = 0.0 if arguments.f else 1.0
+        if arguments.t:
+            timeline = os.path.abspath(arguments.t)
     else:
         terminal.show_error_message("No arguments passed!")
         return -1
@@ -65,7 +91,13 @@ def main():
                                      cfg=config_info,
                                      credentials=credentials_file,
                                      json=json_file,
-                                     res=save_results)
+                                     res=save_results,
+                                     cache=use_cache,
+                                     clear_cache=clear_cache,
+                                     record=record,
+                                     replay=replay,
+                                     replay_speed=replay_speed,
+                                     timeline=timeline)
             app_session.execute()
         except Exception as e:
             handle_unexpected_exception(e)
@@ -0,0 +1,34 @@
+# coding: utf-8
+import threading
+import pytest
+from benchmarks.environment import BenchmarkEnvironment
+from benchmarks.harness import silent_output
+from tools.stub import StubHTTPServer, StubSettings
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    """
+    Terminal messages of tested code are not shown
+    """
+    with silent_output():
+        yield
+
+
+@pytest.fixture
+def http_environment():
+    """
+    BenchmarkEnvironment, which application sessions send requests to stub backend through HTTP server:
+    asynchronous requests of `aiohttp` are not handled by StubAdapter
+    """
+    pytest.importorskip("aiohttp")
+    server = StubHTTPServer(("127.0.0.1", 0), None)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with BenchmarkEnvironment(StubSettings(login=False, waiting_time=0, solving_time=0, result_size=300000),
+                                  **{"Backend address": server.url}) as environment:
+            server.backend = environment.backend
+            yield environment
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,87 @@
+# coding: utf-8
+import asyncio
+import shutil
+from core.bench.entities import Simulation, SubmodelType
+
+
+def run(app_session, coroutine):
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await app_session.async_sender.close()
+
+    return asyncio.run(main())
+
+
+def test_simulation_is_cloned_and_run(http_environment):
+    simulation_id = http_environment.backend.add_simulation()
+    app_session = http_environment.create_app_session(http_environment.write_json({}))
+
+    async def clone_and_run():
+        clone = await Simulation.get(app_session, simulation_id).clone_async()
+        task = await clone.run_async(bsi=simulation_id)
+        return clone, task
+
+    clone, task = run(app_session, clone_and_run())
+    assert clone is not None and clone.identifier != simulation_id
+    assert task is not None
+    assert http_environment.backend.tasks
+
+
+def test_submodels_are_uploaded_once(http_environment):
+    first = http_environment.write_file("first.inc", 1000)
+    second = http_environment.write_file("second.inc", 2000)
+    copy = shutil.copy(first, first.replace("first", "copy"))
+    app_session = http_environment.create_app_session(http_environment.write_json({}))
+    stype = SubmodelType.get(app_session, app_session.cfg.server_storage)
+
+    submodels = run(app_session, stype.upload_submodel_async(first, second, copy))
+    assert len(submodels) == 3
+    assert submodels[0].identifier == submodels[2].identifier != submodels[1].identifier
+
+
+def test_get_responses_are_revalidated(http_environment):
+    simulation_id = http_environment.backend.add_simulation()
+    app_session = http_environment.create_app_session(http_environment.write_json({}))
+    sender = app_session.async_sender
+
+    async def request_twice():
+        first = await sender.send_simulation_submodels_request(simulation_id)
+        second = await sender.send_simulation_submodels_request(simulation_id)
+        await sender.send_simulation_submodels_update_request(simulation_id, [])
+        third = await sender.send_simulation_submodels_request(simulation_id)
+        return first, second, third
+
+    first, second, third = run(app_session, request_twice())
+    assert second is first
+    assert third is not first
+
+
+def test_simulation_is_modified_without_synchronous_requests(http_environment, monkeypatch):
+    simulation_id = http_environment.backend.add_simulation(name="Base")
+    first = http_environment.write_file("first.inc", 1000)
+    second = http_environment.write_file("second.inc", 2000)
+    app_session = http_environment.create_app_session(http_environment.write_json({}))
+    stype = SubmodelType.get(app_session, app_session.cfg.server_storage)
+    simulation = Simulation.get(app_session, simulation_id)
+
+    def blocking_request(*args, **kwargs):
+        raise AssertionError("Synchronous request sent from event loop")
+
+    for name in ("send_entity_base_info_request", "send_task_defaults_request",
+                 "send_simulation_submodels_request", "send_simulation_submodels_update_request"):
+        monkeypatch.setattr(app_session.sender, name, blocking_request)
+
+    async def modify():
+        submodels = await stype.upload_submodel_async(first, second)
+        assert await simulation.set_description_async("Modified") is not None
+        assert len(await simulation.add_submodels_async(submodels[0])) == 1
+        assert len(await simulation.add_submodels_async(submodels[1])) == 2
+        assert await simulation.erase_submodels_async()
+        assert await simulation.get_submodels_async() is None
+        return await simulation.run_async()
+
+    assert run(app_session, modify()) is not None
+    assert http_environment.backend.tasks
+    assert simulation.name == "Base"
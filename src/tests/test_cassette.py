@@ -0,0 +1,45 @@
+# coding: utf-8
+import json
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from core.network.cassette import RecordingAdapter
+
+BODY = b"x" * 2000
+
+
+class Server(HTTPAdapter):
+    """
+    Responds to every request with the same body and `Content-Length` header of test
+    """
+    length = None
+
+    def send(self, request, stream=False, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict({"Content-Length": self.length} if self.length is not None else {})
+        response._content = BODY
+        return response
+
+
+class Recorder(RecordingAdapter, Server):
+    pass
+
+
+@pytest.mark.parametrize("length, size, recorded", [(None, 2000, True),
+                                                    ("2000, 2000", 2000, True),
+                                                    ("-1", 2000, True),
+                                                    ("2000", 2000, False),
+                                                    (None, 2000, False)])
+def test_streamed_body_size_is_recorded(tmp_path, length, size, recorded):
+    path = str(tmp_path / "cassette.jsonl")
+    recorder = Recorder(path, max_body_size=1000 if not recorded else None)
+    recorder.length = length
+    request = requests.Request("GET", "http://stub.local/rest/simulation/1/file/2/export").prepare()
+    assert recorder.send(request, stream=True).content == BODY
+    recorder.close()
+    with open(path, encoding="utf-8") as file:
+        response = json.loads(file.readline())["response"]
+    assert response["size"] == size
+    assert (response["body"] is not None) == recorded
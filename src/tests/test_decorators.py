@@ -0,0 +1,26 @@
+# coding: utf-8
+from core.utils.decorators import _CallArguments
+
+
+class Body(object):
+    def __init__(self):
+        self.content = b"x" * 1000000
+
+
+def parse(response, chunk_size=1024, **params):
+    return response, chunk_size, params
+
+
+def test_call_arguments_are_formatted_on_call():
+    body = Body()
+    arguments = _CallArguments(parse, (body.content,), {"name": "Mass"})
+    body.content = None
+    formatted = str(arguments)
+    assert formatted.startswith("{'response': b'xxx")
+    assert "'chunk_size': 1024" in formatted and "'params': {'name': 'Mass'}" in formatted
+    assert len(formatted) < 300
+
+
+def test_call_arguments_do_not_keep_values():
+    arguments = _CallArguments(parse, (Body(),), {})
+    assert all(isinstance(value, str) for _, value in arguments.values)
@@ -0,0 +1,36 @@
+# coding: utf-8
+import os
+from benchmarks.environment import BenchmarkEnvironment
+from core.bench.entities import SubmodelType
+from core.dao.digest_index import DigestIndex
+from tools.stub import StubSettings
+
+
+def upload(environment, *files):
+    """
+    Uploads files in new application session, as in the next run of application
+    :return: tuple of list of submodels IDs and number of upload requests
+    """
+    app_session = environment.create_app_session(environment.write_json({}))
+    stype = SubmodelType.get(app_session, app_session.cfg.server_storage)
+    environment.backend.reset_statistics()
+    submodels = stype.upload_submodel(*files)
+    uploads = environment.backend.statistics.get("POST /rest/submodel", {}).get("requests", 0)
+    return [submodel.identifier for submodel in submodels], uploads
+
+
+def test_index_is_filled_by_uploads_without_digests_in_listing():
+    with BenchmarkEnvironment(StubSettings(login=False, digests=False)) as environment:
+        file = environment.write_file("first.inc", 1000)
+        identifiers, uploads = upload(environment, file)
+        assert uploads == 1
+        assert upload(environment, file) == (identifiers, 0)
+
+
+def test_index_is_seeded_from_listing_with_digests():
+    with BenchmarkEnvironment(StubSettings(login=False, digests=True)) as environment:
+        file = environment.write_file("first.inc", 1000)
+        identifiers, _ = upload(environment, file)
+        # local storage of another client has no index
+        os.remove(os.path.join(environment.directory, DigestIndex.FILE_NAME))
+        assert upload(environment, file) == (identifiers, 0)
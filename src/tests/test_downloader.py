@@ -0,0 +1,200 @@
+# coding: utf-8
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from requests.exceptions import ChunkedEncodingError, ConnectionError
+from benchmarks.environment import BenchmarkEnvironment
+from core.bench.entities import Simulation
+from core.network.downloader import Downloader
+from core.network.handler import Handler
+from tools.stub import StubSettings
+
+
+CONTENT = bytes(range(256)) * 64
+ETAG = '"2"'
+
+
+class Configuration(object):
+    download_chunk_size = 1024
+    download_connections = 1
+    download_segment_threshold = None
+
+
+class Response(object):
+    def __init__(self, start, fail_after=None):
+        self.status_code = 206 if start else 200
+        self.headers = {"Content-Range": f"bytes {start}-{len(CONTENT) - 1}/{len(CONTENT)}"} if start else \
+            {"Content-Length": str(len(CONTENT))}
+        self.headers["ETag"] = ETAG
+        self.__start = start
+        self.__fail_after = fail_after
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for position in range(self.__start, len(CONTENT), chunk_size):
+            if self.__fail_after is not None and position - self.__start >= self.__fail_after:
+                raise ChunkedEncodingError("Connection broken")
+            yield CONTENT[position:position + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class Sender(object):
+    """
+    Drops connection in the middle of the first response and fails to reconnect once
+    """
+    def __init__(self):
+        self.requests = []
+
+    def send_download_file_request(self, simulation_id, file_id, start=None, end=None, validator=None):
+        self.requests.append(start)
+        assert validator == (ETAG if start else None)
+        if len(self.requests) == 1:
+            return Response(0, fail_after=4096)
+        if len(self.requests) == 2:
+            raise ConnectionError("Connection refused")
+        return Response(start or 0)
+
+
+class Session(object):
+    cfg = Configuration()
+    handler = Handler(None)
+
+    def __init__(self):
+        self.sender = Sender()
+
+
+def test_download_is_resumed_after_failed_reconnection(tmp_path):
+    session = Session()
+    path = str(tmp_path / "Solution.xlsx")
+    assert Downloader(session).download(1, 2, path) == len(CONTENT)
+    with open(path, "rb") as file:
+        assert file.read() == CONTENT
+    assert session.sender.requests == [None, 4096, 4096]
+    assert os.listdir(tmp_path) == ["Solution.xlsx"]
+
+
+class RevisionSender(object):
+    """
+    Sends range only of the current revision of file, as server does for requests with `If-Range` header
+    """
+    def __init__(self):
+        self.requests = []
+
+    def send_download_file_request(self, simulation_id, file_id, start=None, end=None, validator=None):
+        self.requests.append((start, validator))
+        return Response(start if validator == ETAG else 0)
+
+
+def download_after_interruption(tmp_path, part, state):
+    """
+    Downloads file, leaving `part` and `state` of previous run in temporary files beforehand
+    :return: list of requested ranges and their validators
+    """
+    session = Session()
+    session.sender = RevisionSender()
+    path = str(tmp_path / "Solution.xlsx")
+    with open(path + ".1.part", "wb") as file:
+        file.write(part)
+    if state is not None:
+        with open(path + ".1.part.json", "w") as file:
+            file.write(state)
+    assert Downloader(session).download(1, 2, path) == len(CONTENT)
+    with open(path, "rb") as file:
+        assert file.read() == CONTENT
+    assert os.listdir(tmp_path) == ["Solution.xlsx"]
+    return session.sender.requests
+
+
+def test_download_is_resumed_with_validator(tmp_path):
+    assert download_after_interruption(tmp_path, CONTENT[:100], json.dumps({"validator": ETAG})) == [(100, ETAG)]
+
+
+def test_changed_file_is_downloaded_anew(tmp_path):
+    assert download_after_interruption(tmp_path, b"\x01" * 100, json.dumps({"validator": '"1"'})) == [(100, '"1"')]
+
+
+def test_partial_file_without_validator_is_not_resumed(tmp_path):
+    assert download_after_interruption(tmp_path, CONTENT[:100], None) == [(None, None)]
+
+
+def test_partial_file_with_damaged_state_is_not_resumed(tmp_path):
+    # zero-filled file of parallel download, which state was cut
+    state = json.dumps({"validator": ETAG, "size": len(CONTENT), "segments": [[0, len(CONTENT) - 1, 0]]})
+    assert download_after_interruption(tmp_path, bytes(len(CONTENT)), state[:40]) == [(None, None)]
+
+
+class SimulationSender(object):
+    """
+    Sends content of file, which depends on simulation, in small chunks
+    """
+    def __init__(self):
+        self.requests = []
+
+    def send_download_file_request(self, simulation_id, file_id, start=None, end=None, validator=None):
+        self.requests.append((simulation_id, start))
+        response = Response(start or 0)
+        content = bytes([simulation_id]) * len(CONTENT)
+        response.iter_content = lambda chunk_size: (content[position:position + 256]
+                                                    for position in range(start or 0, len(content), 256))
+        return response
+
+
+def test_downloads_of_different_simulations_are_not_mixed(tmp_path):
+    session = Session()
+    session.sender = SimulationSender()
+    path = str(tmp_path / "Solution.xlsx")
+    # partial file of another simulation, left by interrupted run
+    with open(path + ".3.part", "wb") as file:
+        file.write(b"\x03" * 100)
+
+    downloader = Downloader(session)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        sizes = list(executor.map(lambda simulation_id: downloader.download(simulation_id, 2, path), [1, 2]))
+    assert sizes == [len(CONTENT)] * 2
+    assert sorted(session.sender.requests) == [(1, None), (2, None)]
+    with open(path, "rb") as file:
+        assert file.read() in (b"\x01" * len(CONTENT), b"\x02" * len(CONTENT))
+    assert sorted(os.listdir(tmp_path)) == ["Solution.xlsx", "Solution.xlsx.3.part"]
+
+
+def test_async_download_is_streamed_into_file(http_environment):
+    http_environment.backend.add_simulation(identifier=2, results=["Solution.xlsx"])
+    app_session = http_environment.create_app_session(http_environment.write_json({}))
+    simulation = Simulation.get(app_session, 2)
+
+    async def download():
+        try:
+            return await simulation.download_files_async("Solution.xlsx")
+        finally:
+            await app_session.async_sender.close()
+
+    assert asyncio.run(download()) == ["Solution.xlsx"]
+    path = os.path.join(http_environment.directory, "Solution.xlsx")
+    assert os.path.getsize(path) == 300000
+    assert os.listdir(http_environment.directory).count("Solution.xlsx.2.part") == 0
+
+
+def test_parallel_download_of_changed_file_is_started_anew():
+    with BenchmarkEnvironment(StubSettings(login=False, waiting_time=0, solving_time=0, result_size=300000),
+                              **{"Download connections": 3, "Download segment threshold": 1000}) as environment:
+        environment.backend.add_simulation(identifier=2, results=["Solution.xlsx"])
+        simulation = Simulation.get(environment.create_app_session(environment.write_json({})), 2)
+        path = os.path.join(environment.directory, "Solution.xlsx")
+        assert simulation.download_files("Solution.xlsx") == ["Solution.xlsx"]
+        with open(path, "rb") as file:
+            content = file.read()
+
+        # parallel download of another revision of file was interrupted
+        os.rename(path, path + ".2.part")
+        with open(path + ".2.part.json", "w") as file:
+            json.dump({"validator": '"1"', "size": len(content), "segments": [[0, len(content) - 1, 1000]]}, file)
+        environment.backend.reset_statistics()
+        assert simulation.download_files("Solution.xlsx") == ["Solution.xlsx"]
+        with open(path, "rb") as file:
+            assert file.read() == content
+        assert not [name for name in os.listdir(environment.directory) if ".part" in name]
+        # range of another revision, the whole file to learn validator, then three ranges
+        assert environment.backend.statistics["GET /rest/simulation/{id}/file/{id}/export"]["requests"] == 5
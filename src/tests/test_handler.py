@@ -0,0 +1,21 @@
+# coding: utf-8
+from benchmarks.environment import BenchmarkEnvironment
+from core.bench.entities import Simulation
+
+
+def test_parsed_responses_are_released():
+    with BenchmarkEnvironment() as environment:
+        simulation_id = environment.backend.add_simulation(values=["Mass", "Stress"])
+        app_session = environment.create_app_session(environment.write_json({}))
+        response = app_session.sender.send_clone_simulation_request(simulation_id)
+        assert app_session.handler.handle_response_to_clone_simulation_request(response) is not None
+        assert response.content is None
+
+        # cached responses are shared, so they are not released
+        response = app_session.sender.send_simulation_submodels_request(simulation_id)
+        app_session.handler.handle_response_to_simulation_submodels_request(response)
+        assert app_session.sender.send_simulation_submodels_request(simulation_id).json() is not None
+
+        values = Simulation.get(app_session, simulation_id).get_values()
+        assert sorted(value.name for value in values) == ["Mass", "Stress"]
+        assert all(value.value is not None for value in values)
@@ -0,0 +1,16 @@
+# coding: utf-8
+import pytest
+from core.network.limiter import RateLimiter
+
+
+@pytest.mark.parametrize("method, status_code, repeated", [("POST", 429, True),
+                                                           ("DELETE", 429, True),
+                                                           ("GET", 503, True),
+                                                           ("PUT", 503, True),
+                                                           ("POST", 503, False),
+                                                           ("DELETE", 503, False),
+                                                           (None, 503, False),
+                                                           ("GET", 500, False)])
+def test_only_requests_safe_to_repeat_are_repeated(method, status_code, repeated):
+    limiter = RateLimiter(rate=1000000, burst=1000000)
+    assert limiter.feedback(status_code, 0.01, "0", method) is repeated
@@ -0,0 +1,33 @@
+# coding: utf-8
+from benchmarks.environment import BenchmarkEnvironment
+from core.bench.entities import Simulation
+
+
+def requests_count(backend):
+    return sum(value["requests"] for value in backend.statistics.values())
+
+
+def test_expired_entity_is_read_from_metadata_cache():
+    with BenchmarkEnvironment(**{"Metadata cache": "on"}) as environment:
+        simulation_id = environment.backend.add_simulation(name="Base")
+        app_session = environment.create_app_session(environment.write_json({}))
+        simulation = Simulation.get(app_session, simulation_id)
+        assert simulation.name == "Base"
+
+        count = requests_count(environment.backend)
+        simulation.refresh()
+        assert simulation.name == "Base"
+        assert requests_count(environment.backend) == count
+        assert app_session.cache.get("simulation", simulation_id) is not None
+
+
+def test_modified_entity_is_removed_from_metadata_cache():
+    with BenchmarkEnvironment(**{"Metadata cache": "on"}) as environment:
+        simulation_id = environment.backend.add_simulation(name="Base")
+        app_session = environment.create_app_session(environment.write_json({}))
+        simulation = Simulation.get(app_session, simulation_id)
+        assert simulation.name == "Base"
+
+        simulation.set_description("Modified")
+        assert app_session.cache.get("simulation", simulation_id) is None
+        assert simulation.get_description() == "Modified"
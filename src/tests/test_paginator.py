@@ -0,0 +1,100 @@
+# coding: utf-8
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from benchmarks.environment import BenchmarkEnvironment
+from core.bench.entities import Loadcase
+from core.network.paginator import AsyncPaginator, Paginator, is_last_page
+from core.network.response import BufferedResponse
+
+
+def page(data):
+    return BufferedResponse(200, {}, data if isinstance(data, bytes) else json.dumps(data).encode("utf-8"))
+
+
+@pytest.mark.parametrize("data, number, last", [(b"<html>", 1, True),
+                                                ([1, 2], 1, True),
+                                                ({"content": []}, 1, True),
+                                                ({"content": [1, 2], "last": True}, 1, True),
+                                                ({"content": [1, 2], "totalPages": 3}, 2, False),
+                                                ({"content": [1, 2], "totalPages": 3}, 3, True),
+                                                ({"content": [1]}, 1, True),
+                                                ({"content": [1, 2]}, 1, False)])
+def test_last_page(data, number, last):
+    assert is_last_page(page(data), number, 2) is last
+
+
+def pages(count, page_size):
+    """
+    :return: fetch function of pages without `last` and `totalPages` and list of requested pages
+    """
+    requested = []
+
+    def fetch(number):
+        requested.append(number)
+        start = (number - 1) * page_size
+        return page({"content": list(range(start, min(start + page_size, count)))})
+
+    return fetch, requested
+
+
+def parse(response):
+    return response.json()["content"]
+
+
+@pytest.mark.parametrize("count, requested_pages", [(0, [1]), (3, [1]), (4, [1, 2]), (5, [1, 2]), (8, [1, 2, 3])])
+def test_pages_are_requested_until_short_page(count, requested_pages):
+    # page after full one is requested, as there is no other sign of the last page
+    fetch, requested = pages(count, 4)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        paginator = Paginator(fetch, parse, 4, executor)
+        assert list(paginator) == list(range(count))
+    assert not paginator.failed
+    assert sorted(requested) == requested_pages
+
+
+def test_iteration_stops_on_failed_page():
+    fetch, requested = pages(12, 4)
+
+    def parse_first(response):
+        items = parse(response)
+        return items if items[0] == 0 else None
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        paginator = Paginator(fetch, parse_first, 4, executor)
+        assert list(paginator) == [0, 1, 2, 3]
+    assert paginator.failed
+    # only one page is requested ahead of parsed one
+    assert 4 not in requested
+
+
+def test_async_pages_are_requested_until_short_page():
+    fetch, requested = pages(6, 4)
+
+    async def fetch_async(number):
+        return fetch(number)
+
+    async def parse_async(response):
+        return parse(response)
+
+    async def read():
+        paginator = AsyncPaginator(fetch_async, parse_async, 4)
+        return [item async for item in paginator], paginator.failed
+
+    assert asyncio.run(read()) == (list(range(6)), False)
+    assert requested == [1, 2]
+
+
+@pytest.mark.parametrize("count", [0, 5, 10, 11])
+def test_loadcase_simulations_are_read_by_pages(count):
+    with BenchmarkEnvironment(**{"Page size loadcase simulations": 5}) as environment:
+        loadcase_id = environment.backend.add_loadcase()
+        identifiers = [environment.backend.add_simulation(loadcase_id) for _ in range(count)]
+        app_session = environment.create_app_session(environment.write_json({}))
+        environment.backend.reset_statistics()
+        simulations = Loadcase.get(app_session, loadcase_id).get_simulations() or []
+        assert sorted(simulation.identifier for simulation in simulations) == identifiers
+        # backend reports the last page, so page after it is not requested
+        requests = environment.backend.statistics["POST /rest/loadcase/{id}/simulation/list"]["requests"]
+        assert requests == max(1, -(-count // 5))
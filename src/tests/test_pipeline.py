@@ -0,0 +1,92 @@
+# coding: utf-8
+import threading
+import time
+from core.modules.pipeline import BootstrapPipeline, Stages
+from core.modules.timeline import NULL_TIMELINE
+
+
+class Configuration(object):
+    clone_workers = upload_workers = attach_workers = run_workers = download_workers = 1
+
+
+class Session(object):
+    cfg = Configuration()
+
+
+class Simulation(object):
+    def __init__(self, release=None, cloned=None):
+        self.identifier = 10
+        self.release = release
+        self.cloned = cloned
+        self.downloads = 0
+        self.clones = 0
+
+    def download_files(self, *names):
+        if self.release is not None:
+            self.release.wait()
+        self.downloads += 1
+        return list(names)
+
+    def clone(self):
+        self.clones += 1
+        return self.cloned
+
+
+class Vertex(object):
+    def __init__(self, simulation):
+        self.identifier = 1
+        self.results = ["Solution.xlsx"]
+        self.submodels = []
+        self.description = ""
+        self.current_simulation = simulation
+        self.base_simulation = simulation
+        self.stype = type("SubmodelType", (), {"upload_submodel": staticmethod(lambda *files: [])})()
+        self.timeline = NULL_TIMELINE
+
+
+def wait_idle(pipeline):
+    deadline = time.monotonic() + 5
+    while pipeline.in_flight and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert pipeline.in_flight == 0
+
+
+def test_download_finished_after_collect_is_not_repeated():
+    release = threading.Event()
+    simulation = Simulation(release)
+    vertex = Vertex(simulation)
+    pipeline = BootstrapPipeline(Session())
+    try:
+        pipeline.download(vertex)
+        assert pipeline.collect(0.01) == []
+
+        # download ends after main loop has collected nothing, poll of active vertices comes next
+        release.set()
+        wait_idle(pipeline)
+        assert pipeline.contains(vertex)
+        pipeline.download(vertex)
+        wait_idle(pipeline)
+
+        assert pipeline.collect() == [(vertex, Stages.DOWNLOAD, True)]
+        assert simulation.downloads == 1
+        assert not pipeline.contains(vertex)
+    finally:
+        pipeline.shutdown()
+
+
+def test_failed_bootstrap_is_contained_until_collected():
+    simulation = Simulation(cloned=None)
+    vertex = Vertex(simulation)
+    pipeline = BootstrapPipeline(Session())
+    try:
+        pipeline.submit(vertex)
+        wait_idle(pipeline)
+        assert pipeline.contains(vertex)
+        pipeline.submit(vertex)
+        wait_idle(pipeline)
+
+        assert pipeline.collect() == [(vertex, Stages.RUN, False)]
+        assert simulation.clones == 1
+        assert not pipeline.contains(vertex)
+    finally:
+        pipeline.shutdown()
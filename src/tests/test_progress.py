@@ -0,0 +1,39 @@
+# coding: utf-8
+from core.modules.progress import ProgressReporter
+
+
+class Vertex(object):
+    def __init__(self, identifier):
+        self.identifier = identifier
+        self.reads = 0
+        self.__status = "New"
+
+    @property
+    def status(self):
+        self.reads += 1
+        return self.__status
+
+    @status.setter
+    def status(self, status):
+        self.__status = status
+
+
+def test_only_updated_vertices_are_checked():
+    vertices = [Vertex(identifier) for identifier in range(100)]
+    results = {vertex.identifier: 0 for vertex in vertices}
+    progress = ProgressReporter(vertices, results)
+    for vertex in vertices:
+        vertex.reads = 0
+
+    vertices[0].status = "Solving"
+    vertices[1].status = "Solving"
+    results[2] = 1
+    progress.update(vertices[0], vertices[2])
+    assert progress.tick() == {("New", "Solving"): [0], ("New", ProgressReporter.DONE): [2]}
+    assert sum(vertex.reads for vertex in vertices) == 1
+    assert progress.counts() == {"New": 98, "Solving": 1, ProgressReporter.DONE: 1}
+
+    progress.update(vertices[1])
+    assert progress.tick() == {("New", "Solving"): [1]}
+    assert progress.tick() == {}
+    assert progress.counts() == {"New": 97, "Solving": 2, ProgressReporter.DONE: 1}
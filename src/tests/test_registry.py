@@ -0,0 +1,83 @@
+# coding: utf-8
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from benchmarks.environment import BenchmarkEnvironment
+from core.bench.entities import Simulation
+from core.bench.registry import SingleFlight
+from tools.stub import StubSettings
+
+CALLERS = 8
+
+
+def test_concurrent_calls_are_coalesced():
+    single_flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def function():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return object()
+
+    with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+        owner = executor.submit(single_flight.call, "key", function)
+        started.wait(5)
+        waiters = [executor.submit(single_flight.call, "key", function) for _ in range(CALLERS - 1)]
+        release.set()
+        results = [owner.result()] + [future.result() for future in waiters]
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    # completed call is not memoized
+    assert single_flight.call("key", lambda: 1) == 1
+
+
+def test_exception_is_raised_for_every_caller():
+    single_flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def function():
+        started.set()
+        release.wait(5)
+        raise ValueError("Failed")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        owner = executor.submit(single_flight.call, "key", function)
+        started.wait(5)
+        waiter = executor.submit(single_flight.call, "key", function)
+        release.set()
+        for future in (owner, waiter):
+            with pytest.raises(ValueError):
+                future.result()
+
+
+def test_entity_is_requested_once():
+    with BenchmarkEnvironment(StubSettings(login=False, latency=0.05, jitter=0)) as environment:
+        simulation_id = environment.backend.add_simulation(name="Base")
+        app_session = environment.create_app_session(environment.write_json({}))
+        environment.backend.reset_statistics()
+
+        def name():
+            return Simulation.get(app_session, simulation_id).name
+
+        with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+            names = list(executor.map(lambda _: name(), range(CALLERS)))
+        assert names == ["Base"] * CALLERS
+        assert environment.backend.statistics["GET /rest/simulation/{id}"]["requests"] == 1
+        assert len({id(Simulation.get(app_session, simulation_id)) for _ in range(CALLERS)}) == 1
+
+
+def test_task_defaults_are_requested_once():
+    with BenchmarkEnvironment(StubSettings(login=False, latency=0.05, jitter=0,
+                                           waiting_time=0, solving_time=0)) as environment:
+        base_id = environment.backend.add_simulation()
+        clones = [environment.backend.add_simulation() for _ in range(CALLERS)]
+        app_session = environment.create_app_session(environment.write_json({}))
+        environment.backend.reset_statistics()
+
+        with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+            tasks = list(executor.map(lambda identifier: Simulation.get(app_session, identifier).run(bsi=base_id),
+                                      clones))
+        assert all(task is not None for task in tasks)
+        assert environment.backend.statistics["GET /rest/simulation/{id}/task"]["requests"] == 1
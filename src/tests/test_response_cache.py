@@ -0,0 +1,54 @@
+# coding: utf-8
+from benchmarks.environment import BenchmarkEnvironment
+from core.network.response import BufferedResponse
+from core.network.response_cache import ResponseCache
+
+URL = "http://stub.local/rest/simulation/1"
+
+
+def response(headers, content=b"{}"):
+    return BufferedResponse(200, headers, content)
+
+
+def test_validators_do_not_depend_on_case_of_headers():
+    cache = ResponseCache()
+    cache.store(URL, response({"etag": '"1"', "last-modified": "Mon, 19 Oct 2026 10:00:00 GMT"}))
+    assert cache.validators(URL) == {"If-None-Match": '"1"', "If-Modified-Since": "Mon, 19 Oct 2026 10:00:00 GMT"}
+
+
+def test_responses_without_validators_are_not_cached():
+    cache = ResponseCache()
+    original = response({"Content-Type": "application/json"})
+    assert cache.store(URL, original) is original
+    assert cache.get(URL) is None
+    assert cache.store(URL, response({"ETag": '"1"', "Cache-Control": "no-store"})) is not None
+    assert cache.get(URL) is None
+
+
+def test_least_recently_used_response_is_evicted():
+    cache = ResponseCache(capacity=2)
+    for identifier in range(3):
+        cache.store(f"{URL}{identifier}", response({"ETag": str(identifier)}))
+    assert cache.get(f"{URL}0") is None
+    assert cache.get(f"{URL}1") is not None
+
+
+def test_modification_invalidates_parent_and_nested_resources():
+    cache = ResponseCache()
+    urls = [URL, URL + "/submodel", URL + "/submodel/2", "http://stub.local/rest/simulation/10"]
+    for url in urls:
+        cache.store(url, response({"ETag": '"1"'}))
+    cache.invalidate(URL + "/submodel")
+    assert [url for url in urls if cache.get(url) is not None] == ["http://stub.local/rest/simulation/10"]
+
+
+def test_modified_resource_is_requested_again():
+    with BenchmarkEnvironment() as environment:
+        simulation_id = environment.backend.add_simulation()
+        app_session = environment.create_app_session(environment.write_json({}))
+        sender = app_session.sender
+        first = sender.send_simulation_submodels_request(simulation_id)
+        assert sender.send_simulation_submodels_request(simulation_id) is first
+
+        sender.send_simulation_submodels_update_request(simulation_id, [])
+        assert sender.send_simulation_submodels_request(simulation_id) is not first
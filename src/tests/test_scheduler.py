@@ -0,0 +1,110 @@
+# coding: utf-8
+import time
+from benchmarks.environment import BenchmarkEnvironment
+from benchmarks.micro import solve_data
+from core.modules.scheduler import Scheduler
+from core.modules.workflow import WorkFlow
+
+
+class Vertex(object):
+    def __init__(self, identifier):
+        self.identifier = identifier
+
+
+class Graph(object):
+    """
+    Graph of vertices given by dictionary {vertex ID: list of parents IDs}
+    """
+    def __init__(self, parents):
+        self.vertices = {identifier: Vertex(identifier) for identifier in parents.keys()}
+        self.edges = [(self.vertices[identifier], self.vertices[parent])
+                      for identifier, items in parents.items() for parent in items]
+
+
+def take_ready(scheduler):
+    identifiers = []
+    while scheduler.has_ready():
+        identifiers.append(scheduler.next_ready().identifier)
+    return identifiers
+
+
+def test_vertex_is_released_by_its_last_parent():
+    graph = Graph({1: [], 2: [1], 3: [1], 4: [2, 3]})
+    scheduler = Scheduler(graph)
+    assert take_ready(scheduler) == [1]
+    assert [vertex.identifier for vertex in scheduler.complete(graph.vertices[1])] == [2, 3]
+    assert take_ready(scheduler) == [2, 3]
+    assert scheduler.complete(graph.vertices[2]) == []
+    assert scheduler.complete(graph.vertices[2]) == []
+    assert [vertex.identifier for vertex in scheduler.complete(graph.vertices[3])] == [4]
+    assert take_ready(scheduler) == [4]
+    scheduler.complete(graph.vertices[4])
+    assert scheduler.finished and not scheduler.failed and scheduler.active_count == 0
+
+
+def test_children_of_failed_vertex_are_not_released():
+    graph = Graph({1: [], 2: [], 3: [1, 2]})
+    scheduler = Scheduler(graph)
+    assert take_ready(scheduler) == [1, 2]
+    scheduler.fail(graph.vertices[1])
+    assert scheduler.complete(graph.vertices[2]) == []
+    assert scheduler.failed and not scheduler.finished
+    assert scheduler.active == [] and not scheduler.has_ready()
+
+
+def test_cyclic_vertices_are_never_ready():
+    scheduler = Scheduler(Graph({1: [], 2: [1, 3], 3: [2]}))
+    assert take_ready(scheduler) == [1]
+    scheduler.complete(scheduler.active[0])
+    assert not scheduler.has_ready() and scheduler.active == [] and not scheduler.finished
+
+
+def solve(environment, data):
+    for vertex in data["Root"]["LCs"]:
+        simulation_id = environment.backend.add_simulation(identifier=vertex["base_simulation_id"] + 1000000)
+        vertex["curr_simulation_id"] = simulation_id
+        vertex["curr_task_id"] = environment.backend.add_task(simulation_id)
+    workflow = WorkFlow(environment.create_app_session(environment.write_json(data)))
+    workflow._run_all_tasks()
+    return workflow
+
+
+def completed(monkeypatch):
+    """
+    :return: list of IDs of vertices completed by workflow, in order of completion
+    """
+    identifiers = []
+    complete = Scheduler.complete
+
+    def recording(self, vertex):
+        identifiers.append(vertex.identifier)
+        return complete(self, vertex)
+
+    monkeypatch.setattr(Scheduler, "complete", recording)
+    return identifiers
+
+
+def test_workflow_completes_chain(monkeypatch):
+    identifiers = completed(monkeypatch)
+    with BenchmarkEnvironment() as environment:
+        solve(environment, solve_data(5, curr_task_status="Finished", submodels=[]))
+    assert identifiers == [1, 2, 3, 4, 5]
+
+
+def test_workflow_stops_on_cyclic_links(monkeypatch):
+    identifiers = completed(monkeypatch)
+    data = solve_data(3, curr_task_status="Finished", submodels=[])
+    data["Root"]["LCs"][0]["parents"] = [3]
+    with BenchmarkEnvironment() as environment:
+        solve(environment, data)
+    assert identifiers == []
+
+
+def test_results_of_finished_task_are_downloaded_in_the_same_pass(monkeypatch):
+    identifiers = completed(monkeypatch)
+    monkeypatch.setattr(WorkFlow, "WALK_INTERVAL", 60)
+    start = time.monotonic()
+    with BenchmarkEnvironment() as environment:
+        solve(environment, solve_data(3, curr_task_status="Solving", submodels=[]))
+    assert identifiers == [1, 2, 3]
+    assert time.monotonic() - start < WorkFlow.WALK_INTERVAL
@@ -0,0 +1,66 @@
+# coding: utf-8
+import json
+import threading
+import pytest
+from core.utils.decorators import method_info
+from ui.console import terminal
+
+
+class State(object):
+    def __init__(self):
+        self.value = "initial"
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.current_thread())
+        return self.value
+
+
+@pytest.fixture
+def log(tmp_path, monkeypatch):
+    """
+    :return: function returning messages written into log file
+    """
+    monkeypatch.setattr(terminal.Output, "LEVEL", terminal.Output.LEVEL)
+    monkeypatch.setattr(terminal.Output, "FULL", terminal.Output.FULL)
+    monkeypatch.setattr(terminal.Output, "REQUESTS", terminal.Output.REQUESTS)
+    path = tmp_path / "log.jsonl"
+    terminal.set_log_file(str(path))
+
+    def read():
+        terminal.flush()
+        with open(path, encoding="utf-8") as file:
+            return [json.loads(line)["message"] for line in file]
+
+    yield read
+    terminal.set_log_file(None)
+
+
+def test_values_are_formatted_by_caller(log):
+    state = State()
+    terminal.show_info_message("State: {}", state)
+    state.value = "changed"
+    assert log() == ["State: initial"]
+    assert state.threads == [threading.current_thread()]
+
+
+def test_messages_below_level_are_not_shown(log):
+    terminal.Output.set_level("warning")
+    state = State()
+    terminal.show_info_message("State: {}", state)
+    terminal.show_warning_message("Warning")
+    terminal.show_error_message("Error")
+    assert log() == ["Warning", "Error"]
+    assert not state.threads
+
+
+def test_debug_output_is_enabled_after_decoration(log):
+    @method_info
+    def function(value):
+        return value
+
+    function(1)
+    terminal.Output.set_level("debug")
+    function(2)
+    assert log() == ["Function called: test_debug_output_is_enabled_after_decoration.<locals>.function",
+                     "Values: {'value': 2}"]
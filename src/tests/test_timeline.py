@@ -0,0 +1,17 @@
+# coding: utf-8
+from core.modules.timeline import Steps, Timeline, to_html
+
+
+class Vertex(object):
+    def __init__(self, identifier, links=()):
+        self.identifier = identifier
+        self.links = list(links)
+        self.timeline = Timeline()
+
+
+def test_identifiers_of_vertices_are_escaped_in_html():
+    vertex = Vertex("<script>alert(1)</script>")
+    vertex.timeline.mark(Steps.READY)
+    page = to_html([vertex])
+    assert "<script>" not in page
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in page
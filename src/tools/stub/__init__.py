@@ -0,0 +1,3 @@
+# coding: utf-8
+from tools.stub.backend import StubBackend, StubSettings, StubResponse
+from tools.stub.transport import StubAdapter, StubHTTPServer
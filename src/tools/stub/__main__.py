@@ -0,0 +1,80 @@
+# coding: utf-8
+import argparse
+import json
+from tools.stub import StubBackend, StubSettings, StubHTTPServer
+
+
+def get_arguments():
+    arg_parser = argparse.ArgumentParser(prog="python -m tools.stub",
+                                         description="Local stub of CML-Bench server")
+
+    arg_parser.add_argument("--host", action="store", default="127.0.0.1", help="Host to listen | Optional")
+    arg_parser.add_argument("--port", action="store", type=int, default=8080, help="Port to listen | Optional")
+    arg_parser.add_argument("-j", action="store", help="Create loadcases and simulations of JSON file | Optional")
+    arg_parser.add_argument("--latency", action="store", type=float, default=0.0,
+                            help="Delay of every response in seconds | Optional")
+    arg_parser.add_argument("--jitter", action="store", type=float, default=0.0,
+                            help="Maximal random addition to latency in seconds | Optional")
+    arg_parser.add_argument("--error-rate", action="store", type=float, default=0.0,
+                            help="Probability of `500` response | Optional")
+    arg_parser.add_argument("--throttle-rate", action="store", type=float, default=0.0,
+                            help="Probability of `429` response | Optional")
+    arg_parser.add_argument("--retry-after", action="store", type=float, default=1.0,
+                            help="`Retry-After` of throttled responses in seconds | Optional")
+    arg_parser.add_argument("--waiting-time", action="store", type=float, default=1.0,
+                            help="Time of task waiting in queue in seconds | Optional")
+    arg_parser.add_argument("--solving-time", action="store", type=float, default=2.0,
+                            help="Time of task solving in seconds | Optional")
+    arg_parser.add_argument("--solving-spread", action="store", type=float, default=0.0,
+                            help="Relative random spread of solving time, e.g. 0.5 | Optional")
+    arg_parser.add_argument("--slots", action="store", type=int, default=0,
+                            help="Number of tasks solved at the same time, 0 - no limit | Optional")
+    arg_parser.add_argument("--failure-rate", action="store", type=float, default=0.0,
+                            help="Probability of task to fail | Optional")
+    arg_parser.add_argument("--result-size", action="store", type=int, default=1024 * 1024,
+                            help="Size of result files in bytes | Optional")
+    arg_parser.add_argument("--no-duplicates", action="store_true",
+                            help="Do not report duplicates of uploaded submodels | Optional")
+    arg_parser.add_argument("--no-digests", action="store_true",
+                            help="Do not report SHA-256 of submodels | Optional")
+    arg_parser.add_argument("--no-login", action="store_true", help="Do not require login | Optional")
+    arg_parser.add_argument("--seed", action="store", type=int, help="Seed of random generator | Optional")
+    arg_parser.add_argument("-d", action="store_true", help="Log every request | Optional")
+
+    return arg_parser.parse_args()
+
+
+def main():
+    arguments = get_arguments()
+    settings = StubSettings(latency=arguments.latency,
+                            jitter=arguments.jitter,
+                            error_rate=arguments.error_rate,
+                            throttle_rate=arguments.throttle_rate,
+                            retry_after=arguments.retry_after,
+                            waiting_time=arguments.waiting_time,
+                            solving_time=arguments.solving_time,
+                            solving_spread=arguments.solving_spread,
+                            slots=arguments.slots,
+                            failure_rate=arguments.failure_rate,
+                            result_size=arguments.result_size,
+                            duplicates=not arguments.no_duplicates,
+                            digests=not arguments.no_digests,
+                            login=not arguments.no_login,
+                            seed=arguments.seed)
+    backend = StubBackend(settings)
+    if arguments.j:
+        with open(arguments.j, "r", encoding="utf-8") as file:
+            backend.add_workload(json.load(file))
+
+    server = StubHTTPServer((arguments.host, arguments.port), backend, verbose=arguments.d)
+    print(f"Stub CML-Bench server is listening on {server.url}, set it as `Backend address` in configuration file")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
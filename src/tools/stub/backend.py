@@ -0,0 +1,749 @@
+# coding: utf-8
+import collections
+import hashlib
+import heapq
+import itertools
+import json
+import random
+import re
+import threading
+from email.parser import BytesParser
+from urllib.parse import urlsplit, parse_qs
+from core.network.timeout import Timeout
+
+
+class StubSettings(object):
+    """
+    Behaviour of stub CML-Bench backend: simulated latency, faults and task lifecycle
+    """
+    def __init__(self, **kwargs):
+        """
+        :param kwargs: optional settings;
+                       `latency` - delay of every response in seconds; default is 0
+                       `jitter` - maximal random addition to latency in seconds; default is 0
+                       `error_rate` - probability of `500 Internal Server Error` response; default is 0
+                       `throttle_rate` - probability of `429 Too Many Requests` response; default is 0
+                       `retry_after` - value of `Retry-After` header of throttled responses in seconds; default is 1
+                       `waiting_time` - time of task waiting in queue in seconds; default is 1
+                       `solving_time` - time of task solving in seconds; default is 2
+                       `solving_spread` - relative spread of solving time, every task is solved for random time
+                                          from `solving_time * (1 - spread)` to `solving_time * (1 + spread)`;
+                                          default is 0
+                       `slots` - number of tasks solved at the same time, other tasks wait in queue after their
+                                 waiting time; default is 0 (no limit)
+                       `failure_rate` - probability of task to fail; default is 0
+                       `duplicates` - respond with duplicates warning to upload of already existing submodel content;
+                                      default is True
+                       `digests` - report SHA-256 of submodels content in submodels list; default is True
+                       `login` - require login before other requests; default is True
+                       `result_size` - size of simulation result files in bytes; default is 1 MB
+                       `seed` - seed of random generator; optional
+        """
+        self.latency = float(kwargs.get("latency", 0.0))
+        self.jitter = float(kwargs.get("jitter", 0.0))
+        self.error_rate = float(kwargs.get("error_rate", 0.0))
+        self.throttle_rate = float(kwargs.get("throttle_rate", 0.0))
+        self.retry_after = float(kwargs.get("retry_after", 1.0))
+        self.waiting_time = float(kwargs.get("waiting_time", 1.0))
+        self.solving_time = float(kwargs.get("solving_time", 2.0))
+        self.solving_spread = float(kwargs.get("solving_spread", 0.0))
+        self.slots = int(kwargs.get("slots", 0))
+        self.failure_rate = float(kwargs.get("failure_rate", 0.0))
+        self.duplicates = bool(kwargs.get("duplicates", True))
+        self.digests = bool(kwargs.get("digests", True))
+        self.login = bool(kwargs.get("login", True))
+        self.result_size = int(kwargs.get("result_size", 1024 * 1024))
+        self.seed = kwargs.get("seed")
+
+
+class StubResponse(object):
+    """
+    Response of stub backend: status code, headers and binary body
+    """
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers if headers is not None else {}
+
+    @classmethod
+    def from_json(cls, status_code, data, headers=None):
+        headers = dict(headers or {})
+        headers["Content-Type"] = "application/json;charset=UTF-8"
+        return cls(status_code, json.dumps(data).encode("utf-8"), headers)
+
+    @classmethod
+    def message(cls, status_code, message):
+        return cls.from_json(status_code, {"status": status_code, "message": message})
+
+
+class StubBackend(object):
+    """
+    In-memory stand-in of CML-Bench REST API, covering every endpoint used by Sender.
+    Backend is transport independent: `handle()` takes request method, URL, headers and body and returns StubResponse,
+    it is served over HTTP by `StubHTTPServer` or in-process by `StubAdapter`.
+    Tasks pass through statuses "Waiting", "Solving" and "Finished" (or "Failed") by clock of backend (real time,
+    or virtual time of `VirtualClock`); result files and key results appear in simulation when its task is finished.
+    Entities which are not known to backend (e.g. IDs from input JSON file) are created on first request
+    """
+
+    VERSION = "stub"
+    SESSION_COOKIE = "JSESSIONID"
+    FIRST_ID = 1000000
+    TREE_ID_OFFSET = 1000000000  # tree IDs of entities are separate from entity IDs
+    DEFAULT_VALUES = ("L1", "L1iso")
+    DEFAULT_RESULTS = ("Solution.xlsx",)
+    PATTERN_SIZE = 64 * 1024
+
+    def __init__(self, settings=None, clock=None):
+        """
+        :param settings: StubSettings object; optional
+        :param clock: clock of task lifecycle and latency; optional; by default clock of application is used
+        """
+        self.__settings = settings or StubSettings()
+        self.__clock = clock
+        self.__random = random.Random(self.__settings.seed)
+        self.__lock = threading.RLock()
+        self.__ids = itertools.count(StubBackend.FIRST_ID)
+        self.__sessions = set()
+        self.__entities = {}
+        self.__slots = []  # heap of times, when solving slots are released
+        self.__routes = [
+            ("GET", r"/rest/version", self.__version),
+            ("POST", r"/rest/login", self.__login),
+            ("POST", r"/rest/loadcase/(\d+)/simulation/list", self.__loadcase_simulations),
+            ("POST", r"/rest/loadcase/(\d+)/targetValue/list", self.__loadcase_targets),
+            ("POST", r"/rest/loadcase/(\d+)/targetValue", self.__add_loadcase_target),
+            ("DELETE", r"/rest/loadcase/(\d+)/targetValue", self.__remove_loadcase_targets),
+            ("POST", r"/rest/simulation/(\d+)/clone", self.__clone_simulation),
+            ("POST", r"/rest/simulation/(\d+)/tasks/list", self.__simulation_tasks),
+            ("GET", r"/rest/simulation/(\d+)/submodel", self.__simulation_submodels),
+            ("POST", r"/rest/simulation/(\d+)/submodel", self.__update_simulation_submodels),
+            ("POST", r"/rest/simulation/(\d+)/file/list", self.__simulation_files),
+            ("GET", r"/rest/simulation/(\d+)/file/(\d+)/export", self.__export_file),
+            ("GET", r"/rest/simulation/(\d+)/task/?", self.__task_defaults),
+            ("POST", r"/rest/simulation/(\d+)/keyResult/list", self.__simulation_values),
+            ("GET", r"/rest/simulation/(\d+)/keyResult/(\d+)", self.__simulation_value),
+            ("PUT", r"/rest/simulation/(\d+)", self.__modify_simulation),
+            ("POST", r"/rest/task/?", self.__run),
+            ("POST", r"/rest/submodel", self.__upload_submodel),
+            ("POST", r"/rest/submodel/list", self.__stype_submodels),
+            ("DELETE", r"/rest/submodel/(\d+)", self.__delete_submodel),
+            ("GET", r"/rest/(loadcase|simulation|task|submodelType|submodel)/(\d+)", self.__entity_base_info),
+        ]
+        # endpoints are named by method and path template, e.g. `GET /rest/simulation/{id}/submodel`;
+        # base information of entities is counted separately by entity type
+        self.__routes = [(method,
+                          re.compile(pattern + "$"),
+                          "{} {}".format(method, pattern.replace(r"(\d+)", "{id}").replace("/?", "")),
+                          route) for method, pattern, route in self.__routes]
+        self.__statistics = collections.defaultdict(lambda: {"requests": 0,
+                                                             "errors": 0,
+                                                             "sent": 0,
+                                                             "received": 0,
+                                                             "latency": 0.0})
+
+    @property
+    def settings(self):
+        return self.__settings
+
+    @property
+    def statistics(self):
+        """
+        :return: dictionary {endpoint: statistics} with keys `requests`, `errors` (responses with status code 400+),
+                 `sent` and `received` (bytes of request and response bodies, from client's point of view),
+                 `latency` (simulated delay in seconds)
+        """
+        with self.__lock:
+            return {endpoint: dict(value) for endpoint, value in self.__statistics.items()}
+
+    def reset_statistics(self):
+        with self.__lock:
+            self.__statistics.clear()
+
+    @property
+    def tasks(self):
+        """
+        :return: list of tasks with keys `id`, `simulation`, `status`, `created`, `started` and `finished`
+                 (times by clock of backend; time of start and finish is expected one for unfinished tasks)
+        """
+        with self.__lock:
+            tasks = []
+            for entity in self.__entities.values():
+                if entity["type"] != "task":
+                    continue
+                self.__update_task(entity)
+                tasks.append({"id": entity["id"],
+                              "simulation": entity["parent"],
+                              "status": entity["status"],
+                              "created": entity["created"],
+                              "started": entity["waiting_end"],
+                              "finished": entity["solving_end"]})
+            return tasks
+
+# ------------------------------------------------ Workload definition ----------------------------------------------- #
+
+    def add_loadcase(self, identifier=None, name=None):
+        """
+        :return: loadcase ID
+        """
+        with self.__lock:
+            identifier = self.__new_id(identifier)
+            self.__entities[identifier] = {"type": "loadcase",
+                                           "id": identifier,
+                                           "name": name or f"Loadcase {identifier}",
+                                           "parent": None,
+                                           "targets": []}
+            return identifier
+
+    def add_simulation(self, loadcase_id=None, identifier=None, name=None, results=None, values=None):
+        """
+        :param loadcase_id: ID of parent loadcase; optional; new loadcase is created, if it is not defined
+        :param results: names of result files, which are created again when simulation task is finished
+        :param values: names of key results, which are created again when simulation task is finished
+        :return: simulation ID
+        """
+        with self.__lock:
+            if loadcase_id is None or loadcase_id not in self.__entities:
+                loadcase_id = self.add_loadcase(loadcase_id)
+            identifier = self.__new_id(identifier)
+            self.__entities[identifier] = {"type": "simulation",
+                                           "id": identifier,
+                                           "name": name or f"Simulation {identifier}",
+                                           "description": "",
+                                           "parent": loadcase_id,
+                                           "submodels": [],
+                                           "results": list(results or StubBackend.DEFAULT_RESULTS),
+                                           "values": list(values or StubBackend.DEFAULT_VALUES),
+                                           "files": [],
+                                           "key_results": [],
+                                           "tasks": []}
+            # existing simulations are solved already
+            self.__create_results(self.__entities[identifier])
+            return identifier
+
+    def add_task(self, simulation_id, identifier=None, status="Finished"):
+        """
+        Creates task of simulation, which is already in given status
+        :param status: "Finished" or "Failed"
+        :return: task ID
+        """
+        with self.__lock:
+            simulation = self.__entity(simulation_id, "simulation")
+            identifier = self.__new_id(identifier)
+            now = self.__now()
+            self.__entities[identifier] = {"type": "task",
+                                           "id": identifier,
+                                           "name": f"Task {identifier}",
+                                           "parent": simulation["id"],
+                                           "status": status,
+                                           "created": now,
+                                           "waiting_end": now,
+                                           "solving_end": now,
+                                           "fails": status == "Failed"}
+            simulation["tasks"].append(identifier)
+            return identifier
+
+    def add_stype(self, identifier=None, name=None):
+        """
+        :return: s|type ID
+        """
+        with self.__lock:
+            identifier = self.__new_id(identifier)
+            self.__entities[identifier] = {"type": "submodelType",
+                                           "id": identifier,
+                                           "name": name or f"S-Type {identifier}",
+                                           "parent": None,
+                                           "submodels": []}
+            return identifier
+
+    def add_workload(self, data):
+        """
+        Creates loadcases and base simulations defined in input JSON file, so that it can be processed by stub
+        :param data: decoded input JSON file
+        """
+        for item in (data.get("Root") or {}).get("LCs") or []:
+            loadcase_id = item.get("loadcase_id")
+            simulation_id = item.get("base_simulation_id")
+            with self.__lock:
+                if loadcase_id is not None and loadcase_id not in self.__entities:
+                    self.add_loadcase(loadcase_id, item.get("loadcase_name"))
+                if simulation_id is not None and simulation_id not in self.__entities:
+                    self.add_simulation(loadcase_id, simulation_id, results=item.get("results"))
+
+    def get_entity(self, identifier):
+        """
+        :return: copy of entity state, or None, if there is no entity with such ID
+        """
+        with self.__lock:
+            entity = self.__entities.get(identifier)
+            if entity is None:
+                return None
+            self.__update_task(entity)
+            return json.loads(json.dumps(entity))
+
+# ----------------------------------------------------- Requests ----------------------------------------------------- #
+
+    def handle(self, method, url, headers=None, body=b""):
+        """
+        Handles request, simulating latency and faults
+        :param method: HTTP method
+        :param url: request URL, or its path with query
+        :param headers: request headers
+        :param body: request body (bytes)
+        :return: StubResponse object
+        """
+        settings = self.__settings
+        headers = {key.lower(): value for key, value in (headers or {}).items()}
+        parts = urlsplit(url)
+        path = parts.path
+        if path.startswith("/cml-bench/"):
+            path = path[len("/cml-bench"):]
+        query = parse_qs(parts.query)
+
+        endpoint, route, arguments = f"{method} {path}", None, ()
+        for route_method, pattern, route_endpoint, route_function in self.__routes:
+            match = pattern.match(path)
+            if match is not None and route_method == method:
+                endpoint, route, arguments = route_endpoint, route_function, match.groups()
+                if route == self.__entity_base_info:
+                    endpoint = f"{method} /rest/{arguments[0]}/{{id}}"
+                break
+
+        with self.__lock:
+            delay = settings.latency + (self.__random.uniform(0, settings.jitter) if settings.jitter else 0.0)
+            fault = self.__random.random()
+        if delay > 0:
+            (self.__clock or Timeout.clock).sleep(delay)
+
+        if fault < settings.throttle_rate:
+            response = StubResponse.from_json(429, {"status": 429, "message": "Too many requests"},
+                                              {"Retry-After": str(settings.retry_after)})
+        elif fault < settings.throttle_rate + settings.error_rate:
+            response = StubResponse.message(500, "Internal server error")
+        elif route is None:
+            response = StubResponse.message(404, f"No handler for {method} {path}")
+        elif settings.login and route not in (self.__version, self.__login) and not self.__authorized(headers):
+            response = StubResponse.message(401, "Unauthorized")
+        else:
+            try:
+                with self.__lock:
+                    response = route(*arguments, query=query, headers=headers, body=body)
+            except ValueError as e:
+                response = StubResponse.message(400, str(e))
+            response = self.__conditional(method, headers, response)
+
+        with self.__lock:
+            statistics = self.__statistics[endpoint]
+            statistics["requests"] += 1
+            statistics["errors"] += response.status_code >= 400
+            statistics["sent"] += len(body or b"")
+            statistics["received"] += len(response.body)
+            statistics["latency"] += delay
+        return response
+
+    def __authorized(self, headers):
+        cookies = headers.get("cookie", "")
+        for cookie in cookies.split(";"):
+            name, _, value = cookie.strip().partition("=")
+            if name == StubBackend.SESSION_COOKIE and value in self.__sessions:
+                return True
+        return False
+
+    @staticmethod
+    def __conditional(method, headers, response):
+        """
+        Adds `ETag` header to JSON responses to GET requests and replaces them with `304 Not Modified`,
+        if client has the same version
+        """
+        if method != "GET" or response.status_code != 200 or "ETag" in response.headers:
+            return response
+        if not response.headers.get("Content-Type", "").startswith("application/json"):
+            return response
+        etag = '"{}"'.format(hashlib.md5(response.body).hexdigest())
+        if headers.get("if-none-match") == etag:
+            return StubResponse(304, b"", {"ETag": etag})
+        response.headers["ETag"] = etag
+        return response
+
+# ------------------------------------------------------ Helpers ----------------------------------------------------- #
+
+    def __now(self):
+        return (self.__clock or Timeout.clock).time()
+
+    def __new_id(self, identifier=None):
+        if identifier is not None:
+            return int(identifier)
+        while True:
+            identifier = next(self.__ids)
+            if identifier not in self.__entities:
+                return identifier
+
+    def __entity(self, identifier, entity_type):
+        """
+        :return: entity of given type, which is created, if it does not exist yet
+        :raise ValueError: if entity with such ID has another type
+        """
+        identifier = int(identifier)
+        entity = self.__entities.get(identifier)
+        if entity is None:
+            create = {"loadcase": self.add_loadcase,
+                      "simulation": self.add_simulation,
+                      "submodelType": self.add_stype}.get(entity_type)
+            if create is None:
+                return None
+            if entity_type == "simulation":
+                create(identifier=identifier)
+            else:
+                create(identifier)
+            entity = self.__entities[identifier]
+        if entity["type"] != entity_type:
+            raise ValueError(f"Entity {identifier} is not {entity_type}")
+        self.__update_task(entity)
+        return entity
+
+    @staticmethod
+    def __page(items, body):
+        """
+        :return: page of list response, requested by `pageable` object of request body
+        """
+        pageable = (json.loads(body) if body else {}).get("pageable") or {}
+        size = max(1, int(pageable.get("size") or 20))
+        page = max(1, int(pageable.get("page") or 1))
+        total_pages = max(1, (len(items) + size - 1) // size)
+        return {"content": items[(page - 1) * size:page * size],
+                "number": page,
+                "size": size,
+                "totalElements": len(items),
+                "totalPages": total_pages,
+                "last": page >= total_pages}
+
+    def __path(self, entity):
+        """
+        :return: path of entity in tree, from root to entity
+        """
+        path = []
+        while entity is not None:
+            path.append(entity)
+            entity = self.__entities.get(entity["parent"]) if entity.get("parent") is not None else None
+        return path[::-1]
+
+    def __update_task(self, entity):
+        """
+        Updates status of task from its creation time, finished task creates results of its simulation
+        """
+        if entity["type"] != "task" or entity["status"] in ("Finished", "Failed"):
+            return
+        now = self.__now()
+        if now < entity["waiting_end"]:
+            entity["status"] = "Waiting"
+        elif now < entity["solving_end"]:
+            entity["status"] = "Solving"
+        else:
+            entity["status"] = "Failed" if entity["fails"] else "Finished"
+            if entity["status"] == "Finished":
+                self.__create_results(self.__entities[entity["parent"]])
+
+    def __create_results(self, simulation):
+        simulation["files"] = []
+        for name in simulation["results"]:
+            simulation["files"].append({"id": self.__new_id(), "name": name, "size": self.__settings.result_size})
+        simulation["key_results"] = []
+        for name in simulation["values"]:
+            value = round(self.__random.uniform(1.0e5, 1.0e7), 8)
+            simulation["key_results"].append({"id": self.__new_id(), "name": name, "value": str(value)})
+
+    @staticmethod
+    def __pattern(seed):
+        return hashlib.sha256(str(seed).encode()).digest() * (StubBackend.PATTERN_SIZE // 32)
+
+    def __file_content(self, file, start, end):
+        """
+        :return: bytes from start to end (inclusive) of generated file content
+        """
+        pattern = self.__pattern(file["id"])
+        size = len(pattern)
+        chunks = []
+        position = start
+        while position <= end:
+            offset = position % size
+            length = min(size - offset, end - position + 1)
+            chunks.append(pattern[offset:offset + length])
+            position += length
+        return b"".join(chunks)
+
+# ------------------------------------------------------ Routes ------------------------------------------------------ #
+
+    def __version(self, query, headers, body):
+        return StubResponse.from_json(200, {"status": "OK", "message": StubBackend.VERSION})
+
+    def __login(self, query, headers, body):
+        form = parse_qs(body.decode("utf-8") if isinstance(body, bytes) else str(body or ""))
+        username = (form.get("username") or [""])[0]
+        if not username:
+            return StubResponse.message(401, "Bad credentials")
+        session = hashlib.sha1(f"{username}{self.__now()}{self.__random.random()}".encode()).hexdigest()
+        self.__sessions.add(session)
+        return StubResponse.from_json(200, {"login": username},
+                                      {"Set-Cookie": f"{StubBackend.SESSION_COOKIE}={session}; Path=/"})
+
+    def __entity_base_info(self, entity_type, identifier, query, headers, body):
+        entity = self.__entity(identifier, entity_type)
+        if entity is None:
+            return StubResponse.message(404, f"{entity_type} {identifier} not found")
+        path = self.__path(entity)
+        data = {"id": entity["id"],
+                "name": entity["name"],
+                "objectType": {"name": entity_type},
+                "parentId": entity.get("parent"),
+                "links": [{"path": [{"id": item["id"] + StubBackend.TREE_ID_OFFSET,
+                                     "objectId": item["id"],
+                                     "name": item["name"]} for item in path],
+                           "pathNames": [item["name"] for item in path]}]}
+        if entity_type == "simulation":
+            data["description"] = entity["description"]
+        if entity_type == "task":
+            data["status"] = entity["status"]
+            data["expectedWaitingEndTime"] = int(entity["waiting_end"] * 1000)
+            data["expectedSolvingEndTime"] = int(entity["solving_end"] * 1000)
+        return StubResponse.from_json(200, data)
+
+    def __loadcase_simulations(self, identifier, query, headers, body):
+        self.__entity(identifier, "loadcase")
+        items = [{"id": entity["id"], "name": entity["name"]} for entity in self.__entities.values()
+                 if entity["type"] == "simulation" and entity["parent"] == int(identifier)]
+        return StubResponse.from_json(200, self.__page(items, body))
+
+    def __loadcase_targets(self, identifier, query, headers, body):
+        loadcase = self.__entity(identifier, "loadcase")
+        return StubResponse.from_json(200, self.__page(loadcase["targets"], body))
+
+    def __add_loadcase_target(self, identifier, query, headers, body):
+        loadcase = self.__entity(identifier, "loadcase")
+        payload = json.loads(body)
+        target = {"id": self.__new_id(),
+                  "name": payload.get("name"),
+                  "value": payload.get("value"),
+                  "conditionId": payload.get("conditionId"),
+                  "dimension": payload.get("dimension"),
+                  "tolerance": payload.get("tolerance"),
+                  "description": payload.get("description")}
+        loadcase["targets"].append(target)
+        return StubResponse.from_json(200, target)
+
+    def __remove_loadcase_targets(self, identifier, query, headers, body):
+        loadcase = self.__entity(identifier, "loadcase")
+        ids = {int(value) for item in query.get("ids", []) for value in item.split(",") if value}
+        removed = [{"id": target["id"]} for target in loadcase["targets"] if target["id"] in ids]
+        loadcase["targets"] = [target for target in loadcase["targets"] if target["id"] not in ids]
+        return StubResponse.from_json(200, removed)
+
+    def __modify_simulation(self, identifier, query, headers, body):
+        simulation = self.__entity(identifier, "simulation")
+        payload = json.loads(body)
+        for key in ("name", "description"):
+            if key in payload:
+                simulation[key] = payload[key]
+        return self.__entity_base_info("simulation", identifier, query, headers, body)
+
+    def __clone_simulation(self, identifier, query, headers, body):
+        simulation = self.__entity(identifier, "simulation")
+        clone_id = self.add_simulation(simulation["parent"],
+                                       name=simulation["name"] + " (copy)",
+                                       results=simulation["results"],
+                                       values=simulation["values"])
+        clone = self.__entities[clone_id]
+        clone["description"] = simulation["description"]
+        clone["submodels"] = list(simulation["submodels"])
+        # cloned simulation is not solved yet
+        clone["files"] = []
+        clone["key_results"] = []
+        return StubResponse.from_json(200, {"id": clone_id, "name": clone["name"]})
+
+    def __simulation_tasks(self, identifier, query, headers, body):
+        simulation = self.__entity(identifier, "simulation")
+        items = [{"id": task_id, "name": self.__entities[task_id]["name"]} for task_id in simulation["tasks"][::-1]]
+        return StubResponse.from_json(200, self.__page(items, body))
+
+    def __simulation_submodels(self, identifier, query, headers, body):
+        simulation = self.__entity(identifier, "simulation")
+        items = [{"id": submodel_id, "name": self.__entities[submodel_id]["name"]}
+                 for submodel_id in simulation["submodels"] if submodel_id in self.__entities]
+        return StubResponse.from_json(200, items)
+
+    def __update_simulation_submodels(self, identifier, query, headers, body):
+        simulation = self.__entity(identifier, "simulation")
+        submodel_ids = [int(item) for item in json.loads(body)]
+        unknown = [item for item in submodel_ids if self.__entities.get(item, {}).get("type") != "submodel"]
+        if unknown:
+            return StubResponse.message(404, f"Submodels not found: {unknown}")
+        simulation["submodels"] = submodel_ids
+        return self.__simulation_submodels(identifier, query, headers, body)
+
+    def __simulation_files(self, identifier, query, headers, body):
+        simulation = self.__entity(identifier, "simulation")
+        items = [{"id": file["id"], "name": file["name"], "size": file["size"]} for file in simulation["files"]]
+        return StubResponse.from_json(200, self.__page(items, body))
+
+    def __export_file(self, identifier, file_id, query, headers, body):
+        simulation = self.__entity(identifier, "simulation")
+        file = next((item for item in simulation["files"] if item["id"] == int(file_id)), None)
+        if file is None:
+            return StubResponse.message(404, f"File {file_id} not found")
+        size = file["size"]
+        headers_out = {"Content-Type": "application/octet-stream",
+                       "Accept-Ranges": "bytes",
+                       "Content-Disposition": f"attachment; filename=\"{file['name']}\"",
+                       "ETag": f"\"{identifier}-{file_id}-{size}\""}
+        match = re.match(r"bytes=(\d*)-(\d*)$", headers.get("range", ""))
+        # range of another revision of file is ignored and the whole file is sent
+        if match is None or size == 0 or headers.get("if-range", headers_out["ETag"]) != headers_out["ETag"]:
+            return StubResponse(200, self.__file_content(file, 0, size - 1), headers_out)
+        start = int(match.group(1) or 0)
+        end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+        if start > end:
+            headers_out["Content-Range"] = f"bytes */{size}"
+            return StubResponse(416, b"", headers_out)
+        headers_out["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return StubResponse(206, self.__file_content(file, start, end), headers_out)
+
+    def __task_defaults(self, identifier, query, headers, body):
+        simulation = self.__entity(identifier, "simulation")
+        return StubResponse.from_json(200, [{"objectType": {"name": "task"},
+                                             "parentName": simulation["name"],
+                                             "owner": "stub",
+                                             "ownerId": 1,
+                                             "id": None,
+                                             "numOfCores": 4,
+                                             "memory": 8192,
+                                             "storyboard": None,
+                                             "storyboardId": None,
+                                             "solverName": "Stub solver",
+                                             "solverDisplayName": "Stub solver",
+                                             "clusterName": "stub",
+                                             "solverGroup": "stub",
+                                             "type": "solving",
+                                             "typeDisplayName": "Solving",
+                                             "solvingType": "Solving",
+                                             "notified": False,
+                                             "startupArguments": "",
+                                             "autoCreateReport": False,
+                                             "withPostprocessing": False,
+                                             "postprocessorName": None,
+                                             "parentType": {"name": "simulation"},
+                                             "parentId": simulation["id"],
+                                             "cluster": None,
+                                             "clusterId": 1,
+                                             "expectedSolvingTime": self.__settings.solving_time}])
+
+    def __run(self, query, headers, body):
+        parameters = json.loads(body)
+        parent_id = parameters.get("parentId")
+        simulation = self.__entities.get(parent_id)
+        if simulation is None or simulation["type"] != "simulation":
+            return StubResponse.from_json(400, {"message": f"Simulation {parent_id} not found"})
+        now = self.__now()
+        task_id = self.__new_id()
+        settings = self.__settings
+        waiting_end = now + settings.waiting_time
+        solving_time = settings.solving_time
+        if settings.solving_spread:
+            solving_time *= self.__random.uniform(1 - settings.solving_spread, 1 + settings.solving_spread)
+        if settings.slots:
+            # tasks take free slots in order of submission
+            if len(self.__slots) >= settings.slots:
+                waiting_end = max(waiting_end, heapq.heappop(self.__slots))
+            heapq.heappush(self.__slots, waiting_end + solving_time)
+        self.__entities[task_id] = {"type": "task",
+                                    "id": task_id,
+                                    "name": f"Task {task_id}",
+                                    "parent": simulation["id"],
+                                    "status": "Waiting",
+                                    "created": now,
+                                    "waiting_end": waiting_end,
+                                    "solving_end": waiting_end + solving_time,
+                                    "fails": self.__random.random() < settings.failure_rate}
+        simulation["tasks"].append(task_id)
+        simulation["files"] = []
+        simulation["key_results"] = []
+        self.__update_task(self.__entities[task_id])
+        return StubResponse.from_json(200, {"id": task_id, "status": self.__entities[task_id]["status"]})
+
+    def __simulation_values(self, identifier, query, headers, body):
+        simulation = self.__entity(identifier, "simulation")
+        items = [{"id": item["id"],
+                  "name": item["name"],
+                  "description": "",
+                  "simulationId": simulation["id"],
+                  "type": "value",
+                  "overview": {"content": item["value"]}} for item in simulation["key_results"]]
+        return StubResponse.from_json(200, self.__page(items, body))
+
+    def __simulation_value(self, identifier, value_id, query, headers, body):
+        simulation = self.__entity(identifier, "simulation")
+        item = next((item for item in simulation["key_results"] if item["id"] == int(value_id)), None)
+        if item is None:
+            return StubResponse.message(404, f"Key result {value_id} not found")
+        return StubResponse.from_json(200, {"id": item["id"], item["name"]: item["value"]})
+
+    def __upload_submodel(self, query, headers, body):
+        message = BytesParser().parsebytes(b"Content-Type: " + headers.get("content-type", "").encode() +
+                                           b"\r\n\r\n" + body)
+        fields, file_name, content = {}, None, None
+        for part in message.get_payload() if message.is_multipart() else []:
+            name = part.get_param("name", header="content-disposition")
+            if part.get_filename() is not None:
+                file_name, content = part.get_filename(), part.get_payload(decode=True) or b""
+            else:
+                fields[name] = (part.get_payload(decode=True) or b"").decode("utf-8")
+        if file_name is None or not fields.get("pid"):
+            return StubResponse.message(400, "Multipart body must contain `pid` and `file` fields")
+
+        # s|type is addressed by its tree ID
+        stype = self.__entity(int(fields["pid"]) - StubBackend.TREE_ID_OFFSET, "submodelType")
+        digest = hashlib.sha256(content).hexdigest()
+        submodel_id = self.__new_id()
+        created = {"id": submodel_id, "name": file_name}
+        original = next((self.__entities[item] for item in stype["submodels"]
+                         if self.__entities[item]["digest"] == digest), None)
+        self.__entities[submodel_id] = {"type": "submodel",
+                                        "id": submodel_id,
+                                        "name": file_name,
+                                        "parent": stype["id"],
+                                        "size": len(content),
+                                        "digest": digest}
+        stype["submodels"].append(submodel_id)
+        if original is not None and self.__settings.duplicates:
+            return StubResponse.from_json(200, {"status": "warning",
+                                                "duplicates": [{"createdObject": created,
+                                                                "duplicateObjects": [{"id": original["id"],
+                                                                                      "name": original["name"]}]}]})
+        return StubResponse.from_json(200, {"status": "success", "set": [created]})
+
+    def __stype_submodels(self, query, headers, body):
+        filters = ((json.loads(body) if body else {}).get("filters") or {}).get("list") or []
+        path = next((item.get("value") for item in filters if item.get("name") == "path"), None)
+        items = []
+        for stype in [entity for entity in self.__entities.values() if entity["type"] == "submodelType"]:
+            if path is not None and path != [item["name"] for item in self.__path(stype)]:
+                continue
+            for submodel_id in stype["submodels"]:
+                submodel = self.__entities[submodel_id]
+                item = {"id": submodel_id, "name": submodel["name"], "size": submodel["size"]}
+                if self.__settings.digests:
+                    item["sha256"] = submodel["digest"]
+                items.append(item)
+        return StubResponse.from_json(200, self.__page(items, body))
+
+    def __delete_submodel(self, identifier, query, headers, body):
+        submodel = self.__entities.get(int(identifier))
+        if submodel is None or submodel["type"] != "submodel":
+            return StubResponse.message(404, f"Submodel {identifier} not found")
+        used = [entity["id"] for entity in self.__entities.values()
+                if entity["type"] == "simulation" and submodel["id"] in entity["submodels"]]
+        if used:
+            return StubResponse.message(409, f"Submodel is used in simulations {used}")
+        del self.__entities[submodel["id"]]
+        stype = self.__entities.get(submodel["parent"])
+        if stype is not None:
+            stype["submodels"].remove(submodel["id"])
+        return StubResponse.from_json(200, {"id": submodel["id"]})
@@ -0,0 +1,104 @@
+# coding: utf-8
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from requests.adapters import HTTPAdapter
+from core.network.cassette import build_response
+
+
+class StubAdapter(HTTPAdapter):
+    """
+    Transport adapter of `requests` passing requests to stub backend in-process, without network.
+    Usage: `app_session.session.mount(backend_address, StubAdapter(backend))`
+    """
+    def __init__(self, backend):
+        """
+        :param backend: StubBackend object
+        """
+        super().__init__()
+        self.__backend = backend
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        body = request.body
+        if body is None:
+            body = b""
+        elif isinstance(body, str):
+            body = body.encode("utf-8")
+        elif not isinstance(body, bytes):
+            # streamed body, e.g. multipart upload of submodel
+            body = b"".join(bytes(chunk) for chunk in body)
+        response = self.__backend.handle(request.method, request.url, dict(request.headers), body)
+        return build_response(self, request, response.status_code, response.headers, response.body)
+
+    def close(self):
+        pass
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """
+    Passes HTTP requests to stub backend of server
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.__handle()
+
+    def do_POST(self):
+        self.__handle()
+
+    def do_PUT(self):
+        self.__handle()
+
+    def do_DELETE(self):
+        self.__handle()
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def __handle(self):
+        response = self.server.backend.handle(self.command, self.path, dict(self.headers.items()), self.__read_body())
+        self.send_response(response.status_code)
+        for key, value in response.headers.items():
+            self.send_header(key, value)
+        if response.status_code != 304:
+            self.send_header("Content-Length", str(len(response.body)))
+        self.end_headers()
+        if response.body:
+            self.wfile.write(response.body)
+
+    def __read_body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return b"".join(chunks)
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    """
+    HTTP server of stub backend, every request is handled in separate thread.
+    Application is pointed to server with `Backend address` key of configuration file
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, backend, verbose=False):
+        """
+        :param address: tuple of host and port; port 0 selects free port
+        :param backend: StubBackend object
+        :param verbose: log every request
+        """
+        super().__init__(address, StubRequestHandler)
+        self.backend = backend
+        self.verbose = verbose
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
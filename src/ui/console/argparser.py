@@ -9,6 +9,15 @@ def get_arguments():
     arg_parser.add_argument("-k", action="store", help="Read credentials from specified key file | Optional")
     arg_parser.add_argument("-v", action="store", help="Write key results into JSON in selected directory | Optional")
     arg_parser.add_argument("-d", action="store_true", help="Display additional debug information | Optional")
+    arg_parser.add_argument("-l", action="store", choices=["debug", "info", "warning", "error"],
+                            help="Show only messages of selected level and above | Optional")
+    arg_parser.add_argument("-n", action="store_true", help="Do not use metadata cache | Optional")
+    arg_parser.add_argument("-c", action="store_true", help="Clear metadata cache before run | Optional")
+    arg_parser.add_argument("--record", action="store",
+                            help="Record requests and responses into cassette file | Optional")
+    arg_parser.add_argument("-p", action="store", help="Replay requests and responses from cassette file | Optional")
+    arg_parser.add_argument("-f", action="store_true", help="Replay cassette as fast as possible | Optional")
+    arg_parser.add_argument("-t", action="store", help="Write timeline of vertices into selected directory | Optional")
 
     args = arg_parser.parse_args()
     return args
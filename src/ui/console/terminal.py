@@ -1,16 +1,29 @@
 # coding: utf-8
+import atexit
 import getpass
 import colorama
 import datetime
-import re
+import functools
+import json
+import queue
+import sys
+import threading
+import time
 
 
 colorama.init()
 
 
 class Output:
+    """
+    Output settings, they are read on every shown message, so they may be changed at any moment:
+    - type: 1 - requests are shown, 2 - requests and debug messages are shown;
+    - level: messages of lower levels are not shown
+    """
     REQUESTS = False
     FULL = False
+    LEVELS = {"debug": 0, "network": 1, "info": 1, "warning": 2, "error": 3, "trace": 3}
+    LEVEL = LEVELS["info"]
 
     @classmethod
     def set_type(cls, value):
@@ -22,10 +35,25 @@ class Output:
             if value == 2:
                 cls.REQUESTS = True
                 cls.FULL = True
+                cls.LEVEL = cls.LEVELS["debug"]
                 return
         cls.FULL = False
         cls.REQUESTS = False
 
+    @classmethod
+    def set_level(cls, level):
+        """
+        :param level: minimal level of shown messages: `debug` (same as output type 2), `info`, `warning` or `error`;
+                      stack traces are shown with errors, requests are shown with info messages
+        """
+        level = str(level).strip().lower()
+        if level not in ("debug", "info", "warning", "error"):
+            show_warning_message("Unknown level of messages \"{}\", it is ignored", level)
+            return
+        if level == "debug":
+            cls.set_type(2)
+        cls.LEVEL = cls.LEVELS[level]
+
 
 class Identifiers:
     MAX_LENGTH = 8
@@ -86,7 +114,135 @@ class MessageProperties:
             self.__identifier = " " * Identifiers.MAX_LENGTH
 
 
+def __get_properties(message_type):
+    properties = MessageProperties()
+    properties.set_values(message_type)
+    return properties
+
+
+# properties of message types are created once, not for every message
+PROPERTIES = {message_type: __get_properties(message_type)
+              for message_type in ["info", "warning", "error", "debug", "trace", "network", None]}
+
+# values of messages, which are immutable and are passed to writer as they are
+SCALARS = (str, int, float, type(None))
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+BLANK = " " * (len("0000-00-00 00:00:00.000000") + Identifiers.MAX_LENGTH + 5)
+
+
+class Writer(object):
+    """
+    Background writer of terminal messages. Callers only put records (type, time, message and values) into queue,
+    messages are formatted and written to standard output in batches by separate thread, and optionally appended
+    to log file in JSON lines format. Values are converted to strings by callers (see `snapshot()`), so that
+    writer neither shows their later state nor touches objects of other threads
+    """
+
+    BATCH_SIZE = 256
+
+    def __init__(self):
+        self.__queue = queue.SimpleQueue()
+        self.__lock = threading.Lock()
+        self.__thread = None
+        self.__log_file = None
+
+    def put(self, record):
+        """
+        :param record: tuple of message type (None for plain text), time, message and tuple of values
+        """
+        if self.__thread is None:
+            self.__start()
+        self.__queue.put(record)
+
+    def flush(self):
+        """
+        Blocks until all messages put before are written
+        """
+        if self.__thread is None:
+            return
+        written = threading.Event()
+        self.__queue.put(written)
+        written.wait()
+
+    def set_log_file(self, path):
+        """
+        :param path: path of JSON lines file, messages are appended to; None - stop writing into file
+        """
+        self.flush()
+        with self.__lock:
+            if self.__log_file is not None:
+                self.__log_file.close()
+            self.__log_file = open(path, "a", encoding="utf-8") if path else None
+
+    def __start(self):
+        with self.__lock:
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run, name="terminal-writer", daemon=True)
+                self.__thread.start()
+
+    def __run(self):
+        # batch is not kept in local variable of loop, so that written records are released before waiting ones
+        # are notified and while thread waits for next records
+        while True:
+            for event in self.__process(self.__next_batch()):
+                event.set()
+
+    def __next_batch(self):
+        batch = [self.__queue.get()]
+        while len(batch) < Writer.BATCH_SIZE:
+            try:
+                batch.append(self.__queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def __process(self, batch):
+        """
+        Writes records of batch
+        :return: list of events of flushing callers, which are to be set
+        """
+        try:
+            self.__write([item for item in batch if not isinstance(item, threading.Event)])
+        except Exception:
+            pass
+        return [item for item in batch if isinstance(item, threading.Event)]
+
+    def __write(self, records):
+        lines = []
+        for record in records:
+            lines.extend(format_record(record))
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
+        with self.__lock:
+            if self.__log_file is not None:
+                self.__log_file.write("".join(json.dumps(to_json(record)) + "\n"
+                                              for record in records if record[0] is not None))
+                self.__log_file.flush()
+
+
+__writer = Writer()
+atexit.register(__writer.flush)
+
+
+def flush():
+    """
+    Writes all shown messages, e.g. before reading input or redirecting standard output
+    """
+    __writer.flush()
+
+
+def set_log_file(path):
+    """
+    Appends every shown message into file in JSON lines format: time, level, message template, values and text
+    :param path: path of file; None - stop writing into file
+    """
+    __writer.set_log_file(path)
+
+
 def request_string_input(message=None):
+    __writer.flush()
     if message:
         return input(message + ": ")
     else:
@@ -94,6 +250,7 @@ def request_string_input(message=None):
 
 
 def request_hidden_input(message=None):
+    __writer.flush()
     if message:
         return getpass.getpass(message + ": ")
     else:
@@ -101,13 +258,14 @@ def request_hidden_input(message=None):
 
 
 def show_healthcheck_info(version, status):
-    print(f"{colorama.Fore.CYAN}CML-Bench Version: {colorama.Style.RESET_ALL}"
-          f"{colorama.Fore.LIGHTCYAN_EX}{version}{colorama.Style.RESET_ALL}")
     if status == "success":
         color = colorama.Fore.LIGHTGREEN_EX
     else:
         color = colorama.Fore.LIGHTRED_EX
-    print(f"{colorama.Fore.CYAN}Status           : {colorama.Style.RESET_ALL}{color}{status}{colorama.Style.RESET_ALL}")
+    __writer.put((None, None, f"{colorama.Fore.CYAN}CML-Bench Version: {colorama.Style.RESET_ALL}"
+                              f"{colorama.Fore.LIGHTCYAN_EX}{version}{colorama.Style.RESET_ALL}\n"
+                              f"{colorama.Fore.CYAN}Status           : {colorama.Style.RESET_ALL}"
+                              f"{color}{status}{colorama.Style.RESET_ALL}", ()))
 
 
 def show_info_message(message, *values):
@@ -152,31 +310,86 @@ def show_delete_request(url):
 
 
 def get_blank():
-    tmp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
-    return " " * (len(tmp) + Identifiers.MAX_LENGTH + 5)
+    return BLANK
 
 
 def __colored_message(message_type, message, *values):
-    properties = MessageProperties()
-    properties.set_values(message_type)
-
-    prog = re.compile(r"{}", re.X)
-    result = prog.findall(message)
-
-    if len(result) != len(values):
+    if Output.LEVELS.get(message_type, Output.LEVELS["info"]) < Output.LEVEL:
+        return
+    __writer.put((message_type, time.time(), message, snapshot(values)))
+
+
+def snapshot(values):
+    """
+    :param values: values of message
+    :return: tuple of values, in which all but immutable scalars are replaced with their strings at the moment
+             of call; e.g. entities may send requests to format themselves, which must not be done by writer
+    """
+    for value in values:
+        if not isinstance(value, SCALARS):
+            return tuple([value if isinstance(value, SCALARS) else str(value) for value in values])
+    return values
+
+
+# ---------------------------------------------------- Formatting ---------------------------------------------------- #
+
+
+def format_record(record):
+    """
+    :param record: tuple of message type, time, message and values
+    :return: list of lines of colored terminal output
+    """
+    message_type, timestamp, message, values = record
+    if message_type is None:
+        return [message]
+    properties = PROPERTIES.get(message_type, PROPERTIES[None])
+
+    if message.count("{}") != len(values):
+        lines = []
         if Output.FULL:
-            print(__get_internal_simple_message("The number of placeholders does not match the number of parameters",
-                                                colorama.Fore.MAGENTA,
-                                                "DEBUG   "))
-        print(__get_internal_simple_message(message, properties.main_color, properties.identifier))
-    else:
-        updated_parameters = [f"{properties.value_color}{v}{colorama.Style.RESET_ALL}{properties.main_color}"
-                              for v in values]
-        updated_message = __get_internal_simple_message(message, properties.main_color, properties.identifier)
-        print(str(updated_message).format(*updated_parameters))
-
-
-def __get_internal_simple_message(message, main_color, identifier):
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
-    prefix = f"[{identifier}| {timestamp}] "
+            lines.append(get_internal_simple_message("The number of placeholders does not match the number of "
+                                                     "parameters", colorama.Fore.MAGENTA, "DEBUG   ", timestamp))
+        lines.append(get_internal_simple_message(message, properties.main_color, properties.identifier, timestamp))
+        return lines
+    updated_parameters = [f"{properties.value_color}{v}{colorama.Style.RESET_ALL}{properties.main_color}"
+                          for v in values]
+    updated_message = get_internal_simple_message(message, properties.main_color, properties.identifier, timestamp)
+    try:
+        return [updated_message.format(*updated_parameters)]
+    except (IndexError, KeyError, ValueError):
+        return [updated_message]
+
+
+def to_json(record):
+    """
+    :param record: tuple of message type, time, message and values
+    :return: dictionary of structured log record
+    """
+    message_type, timestamp, message, values = record
+    try:
+        text = message.strip().format(*values)
+    except (IndexError, KeyError, ValueError):
+        text = message.strip()
+    return {"time": datetime.datetime.fromtimestamp(timestamp).astimezone().isoformat(),
+            "level": message_type,
+            "message": text,
+            "template": message.strip(),
+            "values": [str(value) for value in values]}
+
+
+@functools.lru_cache(maxsize=4)
+def __format_seconds(seconds):
+    return datetime.datetime.fromtimestamp(seconds).strftime(TIMESTAMP_FORMAT)
+
+
+def format_timestamp(timestamp):
+    """
+    :return: local time with microseconds; formatted date and time are cached, as messages come in bursts
+    """
+    seconds = int(timestamp)
+    return "{}.{:06d}".format(__format_seconds(seconds), min(int((timestamp - seconds) * 1e6), 999999))
+
+
+def get_internal_simple_message(message, main_color, identifier, timestamp):
+    prefix = f"[{identifier}| {format_timestamp(timestamp)}] "
     return f"{main_color}{prefix}{message.strip()}{colorama.Style.RESET_ALL}"